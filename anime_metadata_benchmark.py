@@ -0,0 +1,225 @@
+"""Micro-benchmark for AnimeDataProvider.find_title lookups.
+
+Builds a synthetic anime offline database from a fixed, seeded title corpus in
+a temporary cache directory (the real ~/.video_metadata_cache is never touched),
+then measures uncached find_title lookups per second and SQL statements per
+lookup for exact, prefix, fuzzy and broad queries. Each run compares the
+current batched candidate ranking ("after") with the per-candidate
+anime_synonym_view queries it replaced ("before") on the same database and
+checks that both return the same matches and scores. Statements SQLite runs
+internally for FTS5 (reported by the trace callback with a "--" prefix, e.g.
+bm25 document size reads) are counted separately from the provider's own.
+
+Usage:
+    python anime_metadata_benchmark.py
+    python anime_metadata_benchmark.py --entries 20000 --rounds 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zstandard as zstd
+
+SYLLABLES = [
+    "ka", "shi", "to", "na", "mi", "ra", "ko", "yu", "ri", "sa", "no", "ha",
+    "ta", "ne", "mo", "ku", "se", "ru", "chi", "ya", "ro", "ma", "ke", "tsu",
+]
+WORDS = [
+    "Blade", "Online", "Academy", "Hero", "Titan", "Sword", "Night", "Dragon",
+    "Ghost", "Spirit", "Star", "Guardian", "Chronicle", "Legend", "Hunter", "Magic",
+]
+SEASON_SUFFIXES = ["", " 2nd Season", " Season 3", " Part 2", " II"]
+
+
+def _make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def build_corpus(entry_count: int, seed: int) -> list:
+    """Generate a deterministic list of anime offline database entries."""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(entry_count):
+        base = " ".join(
+            [_make_word(rng) for _ in range(rng.randint(1, 2))]
+            + [rng.choice(WORDS) for _ in range(rng.randint(0, 2))]
+        )
+        title = base + rng.choice(SEASON_SUFFIXES)
+        synonyms = [f"{base} {rng.choice(WORDS)}" for _ in range(rng.randint(1, 6))]
+        entries.append({
+            "sources": [f"https://myanimelist.net/anime/{index + 1}"],
+            "title": title,
+            "type": rng.choice(["TV", "TV", "TV", "MOVIE", "OVA"]),
+            "episodes": rng.choice([12, 13, 24, 25, 1]),
+            "status": "FINISHED",
+            "animeSeason": {"year": rng.randint(1990, 2025)},
+            "synonyms": synonyms,
+            "relatedAnime": [],
+            "tags": ["action"],
+        })
+    return entries
+
+
+def build_queries(entries: list, query_count: int, seed: int) -> list:
+    """Pick a fixed mix of exact, prefix, misspelled and broad queries from the corpus."""
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(query_count):
+        entry = rng.choice(entries)
+        kind = rng.choice(["exact", "prefix", "fuzzy", "broad"])
+        title = entry["title"]
+        if kind == "broad":
+            # Generic words shared by many entries produce large FTS candidate sets
+            title = " ".join(rng.sample(WORDS, 2))
+        elif kind == "prefix":
+            title = title.split(" ")[0]
+        elif kind == "fuzzy":
+            words = title.split(" ")
+            words[0] = words[0][:-1] if len(words[0]) > 3 else words[0]
+            title = " ".join(words) + " " + rng.choice(WORDS)
+        queries.append(title)
+    return queries
+
+
+def _prepare_cache_home(entries: list) -> str:
+    home = tempfile.mkdtemp(prefix="anime_bench_")
+    os.environ["HOME"] = home
+    os.environ["USERPROFILE"] = home
+    cache_dir = os.path.join(home, ".video_metadata_cache", "anime")
+    os.makedirs(cache_dir, exist_ok=True)
+    payload = json.dumps({"data": entries}).encode("utf-8")
+    zst_path = os.path.join(cache_dir, "anime-offline-database-minified.json.zst")
+    with open(zst_path, "wb") as handle:
+        handle.write(zstd.ZstdCompressor().compress(payload))
+    return home
+
+
+def _per_candidate_provider_class(base_class):
+    """Provider that ranks candidates the way find_title did before the batched synonym fetch.
+
+    Every candidate row costs its own anime_synonym_view query, every ranked
+    id one more for its representative row, and the top hit a third for its
+    final score. Scores and rankings are the same as the batched code's.
+    """
+
+    class PerCandidateAnimeDataProvider(base_class):
+        def _rank_candidates(self, query_title, candidates, conn=None, prepared_query=None, synonym_rows_by_id=None):
+            if conn is None or not candidates:
+                return super()._rank_candidates(query_title, candidates, conn, prepared_query, synonym_rows_by_id)
+            prepared_query = prepared_query or self._prepare_similarity_query(query_title)
+            best_by_id = {}
+            for candidate in candidates:
+                candidate_id = self._row_or_dict_value(candidate, 'id')
+                if candidate_id is None:
+                    continue
+                bm25_score = candidate['score'] if 'score' in candidate.keys() else None
+                rows = conn.execute("SELECT * FROM anime_synonym_view WHERE id = ?", (candidate_id,)).fetchall()
+                score = self._best_score_from_rows(prepared_query, rows, bm25_score=bm25_score)
+                if candidate_id not in best_by_id or score > best_by_id[candidate_id]:
+                    best_by_id[candidate_id] = score
+
+            ranked_rows = []
+            for candidate_id, _score in sorted(best_by_id.items(), key=lambda item: item[1], reverse=True):
+                row = conn.execute(
+                    "SELECT * FROM anime_synonym_view WHERE id = ? ORDER BY year DESC LIMIT 1", (candidate_id,)
+                ).fetchone()
+                if row is not None:
+                    ranked_rows.append(row)
+            if ranked_rows and synonym_rows_by_id is not None:
+                top_id = ranked_rows[0]['id']
+                synonym_rows_by_id[top_id] = conn.execute(
+                    "SELECT * FROM anime_synonym_view WHERE id = ?", (top_id,)
+                ).fetchall()
+            return ranked_rows
+
+    return PerCandidateAnimeDataProvider
+
+
+def _measure(provider, queries: list, rounds: int, statement_count: dict) -> dict:
+    timings = []
+    statement_count["provider"] = statement_count["internal"] = 0
+    for _ in range(rounds):
+        provider._search_cache.clear()
+        started_at = time.perf_counter()
+        for query in queries:
+            provider.find_title(query)
+        timings.append(time.perf_counter() - started_at)
+
+    best = min(timings)
+    return {
+        "best_seconds": round(best, 4),
+        "lookups_per_second": round(len(queries) / best, 1) if best else None,
+        "sql_statements_per_lookup": round(statement_count["provider"] / (rounds * len(queries)), 2),
+        "fts_internal_statements_per_lookup": round(statement_count["internal"] / (rounds * len(queries)), 1),
+    }
+
+
+def _result_key(match) -> tuple:
+    return (match.info.id, match.info.title, round(match.score, 6)) if match else None
+
+
+def run_benchmark(entry_count: int, query_count: int, rounds: int, seed: int) -> dict:
+    entries = build_corpus(entry_count, seed)
+    queries = build_queries(entries, query_count, seed)
+    _prepare_cache_home(entries)
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "video-optimizer-v2"))
+    from anime_metadata import AnimeDataProvider
+
+    statement_count = {"provider": 0, "internal": 0}
+
+    def _count_statement(sql: str):
+        statement_count["internal" if sql.lstrip().startswith("--") else "provider"] += 1
+
+    class CountingAnimeDataProvider(AnimeDataProvider):
+        def _configure_connection(self, conn):
+            super()._configure_connection(conn)
+            conn.set_trace_callback(_count_statement)
+
+    after = CountingAnimeDataProvider()
+    after.load_database()
+    before = _per_candidate_provider_class(CountingAnimeDataProvider)()
+    before.load_database()
+
+    results = {"entries": entry_count, "queries": query_count, "rounds": rounds}
+    results["before"] = _measure(before, queries, rounds, statement_count)
+    results["after"] = _measure(after, queries, rounds, statement_count)
+    before_per_second = results["before"]["lookups_per_second"]
+    after_per_second = results["after"]["lookups_per_second"]
+    results["speedup"] = round(after_per_second / before_per_second, 2) if before_per_second and after_per_second else None
+    # Both must rank and score every query the same way
+    before._search_cache.clear()
+    after._search_cache.clear()
+    results["mismatched_results"] = sum(
+        _result_key(before.find_title(query)) != _result_key(after.find_title(query)) for query in queries
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AnimeDataProvider.find_title on a synthetic corpus")
+    parser.add_argument("--entries", type=int, default=5000, help="Number of synthetic anime entries (default: 5000)")
+    parser.add_argument("--queries", type=int, default=500, help="Number of lookups per round (default: 500)")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds; the fastest round is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=1234, help="Corpus seed (default: 1234)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.entries, args.queries, args.rounds, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            if isinstance(value, dict):
+                print(f"{key}:")
+                for name, measured in value.items():
+                    print(f"  {name}: {measured}")
+            else:
+                print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
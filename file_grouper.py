@@ -3,13 +3,19 @@ import argparse
 import json
 import os
 import sys
+import threading
 import types
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Any, Optional, Tuple
 import fnmatch
+import itertools
 import re
 
+import json_stream
+
 try:
     from tqdm import tqdm
     TQDM_AVAILABLE = True
@@ -19,7 +25,9 @@ except ImportError:
     class tqdm:
         def __init__(self, iterable=None, total=None, desc=None, unit=None, disable=False):
             self.iterable = iterable
-            self.total = total or (len(iterable) if iterable else 0)
+            if total is None:
+                total = len(iterable) if hasattr(iterable, '__len__') else 0
+            self.total = total
             self.desc = desc
             self.current = 0
             self.disable = disable
@@ -119,6 +127,7 @@ def _missing_dependency_message(feature_name: str, exc: ImportError) -> str:
 
 try:
     from metadata_provider import MetadataManager, BaseMetadataProvider, TitleInfo
+    from metadata_service import create_metadata_manager
 except ImportError as exc:
     print(f"Warning: video-optimizer-v2 core metadata modules unavailable: {exc}")
 
@@ -163,25 +172,37 @@ def get_metadata_manager(anime_provider_weight=1.0, imdb_provider_weight=0.8):
 
     requested_weights = (float(anime_provider_weight), float(imdb_provider_weight))
     if METADATA_MANAGER is None or METADATA_MANAGER_WEIGHTS != requested_weights:
-        anime_provider = AnimeDataProvider()
-        anime_provider.provider_weight = requested_weights[0]
+        def build_local_manager():
+            anime_provider = AnimeDataProvider()
+            anime_provider.provider_weight = requested_weights[0]
+
+            imdb_provider = IMDbDataProvider()
+            imdb_provider.provider_weight = requested_weights[1]
 
-        imdb_provider = IMDbDataProvider()
-        imdb_provider.provider_weight = requested_weights[1]
+            return MetadataManager([anime_provider, imdb_provider])
 
-        METADATA_MANAGER = MetadataManager([anime_provider, imdb_provider])
+        # Uses the warm providers of a running metadata_service.py when available
+        METADATA_MANAGER = create_metadata_manager(
+            build_local_manager,
+            provider_weights={
+                "AnimeDataProvider": requested_weights[0],
+                "IMDbDataProvider": requested_weights[1],
+            },
+        )
         METADATA_MANAGER_WEIGHTS = requested_weights
 
     return METADATA_MANAGER
 
 
-def get_plex_provider():
-    """Get or initialize the Plex provider"""
+def get_plex_provider(use_snapshot=False):
+    """Get or initialize the Plex provider; use_snapshot answers lookups from a cached media part snapshot."""
     global PLEX_PROVIDER
     if not PLEX_PROVIDER_AVAILABLE:
         return None
     if PLEX_PROVIDER is None:
-        PLEX_PROVIDER = PlexMetadataProvider()
+        PLEX_PROVIDER = PlexMetadataProvider(use_snapshot=use_snapshot)
+    else:
+        PLEX_PROVIDER.use_snapshot = use_snapshot
     return PLEX_PROVIDER
 
 
@@ -196,7 +217,7 @@ MyAnimeListWatchStatusType = Any
 class FileGrouper:
     """Groups files based on filename metadata extracted using guessit."""
     
-    def __init__(self, metadata_manager = None, plex_provider = None, myanimelist_xml_path = None):
+    def __init__(self, metadata_manager = None, plex_provider = None, myanimelist_xml_path = None, workers: int = 1):
         self.groups = defaultdict(list)
         self.metadata = {}
         self.enhanced_metadata = {}  # Store metadata from providers
@@ -206,6 +227,12 @@ class FileGrouper:
         self.plex_provider = plex_provider
         self.myanimelist_xml_path = myanimelist_xml_path
         self._mal_provider = None
+        self._plex_watch_statuses = None  # Bulk Plex lookup results for the current group_files run
+        # Parallel extraction: guessit in a process pool, lookups in a thread pool (1 = serial)
+        self.workers = max(1, int(workers or 1))
+        self._title_metadata_lock = threading.RLock()
+        # Per extraction thread: metadata ids _store_title_metadata was asked for, in call order
+        self._extraction_state = threading.local()
     
     # Keywords that indicate a season-specific title (vs. series-wide)
     SEASON_KEYWORDS = ['part', 'season', 'cour']
@@ -285,63 +312,92 @@ class FileGrouper:
 
         return None
         
+    @staticmethod
+    def _compile_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+        """Combine filename patterns into one regex with the same rules as _matches_pattern.
+
+        Match it against ``os.path.normcase(filename)``. Returns None when a
+        pattern is a bare '*', i.e. every filename matches.
+        """
+        parts = []
+        for pattern in patterns:
+            if pattern == '*':
+                return None
+            if '[' in pattern or ']' in pattern:
+                # Brackets are literal and matching is case-insensitive, as in _matches_pattern
+                escaped_pattern = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+                parts.append(f'(?i:^{escaped_pattern}$)')
+            else:
+                parts.append(fnmatch.translate(os.path.normcase(pattern)))
+        return re.compile('|'.join(f'(?:{part})' for part in parts))
+
+    def iter_files(self, input_paths: List[str], excluded_paths: List[str] | None = None,
+                   include_patterns: List[str] | None = None, exclude_patterns: List[str] | None = None,
+                   recursive: bool = False) -> Iterator[Path]:
+        """Yield matching files as they are found, in the same order as discover_files.
+
+        Directories are read with os.scandir, whose entries carry their type, and
+        excluded directories are pruned instead of walked.
+        """
+        include_matcher = self._compile_patterns(include_patterns or ['*'])
+        exclude_matcher = self._compile_patterns(exclude_patterns) if exclude_patterns else None
+        excluded = {str(Path(p).resolve()) for p in excluded_paths or []}
+
+        def matches(filename: str) -> bool:
+            normalized = os.path.normcase(filename)
+            if include_matcher is not None and not include_matcher.match(normalized):
+                return False
+            return not (exclude_matcher is not None and exclude_matcher.match(normalized))
+
+        def is_excluded(resolved: str) -> bool:
+            return any(resolved == path or resolved.startswith(path.rstrip(os.sep) + os.sep) for path in excluded)
+
+        for input_path in input_paths:
+            path_obj = Path(input_path)
+            if not path_obj.exists():
+                print(f"Warning: Path does not exist: {input_path}")
+                continue
+            if path_obj.is_file():
+                if matches(path_obj.name):
+                    yield path_obj
+                continue
+
+            # Depth-first, each directory's files before its subdirectories, like Path.rglob
+            stack: List[Tuple[str, str]] = [(str(path_obj), str(path_obj.resolve()))]
+            while stack:
+                directory, resolved_directory = stack.pop()
+                subdirectories = []
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                if excluded:
+                                    if entry.is_symlink():
+                                        resolved = os.path.realpath(entry.path)
+                                    else:
+                                        resolved = os.path.join(resolved_directory, entry.name)
+                                    if is_excluded(resolved):
+                                        continue
+                                if matches(entry.name):
+                                    yield Path(entry.path)
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                resolved = os.path.join(resolved_directory, entry.name)
+                                if not (excluded and is_excluded(resolved)):
+                                    subdirectories.append((entry.path, resolved))
+                except (PermissionError, FileNotFoundError, NotADirectoryError):
+                    continue
+                stack.extend(reversed(subdirectories))
+
     def discover_files(self, input_paths: List[str], excluded_paths: List[str] | None = None,
                       include_patterns: List[str] | None = None, exclude_patterns: List[str] | None = None,
                       recursive: bool = False, show_progress: bool = True) -> List[Path]:
         """Discover files based on input paths and filtering criteria."""
-        excluded_paths = excluded_paths or []
-        include_patterns = include_patterns or ['*']
-        exclude_patterns = exclude_patterns or []
-        
         discovered_files = []
-        excluded_path_objects = [Path(p).resolve() for p in excluded_paths]
-        
-        # First pass: discover all candidate files
-        with tqdm(input_paths, desc="Discovering files", unit="path", disable=not show_progress) as pbar:
-            for input_path in pbar:
-                path_obj = Path(input_path)
-                if not path_obj.exists():
-                    print(f"Warning: Path does not exist: {input_path}")
-                    continue
-                    
-                if path_obj.is_file():
-                    discovered_files.append(path_obj)
-                else:
-                    # Find files based on recursion setting
-                    if recursive:
-                        file_pattern = path_obj.rglob('*')
-                    else:
-                        file_pattern = path_obj.glob('*')
-                    
-                    path_files = []
-                    for file_path in file_pattern:
-                        if file_path.is_file():
-                            # Check if file is in excluded paths
-                            if any(self._is_path_excluded(file_path, exc_path) for exc_path in excluded_path_objects):
-                                continue
-                            path_files.append(file_path)
-                    
-                    discovered_files.extend(path_files)
-                    pbar.set_postfix(found=len(discovered_files))
-        
-        # Apply include/exclude patterns with progress
-        filtered_files = []
-        with tqdm(discovered_files, desc="Filtering files", unit="file", disable=not show_progress) as pbar:
+        with tqdm(self.iter_files(input_paths, excluded_paths, include_patterns, exclude_patterns, recursive),
+                  desc="Discovering files", unit="file", disable=not show_progress) as pbar:
             for file_path in pbar:
-                filename = file_path.name
-                
-                # Check include patterns using improved matching
-                if not any(self._matches_pattern(filename, pattern) for pattern in include_patterns):
-                    continue
-
-                # Check exclude patterns using improved matching
-                if any(self._matches_pattern(filename, pattern) for pattern in exclude_patterns):
-                    continue
-                    
-                filtered_files.append(file_path)
-                pbar.set_postfix(matched=len(filtered_files))
-                
-        return filtered_files
+                discovered_files.append(file_path)
+        return discovered_files
     
     def _is_path_excluded(self, file_path: Path, excluded_path: Path) -> bool:
         """Check if file_path is within excluded_path."""
@@ -383,16 +439,20 @@ class FileGrouper:
             enhanced_info: TitleInfo object from metadata provider
             provider: The metadata provider that found this title
         """
-        if metadata_id not in self.title_metadata:
-            title_metadata = {
-                'metadata': self._serialize_title_info(enhanced_info),
-                'provider': provider.__class__.__name__ if provider else None
-            }
-            
-            # Add MyAnimeList watch status at title level if available
-            self._add_mal_watch_status(enhanced_info, title_metadata)
-            
-            self.title_metadata[metadata_id] = title_metadata
+        stored_ids = getattr(self._extraction_state, 'stored_ids', None)
+        if stored_ids is not None:
+            stored_ids.append(metadata_id)
+        with self._title_metadata_lock:
+            if metadata_id not in self.title_metadata:
+                title_metadata = {
+                    'metadata': self._serialize_title_info(enhanced_info),
+                    'provider': provider.__class__.__name__ if provider else None
+                }
+                
+                # Add MyAnimeList watch status at title level if available
+                self._add_mal_watch_status(enhanced_info, title_metadata)
+                
+                self.title_metadata[metadata_id] = title_metadata
     
     def _calculate_watch_stats(self, group_files: List[Dict]) -> Dict[str, int]:
         """Calculate watch statistics for a list of files.
@@ -434,27 +494,109 @@ class FileGrouper:
             'mal_watched_files': mal_watched_files
         }
     
-    def extract_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Extract metadata from filename using guessit."""
+    @staticmethod
+    def _parse_file_metadata(file_path: Path) -> Dict[str, Any]:
+        """Parse filename with guessit and add file stats, without provider lookups."""
+        metadata = guessit_wrapper(file_path.name)
+        # Convert guessit result to regular dict and add file info
+        result = dict(metadata)
+        result['filepath'] = str(file_path)
+        result['filename'] = file_path.name
+        
+        # Add file stats including timestamps
+        if file_path.exists():
+            stat_info = file_path.stat()
+            result['file_size'] = stat_info.st_size
+            result['created_time'] = stat_info.st_ctime  # Creation time
+            result['modified_time'] = stat_info.st_mtime  # Modification time
+            result['access_time'] = stat_info.st_atime  # Access time
+        else:
+            result['file_size'] = 0
+            result['created_time'] = None
+            result['modified_time'] = None
+            result['access_time'] = None
+        return result
+
+    def _get_anime_provider(self):
+        """Return the anime metadata provider from the metadata manager, if any."""
+        if not self.metadata_manager:
+            return None
+        for p in self.metadata_manager.providers:
+            if 'anime' in p.__class__.__name__.lower():
+                return p
+        return None
+
+    def _find_title_with_provider(self, provider, title: str, year=None):
+        """Look up a title on a single provider through the manager's shared result cache."""
+        if hasattr(self.metadata_manager, 'find_title_from_provider'):
+            return self.metadata_manager.find_title_from_provider(title, provider.__class__.__name__, year)
+        result = provider.find_title(title, year)
+        if result and result.info:
+            return result.info, provider
+        return None, None
+
+    def _prefetch_title_metadata(self, parsed_results: List[Optional[Dict[str, Any]]]) -> None:
+        """Resolve the titles of all parsed files in bulk before attaching metadata.
+
+        Each distinct (title, year) is resolved once across providers. Season-specific
+        anime titles are resolved in tiers so that later naming variants are only
+        tried for seasons the earlier variants did not match, like the per-file path.
+        """
+        if not (self.metadata_manager and hasattr(self.metadata_manager, 'find_titles')):
+            return
+
+        base_queries = []
+        season_keys = []
+        for result in parsed_results:
+            if not result or not isinstance(result.get('title'), str):
+                continue
+            title = result['title']
+            year = result.get('year')
+            season = result.get('season')
+            base_queries.append((title, year, None))
+            if isinstance(season, int) and season > 1:
+                season_keys.append((title, year, season))
+
         try:
-            metadata = guessit_wrapper(file_path.name)
-            # Convert guessit result to regular dict and add file info
-            result = dict(metadata)
-            result['filepath'] = str(file_path)
-            result['filename'] = file_path.name
-            
-            # Add file stats including timestamps
-            if file_path.exists():
-                stat_info = file_path.stat()
-                result['file_size'] = stat_info.st_size
-                result['created_time'] = stat_info.st_ctime  # Creation time
-                result['modified_time'] = stat_info.st_mtime  # Modification time
-                result['access_time'] = stat_info.st_atime  # Access time
+            self.metadata_manager.find_titles(base_queries)
+
+            anime_provider = self._get_anime_provider()
+            if not anime_provider or not hasattr(self.metadata_manager, 'find_titles_from_provider'):
+                return
+
+            pending = list(dict.fromkeys(season_keys))
+            variant_index = 0
+            while pending:
+                queries = []
+                queried_keys = []
+                for title, year, season in pending:
+                    season_titles = self._generate_season_titles(title, season)
+                    if variant_index < len(season_titles):
+                        queries.append((season_titles[variant_index], year, None))
+                        queried_keys.append((title, year, season))
+                if not queries:
+                    break
+                results = self.metadata_manager.find_titles_from_provider(
+                    queries, anime_provider.__class__.__name__
+                )
+                pending = [key for key, (info, _) in zip(queried_keys, results) if not info]
+                variant_index += 1
+        except Exception as prefetch_error:
+            # Per-file lookups still run (and report failures) during the attach phase
+            print(f"Warning: Bulk metadata lookup failed: {prefetch_error}")
+
+    def extract_metadata(self, file_path: Path, parsed_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract metadata from filename using guessit.
+
+        Args:
+            file_path: File to extract metadata for
+            parsed_metadata: Result of a previous guessit/stat pass for this file; parsed here when omitted
+        """
+        try:
+            if parsed_metadata is not None:
+                result = dict(parsed_metadata)
             else:
-                result['file_size'] = 0
-                result['created_time'] = None
-                result['modified_time'] = None
-                result['access_time'] = None
+                result = self._parse_file_metadata(file_path)
 
             # Add enhanced metadata reference if available
             if self.metadata_manager and MetadataManager:
@@ -478,19 +620,15 @@ class FileGrouper:
                             # For non-anime: skip season-specific titles entirely
                             if season and season > 1 and self.metadata_manager:
                                 # Find anime provider if available
-                                anime_provider = None
-                                for p in self.metadata_manager.providers:
-                                    if 'anime' in p.__class__.__name__.lower():
-                                        anime_provider = p
-                                        break
+                                anime_provider = self._get_anime_provider()
 
                                 # Try season-specific titles ONLY with anime provider
                                 if anime_provider:
                                     season_titles = self._generate_season_titles(title, season)
                                     for season_title in season_titles:
-                                        anime_result = anime_provider.find_title(season_title, year)
-                                        if anime_result and anime_result.info:
-                                            enhanced_info = anime_result.info
+                                        anime_info, _ = self._find_title_with_provider(anime_provider, season_title, year)
+                                        if anime_info:
+                                            enhanced_info = anime_info
                                             provider = anime_provider
                                             break
                             
@@ -527,10 +665,10 @@ class FileGrouper:
                                             if anime_provider and hasattr(anime_provider, 'get_episode_info'):
                                                 # Find title in anime provider to get the anime ID, if the result does not come with a title, then use the title from filename
                                                 original_title = result.get('title', title)
-                                                title_result = anime_provider.find_title(original_title, year)
+                                                title_result, _ = self._find_title_with_provider(anime_provider, original_title, year)
                                                 if title_result:
                                                     # Use anime provider's episode lookup with anime ID, season, and episode
-                                                    episode_info = anime_provider.get_episode_info(title_result.info.id, original_season, original_episode)
+                                                    episode_info = anime_provider.get_episode_info(title_result.id, original_season, original_episode)
                                                     if episode_info:
                                                         # Save original file-based episode number and season
                                                         result['original_episode'] = original_episode
@@ -608,89 +746,7 @@ class FileGrouper:
                     except Exception as metadata_error:
                         print(f"Warning: Enhanced metadata lookup failed for {file_path.name}: {metadata_error}")
             
-            # Add Plex watch status if available
-            if self.plex_provider and PlexMetadataProvider:
-                try:
-                    watch_status = self.plex_provider.get_watch_status(str(file_path))
-                    if watch_status:
-                        result['plex_watch_status'] = self._serialize_plex_watch_status(watch_status)
-                except Exception as plex_error:
-                    # Silently continue if Plex lookup fails (database might be locked, etc.)
-                    pass
-
-            # Normalize provider episode payload for downstream consumers
-            if result.get('episode_info') and not result.get('episode_metadata'):
-                result['episode_metadata'] = result['episode_info']
-
-            # Attach title-level metadata directly to each episode record
-            metadata_id = result.get('metadata_id')
-            title_metadata_entry = None
-            if metadata_id is not None:
-                title_metadata_entry = self.title_metadata.get(metadata_id) or self.title_metadata.get(str(metadata_id))
-
-            if title_metadata_entry:
-                title_metadata = title_metadata_entry.get('metadata', {})
-
-                if title_metadata and not result.get('series_metadata'):
-                    result['series_metadata'] = {
-                        'id': metadata_id,
-                        'title': title_metadata.get('title', result.get('title', 'Unknown')),
-                        'type': title_metadata.get('type', 'unknown'),
-                        'year': title_metadata.get('year'),
-                        'rating': title_metadata.get('rating'),
-                        'genres': title_metadata.get('genres', []),
-                        'tags': title_metadata.get('tags', []),
-                        'sources': title_metadata.get('sources', []),
-                        'total_episodes': title_metadata.get('total_episodes'),
-                        'plot': title_metadata.get('plot')
-                    }
-
-                if not result.get('source_url'):
-                    result['source_url'] = self._select_preferred_source_url(title_metadata.get('sources', []))
-
-                if 'myanimelist_watch_status' in title_metadata_entry and not result.get('myanimelist_watch_status'):
-                    result['myanimelist_watch_status'] = title_metadata_entry['myanimelist_watch_status']
-
-            # Derive per-episode watch status from title-level MyAnimeList data
-            plex_watched = False
-            mal_episode_watched = False
-            
-            if result.get('plex_watch_status'):
-                plex_status = result['plex_watch_status']
-                plex_watched = plex_status.get('watched', False) or plex_status.get('view_offset', 0) > 0
-            
-            # Check if this episode is watched according to MyAnimeList
-            metadata_id = result.get('metadata_id')
-            if metadata_id and metadata_id in self.title_metadata:
-                mal_status = self.title_metadata[metadata_id].get('myanimelist_watch_status')
-                if mal_status:
-                    # Determine which episode number to use based on whether metadata is season-specific
-                    # If the MAL entry is for a specific season (e.g., "86 Part 2"), use in-season episode number
-                    # If it's for the entire series, use original (absolute) episode number
-                    mal_title = self.title_metadata[metadata_id]['metadata'].get('title', '')
-                    is_season_specific = any(keyword in mal_title.lower() for keyword in self.SEASON_KEYWORDS)
-                    
-                    if is_season_specific:
-                        # Season-specific MAL entry - use in-season episode number
-                        episode_num = result.get('episode')
-                    else:
-                        # Series-wide MAL entry - use absolute episode number
-                        episode_num = result.get('original_episode') or result.get('episode')
-                    
-                    mal_watched_episodes = mal_status.get('my_watched_episodes', 0)
-                    if episode_num and episode_num <= mal_watched_episodes:
-                        mal_episode_watched = True
-            
-            # Set combined episode watch status
-            if plex_watched or mal_episode_watched:
-                result['episode_watched'] = True
-                result['watch_source'] = []
-                if plex_watched:
-                    result['watch_source'].append('plex')
-                if mal_episode_watched:
-                    result['watch_source'].append('myanimelist')
-            else:
-                result['episode_watched'] = False
+            self._finalize_file_metadata(result, file_path)
 
             return result
         except Exception as e:
@@ -703,20 +759,325 @@ class FileGrouper:
                 'file_size': file_path.stat().st_size if file_path.exists() else 0
             }
     
-    def group_files(self, files: List[Path], group_by: List[str] | None = None, show_progress: bool = True) -> Dict[str, List[Dict]]:
-        """Group files based on specified metadata fields."""
+    def _finalize_file_metadata(self, result: Dict[str, Any], file_path: Path) -> None:
+        """Attach Plex status, title-level metadata and the combined watch status to a file record."""
+        # Add Plex watch status if available
+        if self.plex_provider and PlexMetadataProvider:
+            try:
+                if self._plex_watch_statuses is not None and str(file_path) in self._plex_watch_statuses:
+                    watch_status = self._plex_watch_statuses[str(file_path)]
+                else:
+                    watch_status = self.plex_provider.get_watch_status(str(file_path))
+                if watch_status:
+                    result['plex_watch_status'] = self._serialize_plex_watch_status(watch_status)
+            except Exception as plex_error:
+                # Silently continue if Plex lookup fails (database might be locked, etc.)
+                pass
+
+        # Normalize provider episode payload for downstream consumers
+        if result.get('episode_info') and not result.get('episode_metadata'):
+            result['episode_metadata'] = result['episode_info']
+
+        # Attach title-level metadata directly to each episode record
+        metadata_id = result.get('metadata_id')
+        title_metadata_entry = None
+        if metadata_id is not None:
+            title_metadata_entry = self.title_metadata.get(metadata_id) or self.title_metadata.get(str(metadata_id))
+
+        if title_metadata_entry:
+            title_metadata = title_metadata_entry.get('metadata', {})
+
+            if title_metadata and not result.get('series_metadata'):
+                result['series_metadata'] = {
+                    'id': metadata_id,
+                    'title': title_metadata.get('title', result.get('title', 'Unknown')),
+                    'type': title_metadata.get('type', 'unknown'),
+                    'year': title_metadata.get('year'),
+                    'rating': title_metadata.get('rating'),
+                    'genres': title_metadata.get('genres', []),
+                    'tags': title_metadata.get('tags', []),
+                    'sources': title_metadata.get('sources', []),
+                    'total_episodes': title_metadata.get('total_episodes'),
+                    'plot': title_metadata.get('plot')
+                }
+
+            if not result.get('source_url'):
+                result['source_url'] = self._select_preferred_source_url(title_metadata.get('sources', []))
+
+            if 'myanimelist_watch_status' in title_metadata_entry and not result.get('myanimelist_watch_status'):
+                result['myanimelist_watch_status'] = title_metadata_entry['myanimelist_watch_status']
+
+        # Derive per-episode watch status from title-level MyAnimeList data
+        plex_watched = False
+        mal_episode_watched = False
+        
+        if result.get('plex_watch_status'):
+            plex_status = result['plex_watch_status']
+            plex_watched = plex_status.get('watched', False) or plex_status.get('view_offset', 0) > 0
+        
+        # Check if this episode is watched according to MyAnimeList
+        metadata_id = result.get('metadata_id')
+        if metadata_id and metadata_id in self.title_metadata:
+            mal_status = self.title_metadata[metadata_id].get('myanimelist_watch_status')
+            if mal_status:
+                # Determine which episode number to use based on whether metadata is season-specific
+                # If the MAL entry is for a specific season (e.g., "86 Part 2"), use in-season episode number
+                # If it's for the entire series, use original (absolute) episode number
+                mal_title = self.title_metadata[metadata_id]['metadata'].get('title', '')
+                is_season_specific = any(keyword in mal_title.lower() for keyword in self.SEASON_KEYWORDS)
+                
+                if is_season_specific:
+                    # Season-specific MAL entry - use in-season episode number
+                    episode_num = result.get('episode')
+                else:
+                    # Series-wide MAL entry - use absolute episode number
+                    episode_num = result.get('original_episode') or result.get('episode')
+                
+                mal_watched_episodes = mal_status.get('my_watched_episodes', 0)
+                if episode_num and episode_num <= mal_watched_episodes:
+                    mal_episode_watched = True
+        
+        # Set combined episode watch status
+        if plex_watched or mal_episode_watched:
+            result['episode_watched'] = True
+            result['watch_source'] = []
+            if plex_watched:
+                result['watch_source'].append('plex')
+            if mal_episode_watched:
+                result['watch_source'].append('myanimelist')
+        else:
+            result['episode_watched'] = False
+
+    def _parse_files(self, files: Iterable[Path], show_progress: bool) -> Tuple[List[Path], List[Optional[Dict[str, Any]]]]:
+        """guessit-parse and stat every file, in a process pool when workers > 1.
+
+        ``files`` may be a generator such as iter_files, in which case parsing
+        starts while discovery is still running. Returns the files in the order
+        consumed together with their parse results.
+        """
+        consumed: List[Path] = []
+
+        def consume(iterable):
+            for file_path in iterable:
+                consumed.append(file_path)
+                yield file_path
+
+        files = iter(files) if not isinstance(files, list) else files
+        total = len(files) if isinstance(files, list) else None
+        if self.workers > 1 and (total is None or total > 1):
+            parsed_results = []
+            try:
+                chunksize = max(1, total // (self.workers * 8)) if total else 1
+                with ProcessPoolExecutor(max_workers=self.workers) as executor, \
+                        tqdm(total=total, desc="Parsing filenames", unit="file", disable=not show_progress) as pbar:
+                    for parsed_metadata in executor.map(_parse_file_or_none, consume(files), chunksize=chunksize):
+                        parsed_results.append(parsed_metadata)
+                        pbar.update(1)
+                return consumed, parsed_results
+            except (BrokenProcessPool, OSError) as pool_error:
+                print(f"Warning: Parallel filename parsing failed ({pool_error}); parsing serially")
+            # Files taken by the pool are parsed again, then whatever discovery has left
+            remaining = files if isinstance(files, list) else itertools.chain(list(consumed), files)
+            consumed.clear()
+            files = remaining
+
+        parsed_results = []
+        with tqdm(consume(files), total=total, desc="Parsing filenames", unit="file", disable=not show_progress) as pbar:
+            for file_path in pbar:
+                parsed_results.append(_parse_file_or_none(file_path))
+        return consumed, parsed_results
+
+    def _extract_metadata_recording_titles(self, file_path: Path, parsed_metadata: Optional[Dict[str, Any]]):
+        """extract_metadata, also returning the metadata ids it stored or found already stored."""
+        self._extraction_state.stored_ids = []
+        try:
+            return self.extract_metadata(file_path, parsed_metadata), self._extraction_state.stored_ids
+        finally:
+            self._extraction_state.stored_ids = None
+
+    def _extract_metadata_parallel(self, files: List[Path], parsed_results: List[Optional[Dict[str, Any]]],
+                                   show_progress: bool) -> None:
+        """Run extract_metadata on a thread pool, then restore serial ordering.
+
+        Files finish in any order, so self.metadata is filled in file order
+        afterwards and title_metadata is rebuilt in the order a serial run would
+        have first stored each id.
+        """
+        set_reader_count = getattr(self.metadata_manager, 'set_reader_count', None)
+        if callable(set_reader_count):
+            set_reader_count(self.workers)
+
+        previous_ids = list(self.title_metadata)
+        outcomes: List[Any] = [None] * len(files)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                tqdm(total=len(files), desc="Extracting metadata", unit="file", disable=not show_progress) as pbar:
+            futures = {
+                executor.submit(self._extract_metadata_recording_titles, file_path, parsed_metadata): index
+                for index, (file_path, parsed_metadata) in enumerate(zip(files, parsed_results))
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                outcomes[index] = future.result()
+                pbar.update(1)
+                name = files[index].name
+                pbar.set_postfix(file=name[:30] + "..." if len(name) > 30 else name)
+
+        ordered_ids = list(previous_ids)
+        for file_path, (metadata, stored_ids) in zip(files, outcomes):
+            self.metadata[str(file_path)] = metadata
+            ordered_ids.extend(stored_ids)
+        with self._title_metadata_lock:
+            unordered = self.title_metadata
+            self.title_metadata = {
+                metadata_id: unordered[metadata_id]
+                for metadata_id in dict.fromkeys(ordered_ids)
+                if metadata_id in unordered
+            }
+            for metadata_id, value in unordered.items():
+                self.title_metadata.setdefault(metadata_id, value)
+
+    @staticmethod
+    def load_export(path: str) -> Dict[str, Any]:
+        """Read a previous export_to_json file for use as group_files(previous_export=...)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return json_stream.load(f)
+
+    @staticmethod
+    def _exported_file_records(previous_export: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """File records of a previous export by file path."""
+        previous_by_path = {}
+        for group_files in previous_export.get('groups', {}).values():
+            for file_info in group_files:
+                if isinstance(file_info, dict) and file_info.get('filepath'):
+                    previous_by_path[file_info['filepath']] = file_info
+        return previous_by_path
+
+    @staticmethod
+    def _reusable_record(previous_by_path: Dict[str, Dict[str, Any]], file_path: Path) -> Optional[Dict[str, Any]]:
+        """Previous record of the file if its path, size and modification time are unchanged."""
+        previous = previous_by_path.get(str(file_path))
+        if previous is None:
+            return None
+        try:
+            stat_info = file_path.stat()
+        except OSError:
+            return None
+        # Records of failed extractions carry no modified_time, so those files are retried
+        if previous.get('file_size') == stat_info.st_size and previous.get('modified_time') == stat_info.st_mtime:
+            return previous
+        return None
+
+    @classmethod
+    def _reusable_file_metadata(cls, previous_export: Dict[str, Any], files: List[Path]) -> Dict[str, Dict[str, Any]]:
+        """Previous records of the files whose path, size and modification time are unchanged."""
+        previous_by_path = cls._exported_file_records(previous_export)
+        reusable = {}
+        for file_path in files:
+            previous = cls._reusable_record(previous_by_path, file_path)
+            if previous is not None:
+                reusable[str(file_path)] = previous
+        return reusable
+
+    def _restore_title_metadata(self, previous_export: Dict[str, Any], reused_files: List[Dict[str, Any]]) -> None:
+        """Rebuild title_metadata entries referenced by reused file records from their exported form."""
+        exported = previous_export.get('title_metadata', {})
+        for file_info in reused_files:
+            metadata_id = file_info.get('metadata_id')
+            if metadata_id is None or metadata_id in self.title_metadata:
+                continue
+            entry = exported.get(str(metadata_id))
+            if not isinstance(entry, dict):
+                continue
+            metadata = dict(entry)
+            provider = metadata.pop('provider', None)
+            # Watch status is looked up again, the list may have changed since the export
+            metadata.pop('myanimelist_watch_status', None)
+            title_metadata = {'metadata': metadata, 'provider': provider}
+            self._add_mal_watch_status(types.SimpleNamespace(sources=metadata.get('sources')), title_metadata)
+            self.title_metadata[metadata_id] = title_metadata
+
+    def _reuse_file_metadata(self, previous: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+        """Previous record of an unchanged file with its watch status refreshed."""
+        result = dict(previous)
+        for key in ('plex_watch_status', 'myanimelist_watch_status', 'episode_watched', 'watch_source'):
+            result.pop(key, None)
+        self._finalize_file_metadata(result, file_path)
+        return result
+
+    def group_files(self, files: Iterable[Path], group_by: List[str] | None = None, show_progress: bool = True,
+                    previous_export: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict]]:
+        """Group files based on specified metadata fields.
+
+        ``files`` may be the iter_files generator, so filename parsing runs
+        while discovery is still walking directories.
+
+        With ``previous_export`` (see load_export), unchanged files reuse their
+        exported records and only new or changed files are parsed and looked
+        up; group metadata is only recomputed for groups whose files changed.
+        """
         group_by = group_by or ['title', 'year']
         
         self.groups.clear()
         self.metadata.clear()
         self.group_metadata.clear()
-        
-        # Extract metadata with progress tracking
-        with tqdm(files, desc="Extracting metadata", unit="file", disable=not show_progress) as pbar:
-            for file_path in pbar:
-                metadata = self.extract_metadata(file_path)
-                self.metadata[str(file_path)] = metadata
-                pbar.set_postfix(file=file_path.name[:30] + "..." if len(file_path.name) > 30 else file_path.name)
+        self._plex_watch_statuses = None
+
+        discovered: List[Path] = []
+        reusable = {}
+        previous_by_path = self._exported_file_records(previous_export) if previous_export else {}
+
+        def changed_files_of(iterable):
+            for file_path in iterable:
+                discovered.append(file_path)
+                previous = self._reusable_record(previous_by_path, file_path) if previous_by_path else None
+                if previous is None:
+                    yield file_path
+                else:
+                    reusable[str(file_path)] = previous
+
+        # Parse filenames first so that titles can be resolved in bulk
+        source = changed_files_of(files)
+        if isinstance(files, list):
+            source = list(source)
+        changed_files, parsed_results = self._parse_files(source, show_progress)
+        files = discovered
+        if previous_export:
+            self._restore_title_metadata(previous_export, list(reusable.values()))
+            if show_progress:
+                print(f"Reusing {len(reusable)} of {len(files)} files from the previous export")
+
+        if self.metadata_manager and MetadataManager:
+            if show_progress:
+                print("Resolving titles...")
+            self._prefetch_title_metadata(parsed_results)
+
+        if self.plex_provider and PlexMetadataProvider and hasattr(self.plex_provider, 'get_watch_statuses'):
+            if show_progress:
+                print("Resolving Plex watch status...")
+            try:
+                self._plex_watch_statuses = self.plex_provider.get_watch_statuses(str(f) for f in files)
+            except Exception as plex_error:
+                print(f"Warning: Bulk Plex lookup failed: {plex_error}")
+
+        # Attach metadata with progress tracking
+        if self.workers > 1 and len(changed_files) > 1:
+            self._extract_metadata_parallel(changed_files, parsed_results, show_progress)
+        else:
+            with tqdm(list(zip(changed_files, parsed_results)), desc="Extracting metadata", unit="file", disable=not show_progress) as pbar:
+                for file_path, parsed_metadata in pbar:
+                    metadata = self.extract_metadata(file_path, parsed_metadata)
+                    self.metadata[str(file_path)] = metadata
+                    pbar.set_postfix(file=file_path.name[:30] + "..." if len(file_path.name) > 30 else file_path.name)
+
+        if reusable:
+            extracted = self.metadata
+            self.metadata = {
+                str(file_path): (
+                    self._reuse_file_metadata(reusable[str(file_path)], file_path)
+                    if str(file_path) in reusable else extracted[str(file_path)]
+                )
+                for file_path in files
+            }
         
         # Group files with progress tracking
         with tqdm(files, desc="Grouping files", unit="file", disable=not show_progress) as pbar:
@@ -736,10 +1097,23 @@ class FileGrouper:
                 self.groups[group_key].append(metadata)
                 pbar.set_postfix(groups=len(self.groups))
 
+        # Groups whose files all come unchanged from the previous export keep its group metadata
+        previous_group_metadata = previous_export.get('group_metadata') if previous_export else None
+        previous_members = {}
+        if previous_group_metadata is not None:
+            previous_members = {
+                group_key: {file_info.get('filepath') for file_info in group_files}
+                for group_key, group_files in previous_export.get('groups', {}).items()
+            }
+
         # Get group metadata after all files are processed
         with tqdm(self.groups.items(), desc="Processing group metadata", unit="group", disable=not show_progress) as pbar:
             for group_key, group_files in pbar:
-                group_metadata = self._get_group_metadata(group_files, group_by)
+                members = {file_info.get('filepath') for file_info in group_files}
+                if previous_members.get(group_key) == members and members.issubset(reusable):
+                    group_metadata = previous_group_metadata.get(group_key)
+                else:
+                    group_metadata = self._get_group_metadata(group_files, group_by)
                 if group_metadata:
                     self.group_metadata[group_key] = group_metadata
                 pbar.set_postfix(group=group_key[:40] + "..." if len(group_key) > 40 else group_key)
@@ -784,11 +1158,9 @@ class FileGrouper:
         
         return summary
     
-    def export_to_json(self, output_path: str, include_summary: bool = True) -> None:
-        """Export grouped data to JSON file."""
-        # Create title_metadata dict with complete metadata including MyAnimeList watch status
-        # Now using metadata IDs directly as keys
-        title_metadata_export = {}
+    def _export_title_metadata(self):
+        """(metadata id, exported metadata) pairs, including MyAnimeList watch status."""
+        # Metadata IDs are used directly as keys
         for metadata_id, value in self.title_metadata.items():
             # Export the complete metadata including MyAnimeList watch status
             metadata_dict = value['metadata'].copy()
@@ -800,11 +1172,19 @@ class FileGrouper:
             if 'myanimelist_watch_status' in value:
                 metadata_dict['myanimelist_watch_status'] = value['myanimelist_watch_status']
             
-            title_metadata_export[str(metadata_id)] = metadata_dict
-        
+            yield str(metadata_id), metadata_dict
+
+    def export_to_json(self, output_path: str, include_summary: bool = True) -> None:
+        """Export grouped data to JSON file.
+
+        Groups and title metadata are written one entry at a time (see
+        json_stream), so the export is never built as a single string.
+        """
         export_data = {
-            'groups': dict(self.groups),
-            'title_metadata': title_metadata_export
+            'groups': self.groups,
+            'title_metadata': self._export_title_metadata(),
+            # Lets a later --incremental run skip recomputing unchanged groups
+            'group_metadata': self.group_metadata
         }
         
         if include_summary:
@@ -829,7 +1209,7 @@ class FileGrouper:
                 export_data['group_watch_summaries'] = group_summaries
         
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+            json_stream.dump(export_data, f, cls=CustomJSONEncoder)
     
     def _serialize_title_info(self, title_info) -> Dict[str, Any]:
         """Convert TitleInfo object to serializable dict"""
@@ -940,6 +1320,15 @@ class FileGrouper:
         # Remove quotes, backslashes, and other problematic characters
         return re.sub(r'[\'"\\\r\n\t\b\f]', '', key)
 
+def _parse_file_or_none(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Parse one file; module-level so the process pool can pickle it."""
+    try:
+        return FileGrouper._parse_file_metadata(file_path)
+    except Exception:
+        # extract_metadata re-parses and reports the failure
+        return None
+
+
 def main():
     """Command-line interface."""
     parser = argparse.ArgumentParser(
@@ -975,6 +1364,13 @@ Examples:
                        help='Same as --verbose 0')
     parser.add_argument('--myanimelist-xml', metavar='PATH_OR_URL',
                        help='Path to MyAnimeList XML file or URL for watch status lookup')
+    parser.add_argument('--incremental', metavar='PREVIOUS_JSON',
+                       help='Reuse records of unchanged files (same path, size and mtime) from a previous --export file')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                       help='Parse filenames in N processes and look up metadata in N threads (default: 1, serial)')
+    parser.add_argument('--plex-snapshot', action='store_true',
+                       help='Answer Plex watch status from a snapshot of the Plex media parts, kept in '
+                            '~/.video_metadata_cache/plex_snapshot.pickle and rebuilt when the Plex database changes')
     
     args = parser.parse_args()
     
@@ -987,15 +1383,17 @@ Examples:
     # Create file grouper instance
     grouper = FileGrouper(
         get_metadata_manager() if MetadataManager else None,
-        get_plex_provider() if PlexMetadataProvider else None,
-        args.myanimelist_xml if hasattr(args, 'myanimelist_xml') else None
+        get_plex_provider(use_snapshot=args.plex_snapshot) if PlexMetadataProvider else None,
+        args.myanimelist_xml if hasattr(args, 'myanimelist_xml') else None,
+        workers=args.workers
     )
     
     # Discover files
     if verbosity >= 1:
-        print("Discovering files...")
+        print("Discovering files and extracting metadata...")
     
-    files = grouper.discover_files(
+    # Files are streamed into grouping, which parses them while discovery continues
+    files = grouper.iter_files(
         args.input_paths,
         args.exclude_paths,
         args.include_patterns,
@@ -1003,17 +1401,23 @@ Examples:
         args.recursive
     )
     
-    if not files:
+    previous_export = None
+    if args.incremental:
+        try:
+            previous_export = FileGrouper.load_export(args.incremental)
+        except (OSError, ValueError) as load_error:
+            print(f"Warning: Could not read previous export {args.incremental} ({load_error}); processing all files")
+
+    # Group files
+    groups = grouper.group_files(files, args.group_by, previous_export=previous_export)
+
+    if not grouper.metadata:
         if verbosity >= 1:
             print("No files found matching criteria.")
         return
-    
+
     if verbosity >= 1:
-        print(f"Found {len(files)} files")
-        print("Extracting metadata and grouping...")
-    
-    # Group files
-    groups = grouper.group_files(files, args.group_by)
+        print(f"Found {len(grouper.metadata)} files")
     
     # Display results
     if verbosity >= 1:
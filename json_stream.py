@@ -0,0 +1,133 @@
+"""Streaming JSON writer and reader for large group exports.
+
+``dump`` writes a mapping one entry at a time instead of building the whole
+document first. Objects down to ``depth`` levels are written entry by entry,
+and each deeper value (a single group, for example) is encoded in one go.
+Values at streamed levels may also be iterators of ``(key, value)`` pairs,
+so callers can generate entries lazily. The output is the same as
+``json.dump(obj, fp, indent=indent, ensure_ascii=ensure_ascii, cls=cls)``.
+
+``load`` reads the file in chunks and decodes objects down to ``depth``
+levels one member at a time, so the whole file is never held as a single
+string next to the parsed result.
+"""
+import json
+import re
+from collections.abc import Iterator, Mapping
+from typing import Any, Optional, Type
+
+DEFAULT_DEPTH = 2
+READ_CHUNK_CHARS = 1 << 20
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that can continue a number, e.g. '1' then '.5e3' in the next chunk
+_NUMBER_CONTINUATION = frozenset('0123456789.eE+-')
+
+
+def _write_object(fp, items, level: int, depth: int, encoder: json.JSONEncoder, indent: str) -> None:
+    if isinstance(items, Mapping):
+        items = items.items()
+    inner_indent = indent * (level + 1)
+    first = True
+    for key, value in items:
+        fp.write(f"{'{' if first else ','}\n{inner_indent}{encoder.encode(str(key))}: ")
+        first = False
+        if depth > 1 and isinstance(value, (Mapping, Iterator)):
+            _write_object(fp, value, level + 1, depth - 1, encoder, indent)
+        else:
+            # Encoded values never contain raw newlines inside strings, so re-indenting is safe
+            fp.write(encoder.encode(value).replace('\n', f"\n{inner_indent}"))
+    fp.write('{}' if first else f"\n{indent * level}}}")
+
+
+def dump(obj: Any, fp, *, cls: Optional[Type[json.JSONEncoder]] = None, indent: int = 2,
+         ensure_ascii: bool = False, depth: int = DEFAULT_DEPTH) -> None:
+    """Write ``obj`` to ``fp`` as indented JSON, streaming its top ``depth`` object levels."""
+    encoder = (cls or json.JSONEncoder)(indent=indent, ensure_ascii=ensure_ascii)
+    if isinstance(obj, (Mapping, Iterator)):
+        _write_object(fp, obj, 0, depth, encoder, ' ' * indent)
+    else:
+        fp.write(encoder.encode(obj))
+
+
+class _ChunkReader:
+    """Decodes JSON values from a text stream while keeping only unread text buffered."""
+
+    def __init__(self, fp, chunk_chars: int = READ_CHUNK_CHARS):
+        self.fp = fp
+        self.chunk_chars = chunk_chars
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, min_chars: int = 0) -> bool:
+        chunk = self.fp.read(max(self.chunk_chars, min_chars))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of input."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A bare number cut off by the buffer end decodes as its prefix
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in _NUMBER_CONTINUATION):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads with the pending value so large values are not re-decoded too often
+            self._fill(len(self.buffer) - self.pos)
+
+    def read_object(self, depth: int) -> dict:
+        self.expect('{')
+        result = {}
+        if self.peek() == '}':
+            self.pos += 1
+            return result
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(':')
+            if depth > 1 and self.peek() == '{':
+                result[key] = self.read_object(depth - 1)
+            else:
+                result[key] = self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return result
+
+
+def load(fp, depth: int = DEFAULT_DEPTH, chunk_chars: int = READ_CHUNK_CHARS) -> Any:
+    """Read a JSON document from ``fp`` in chunks; the result equals ``json.load(fp)``."""
+    reader = _ChunkReader(fp, chunk_chars)
+    result = reader.read_object(depth) if reader.peek() == '{' else reader.value()
+    if reader.peek():
+        raise reader._error("Extra data")
+    return result
@@ -19,6 +19,7 @@ from file_grouper import (
     METADATA_MANAGER_AVAILABLE,
     PLEX_PROVIDER_AVAILABLE,
 )
+import webapp_payload
 
 try:
     from tqdm import tqdm
@@ -232,8 +233,12 @@ class LatestEpisodesViewer:
             'oldest_download': datetime.fromtimestamp(oldest_date).isoformat() if oldest_date else None
         }
     
-    def export_webapp(self, results: Dict[str, Any], output_path: str) -> None:
-        """Export results as a standalone HTML webapp."""
+    def export_webapp(self, results: Dict[str, Any], output_path: str, chunk_size: int = 0) -> None:
+        """Export results as a standalone HTML webapp.
+
+        With ``chunk_size`` set, only the newest episodes are embedded and the
+        rest are written as lazily loaded chunks of that many episodes.
+        """
         
         # Read template files
         template_dir = Path(__file__).parent
@@ -241,6 +246,7 @@ class LatestEpisodesViewer:
         # Define template file paths
         css_template_path = template_dir / "latest_episodes_webapp_template.css"
         virtual_list_template_path = template_dir / "latest_episodes_virtual_list.js"
+        payload_loader_template_path = template_dir / webapp_payload.LOADER_SCRIPT
         js_template_path = template_dir / "latest_episodes_webapp_template.js"
         html_template_path = template_dir / "latest_episodes_webapp_template.html"
         
@@ -250,6 +256,8 @@ class LatestEpisodesViewer:
             missing_files.append(str(css_template_path))
         if not virtual_list_template_path.exists():
             missing_files.append(str(virtual_list_template_path))
+        if not payload_loader_template_path.exists():
+            missing_files.append(str(payload_loader_template_path))
         if not js_template_path.exists():
             missing_files.append(str(js_template_path))
         if not html_template_path.exists():
@@ -263,6 +271,7 @@ class LatestEpisodesViewer:
             print("  - latest_episodes_webapp_template.html")
             print("  - latest_episodes_webapp_template.css")
             print("  - latest_episodes_virtual_list.js")
+            print(f"  - {webapp_payload.LOADER_SCRIPT}")
             print("  - latest_episodes_webapp_template.js")
             raise FileNotFoundError(f"Missing template files: {', '.join(missing_files)}")
         
@@ -273,16 +282,25 @@ class LatestEpisodesViewer:
         with open(virtual_list_template_path, 'r', encoding='utf-8') as f:
             virtual_list_content = f.read()
 
+        with open(payload_loader_template_path, 'r', encoding='utf-8') as f:
+            payload_loader_content = f.read()
+
         with open(js_template_path, 'r', encoding='utf-8') as f:
             js_content = f.read()
 
-        bundled_js_content = f"{virtual_list_content}\n\n{js_content}"
+        bundled_js_content = f"{virtual_list_content}\n\n{payload_loader_content}\n\n{js_content}"
         
         with open(html_template_path, 'r', encoding='utf-8') as f:
             html_template = f.read()
         
+        # Keep the newest episodes inline and move the rest into lazily loaded chunks
+        payload = webapp_payload.split_payload(
+            self._with_series_episode_counts(results) if chunk_size else results,
+            'episodes', output_path, chunk_size, cls=CustomJSONEncoder
+        )
+
         # Generate HTML with embedded data
-        html_content = self._generate_html_from_template(results, html_template, css_content, bundled_js_content)
+        html_content = self._generate_html_from_template(payload, html_template, css_content, bundled_js_content)
         
         # Write the complete HTML file
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -290,6 +308,26 @@ class LatestEpisodesViewer:
         
         print(f"Latest Episodes webapp exported to: {output_path}")
     
+    @staticmethod
+    def _with_series_episode_counts(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of results whose episodes carry their series' episode count.
+
+        The webapp counts episodes per series from the episodes it has, which
+        would undercount while chunks are still loading.
+        """
+        def series_title(episode: Dict[str, Any]) -> str:
+            return (episode.get('metadata') or {}).get('title') or 'Unknown'
+
+        series_counts = defaultdict(int)
+        for episode in results['episodes']:
+            series_counts[series_title(episode)] += 1
+        episodes = [
+            episode if episode.get('series_episode_count') is not None
+            else {**episode, 'series_episode_count': series_counts[series_title(episode)]}
+            for episode in results['episodes']
+        ]
+        return {**results, 'episodes': episodes}
+
     def _generate_html_from_template(self, results: Dict[str, Any], html_template: str, css_content: str, js_content: str) -> str:
         """Generate the HTML from template with embedded data."""
         
@@ -349,6 +387,9 @@ Examples:
                        help='Wildcard patterns for files to exclude')
     parser.add_argument('--export', metavar='FILE', required=True,
                        help='Export results to HTML webapp file')
+    parser.add_argument('--webapp-chunk-size', type=int, default=0, metavar='N',
+                       help='Embed only the newest episodes in the webapp and load the rest from '
+                            'compressed chunks of N episodes beside it (default: 0, embed everything)')
     parser.add_argument('--recursive', '-r', action='store_true',
                        help='Recursively search subdirectories (default: False)')
     parser.add_argument('--max-episodes', type=int, default=100,
@@ -504,7 +545,7 @@ Examples:
                     traceback.print_exc()
         
         # Export webapp
-        viewer.export_webapp(results, args.export)
+        viewer.export_webapp(results, args.export, chunk_size=args.webapp_chunk_size)
         
         # Print summary
         if args.verbose >= 1:
@@ -15,6 +15,7 @@
             this.enableDynamicMeasurement = options.enableDynamicMeasurement !== false;
             this.rangeStrategy = options.rangeStrategy === 'chunked' ? 'chunked' : 'viewport';
             this.chunkSize = Number.isFinite(options.chunkSize) ? Math.max(4, options.chunkSize) : 24;
+            this.onRangeChange = typeof options.onRangeChange === 'function' ? options.onRangeChange : null;
             this.items = [];
             this.offsets = [];
             this.heights = [];
@@ -279,6 +280,9 @@
             if (this.enableDynamicMeasurement && (!this.isScrollActive || force)) {
                 this.measureVisibleItems();
             }
+            if (this.onRangeChange) {
+                this.onRangeChange(range, this.items.length);
+            }
         }
 
         measureVisibleItems() {
@@ -12,6 +12,8 @@
 // Legacy Hash Format: #episode:SeriesName:1:5
 
 const ENABLE_EPISODE_NAME_SEARCH = false;
+// Start loading the next data chunk when the list is this many rows from its end
+const PAYLOAD_PREFETCH_ROWS = 40;
 
 class LatestEpisodesApp {
     constructor() {
@@ -22,6 +24,7 @@ class LatestEpisodesApp {
         this.virtualRows = [];
         this.episodeIndexToRowIndex = new Map();
         this.episodeListVirtualizer = null;
+        this.payloadLoader = null;
         this.selectedEpisode = null;
         this.collapsedSeriesGroups = new Set();
         this.searchTerm = '';
@@ -457,9 +460,10 @@ class LatestEpisodesApp {
         // styles are provided via latest_episodes_webapp_template.css; no runtime injection
         this.setupNavigation();
         this.updateHeaderStats();
+        this.initializePayloadLoader();
         this.populateSeriesFilter();
         this.filterAndDisplayEpisodes();
-        this.handleInitialNavigation();
+        this.handleInitialNavigationWhenLoaded();
         this.updateSearchIndicator();
         // Prepare mobile initial state: collapse filters and ensure list is shown
         if (this.isMobile()) {
@@ -856,10 +860,46 @@ class LatestEpisodesApp {
                 }
                 return this.useStableMobileVirtualization ? 104 : 98;
             },
-            renderItem: (row) => this.renderEpisodeListRow(row)
+            renderItem: (row) => this.renderEpisodeListRow(row),
+            onRangeChange: (range, rowCount) => {
+                if (this.payloadLoader && range.end >= rowCount - PAYLOAD_PREFETCH_ROWS) {
+                    this.payloadLoader.loadNext();
+                }
+            }
         });
     }
 
+    initializePayloadLoader() {
+        if (!this.data.payload_chunks || typeof WebappPayloadLoader === 'undefined') {
+            return;
+        }
+
+        this.payloadLoader = new WebappPayloadLoader(this.data.payload_chunks, {
+            onChunk: (episodes) => this.appendEpisodeChunk(episodes)
+        });
+    }
+
+    appendEpisodeChunk(episodes) {
+        this.data.episodes = this.data.episodes.concat(episodes);
+        this.normalizeEpisodeData();
+        this.populateSeriesFilter();
+        this.filterAndDisplayEpisodes();
+    }
+
+    handleInitialNavigationWhenLoaded() {
+        // Links to an episode or filter may point past the inline episodes, so wait for every chunk
+        const hasNavigationState = window.location.search.length > 1 || window.location.hash.length > 1;
+        if (this.payloadLoader && hasNavigationState) {
+            this.payloadLoader.loadAll().then(() => this.handleInitialNavigation());
+            return;
+        }
+
+        this.handleInitialNavigation();
+        if (this.payloadLoader) {
+            this.payloadLoader.loadInBackground();
+        }
+    }
+
     handleEpisodeListClick(event) {
         const tagButton = event.target.closest('.series-tag[data-tag]');
         if (tagButton) {
@@ -1590,7 +1630,19 @@ class LatestEpisodesApp {
         }
     }
     
+    hasActiveEpisodeFilters() {
+        return Boolean(this.searchTerm)
+            || this.watchStatusFilter !== 'all'
+            || this.malStatusFilter !== 'all'
+            || this.showRatingFilter !== 'all'
+            || this.seriesFilter !== 'all';
+    }
+
     filterAndDisplayEpisodes() {
+        if (this.payloadLoader && !this.payloadLoader.isComplete && this.hasActiveEpisodeFilters()) {
+            this.payloadLoader.loadAll();
+        }
+
         this.filteredEpisodes = this.data.episodes.filter(episode => {
             if (!episode._filterSearchIndex) {
                 this.cacheEpisodeFilterFields(episode);
@@ -16,6 +16,7 @@ from urllib.parse import urljoin, urlparse
 from urllib.request import Request, urlopen
 
 from netflix_title_parser import ParsedNetflixTitle, adapt_lookup_titles, parse_netflix_title
+import webapp_payload
 
 tqdm_progress: Any
 
@@ -67,6 +68,7 @@ try:
     AnimeDataProvider = importlib.import_module("anime_metadata").AnimeDataProvider
     IMDbDataProvider = importlib.import_module("imdb_metadata").IMDbDataProvider
     MetadataManagerClass = importlib.import_module("metadata_provider").MetadataManager
+    create_metadata_manager = importlib.import_module("metadata_service").create_metadata_manager
 
     METADATA_MANAGER: Any = None
 
@@ -75,9 +77,9 @@ try:
         if MetadataManagerClass is None:
             return None
         if METADATA_MANAGER is None:
-            anime_provider = AnimeDataProvider()
-            imdb_provider = IMDbDataProvider()
-            METADATA_MANAGER = MetadataManagerClass([anime_provider, imdb_provider])
+            METADATA_MANAGER = create_metadata_manager(
+                lambda: MetadataManagerClass([AnimeDataProvider(), IMDbDataProvider()])
+            )
         return METADATA_MANAGER
 
 except ImportError:
@@ -1406,6 +1408,16 @@ def build_argument_parser() -> argparse.ArgumentParser:
         metavar="FILE",
         help="Export a standalone local HTML webapp report.",
     )
+    parser.add_argument(
+        "--webapp-chunk-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "With --webapp-export, embed only the first screen of titles and load the rest from "
+            "compressed chunks of about N rows beside the HTML (default: 0, embed everything)."
+        ),
+    )
     parser.add_argument(
         "--columns",
         default=",".join(DEFAULT_TABLE_COLUMNS),
@@ -2127,13 +2139,14 @@ def build_webapp_payload(
 def render_webapp_html(payload: Dict[str, Any]) -> str:
     template = load_template_asset("netflix_watch_status_webapp_template.html")
     css = load_template_asset("netflix_watch_status_webapp_template.css")
+    loader = webapp_payload.load_loader_script()
     script = load_template_asset("netflix_watch_status_webapp_template.js")
     serialized = json.dumps(payload, ensure_ascii=False).replace("</", "<\\/")
     return (
         template
         .replace("/*NETFLIX_WATCH_STATUS_CSS*/", css)
         .replace("/*NETFLIX_WATCH_STATUS_JSON*/", serialized)
-        .replace("/*NETFLIX_WATCH_STATUS_JS*/", script)
+        .replace("/*NETFLIX_WATCH_STATUS_JS*/", f"{loader}\n\n{script}")
     )
 
 
@@ -2143,10 +2156,19 @@ def export_webapp_report(
     entries: List[NetflixHistoryEntry],
     selected_columns: List[str],
     output_path: str,
+    chunk_size: int = 0,
 ) -> Path:
     target_path = Path(output_path).expanduser().resolve()
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    html = render_webapp_html(build_webapp_payload(csv_path, results, entries, selected_columns))
+    # Season and episode rows stay in the chunk of their top-level title
+    payload = webapp_payload.split_payload(
+        build_webapp_payload(csv_path, results, entries, selected_columns),
+        "rows",
+        target_path,
+        chunk_size,
+        is_continuation=lambda row: row["level"] > 0,
+    )
+    html = render_webapp_html(payload)
     target_path.write_text(html, encoding="utf-8")
     return target_path
 
@@ -2819,7 +2841,9 @@ def main() -> None:
         return
 
     if args.webapp_export:
-        output_path = export_webapp_report(args.csv_path, results, entries, selected_columns, args.webapp_export)
+        output_path = export_webapp_report(
+            args.csv_path, results, entries, selected_columns, args.webapp_export, args.webapp_chunk_size
+        )
         safe_write_line(f"Webapp exported to: {output_path}")
         safe_write_line(f"IMDb-unmapped override rows: {unmapped_stats['total']}")
         safe_write_line(f"IMDb-unmapped rows with existing override: {unmapped_stats['with_override']}")
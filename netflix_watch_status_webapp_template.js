@@ -2,6 +2,8 @@
     const FILTER_INPUT_DEBOUNCE_MS = 250;
     const VIRTUAL_ROW_OVERSCAN = 10;
     const VIRTUAL_ROW_ESTIMATE = 44;
+    // Start loading the next data chunk when the table is this many rows from its end
+    const PAYLOAD_PREFETCH_ROWS = 40;
 
     const report = JSON.parse(document.getElementById("netflixWatchStatusReport").textContent);
     const rows = Array.isArray(report.rows) ? report.rows : [];
@@ -10,16 +12,21 @@
     const optionalColumns = columns.filter((column) => column.key !== nameColumn.key);
     const defaultColumnOrder = optionalColumns.map((column) => column.key);
     const defaultVisibleColumns = new Set(["year", "runtime_minutes", "average_rating"]);
-    const rowMap = new Map(rows.map((row) => [row.id, row]));
+    const rowMap = new Map();
     const childrenMap = new Map();
 
-    rows.forEach((row) => {
-        const key = row.parent_id || "ROOT";
-        if (!childrenMap.has(key)) {
-            childrenMap.set(key, []);
-        }
-        childrenMap.get(key).push(row);
-    });
+    function indexRows(newRows) {
+        newRows.forEach((row) => {
+            rowMap.set(row.id, row);
+            const key = row.parent_id || "ROOT";
+            if (!childrenMap.has(key)) {
+                childrenMap.set(key, []);
+            }
+            childrenMap.get(key).push(row);
+        });
+    }
+
+    indexRows(rows);
 
     const preferredDefaultColumnOrder = ["year", "runtime_minutes", "average_rating", "genres"];
     const SMART_FILTER_FIELD_INFO = [
@@ -103,8 +110,12 @@
         ],
     };
 
+    function genreValues() {
+        return uniqueSortedValues(rows.flatMap((row) => String(row.genres || "").split(",").map((genre) => genre.trim()).filter(Boolean)), 100);
+    }
+
     const smartFilterDataValues = {
-        genres: uniqueSortedValues(rows.flatMap((row) => String(row.genres || "").split(",").map((genre) => genre.trim()).filter(Boolean)), 100),
+        genres: genreValues(),
     };
 
     const state = {
@@ -168,6 +179,17 @@
         rowContextMenu: document.getElementById("rowContextMenu"),
     };
 
+    const payloadLoader = report.payload_chunks && typeof WebappPayloadLoader !== "undefined"
+        ? new WebappPayloadLoader(report.payload_chunks, { onChunk: appendRowChunk })
+        : null;
+
+    function appendRowChunk(chunkRows) {
+        chunkRows.forEach((row) => rows.push(row));
+        indexRows(chunkRows);
+        smartFilterDataValues.genres = genreValues();
+        render();
+    }
+
     function escapeHtml(value) {
         return String(value ?? "")
             .replace(/&/g, "&amp;")
@@ -1385,6 +1407,9 @@
         }
         closeRowContextMenu();
         state.query = nextNormalizedQuery;
+        if (payloadLoader && state.query) {
+            payloadLoader.loadAll();
+        }
         try {
             const compiled = compileSmartFilter(state.query);
             const compiledHighlight = compileSmartFilter(state.query, { titleScope: "local" });
@@ -2264,6 +2289,9 @@
         if (!forceMeasurement && rangeKey === state.lastVirtualRangeKey) {
             return;
         }
+        if (payloadLoader && range.end >= state.virtualRows.length - PAYLOAD_PREFETCH_ROWS) {
+            payloadLoader.loadNext();
+        }
 
         state.lastVirtualRangeKey = rangeKey;
 
@@ -2554,4 +2582,7 @@
     renderColumnOptions();
     syncFilterInputState();
     render();
+    if (payloadLoader) {
+        payloadLoader.loadInBackground();
+    }
 }());
@@ -3,6 +3,7 @@ import json
 import os
 import sqlite3
 import subprocess
+import sys
 import time
 import uuid
 from contextlib import contextmanager
@@ -79,6 +80,9 @@ class PlexFilenameParser:
 
 
 class PlexDatabase:
+    _sql_profiler = None
+    _sql_profiler_loaded = False
+
     def __init__(self, db_path: Path, readonly: bool) -> None:
         self.db_path = db_path
         self.readonly = readonly
@@ -99,12 +103,29 @@ class PlexDatabase:
             return 1
         return 0
 
+    @classmethod
+    def _get_sql_profiler(cls):
+        if not cls._sql_profiler_loaded:
+            cls._sql_profiler_loaded = True
+            video_optimizer_dir = str(Path(__file__).resolve().parent.parent / "video-optimizer-v2")
+            if video_optimizer_dir not in sys.path:
+                sys.path.append(video_optimizer_dir)
+            try:
+                import sql_profiler
+            except Exception:
+                cls._sql_profiler = None
+            else:
+                cls._sql_profiler = sql_profiler
+        return cls._sql_profiler
+
     def _connect(self) -> sqlite3.Connection:
+        sql_profiler = self._get_sql_profiler()
+        connect = sql_profiler.connect if sql_profiler else sqlite3.connect
         if self.readonly:
             uri = f"file:{self.db_path.as_posix()}?mode=ro"
-            connection = sqlite3.connect(uri, uri=True)
+            connection = connect(uri, uri=True)
         else:
-            connection = sqlite3.connect(str(self.db_path))
+            connection = connect(str(self.db_path))
         connection.row_factory = sqlite3.Row
         connection.create_collation("icu_root", self.sqlite_icu_root_collation)
         return connection
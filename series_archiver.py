@@ -14,6 +14,7 @@ from difflib import SequenceMatcher
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple, Protocol
+import json_stream
 from presentation import Presenter, color_text, get_emoji, Colors
 
 try:
@@ -392,7 +393,7 @@ class SeriesArchiver:
         """Load series data from JSON file."""
         try:
             with open(json_file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+                self.data = json_stream.load(f)
             if not isinstance(self.data, dict):
                 return False
             self.groups = self.data.get('groups', {})
@@ -1094,16 +1094,14 @@ def _get_metadata_manager():
             sys.path.insert(0, str(video_optimizer_path))
         
         from metadata_provider import MetadataManager
+        from metadata_service import create_metadata_manager
         from anime_metadata import AnimeDataProvider
         from imdb_metadata import IMDbDataProvider
         
-        # Create providers
-        providers = [
-            AnimeDataProvider(),
-            IMDbDataProvider()
-        ]
-        
-        return MetadataManager(providers)
+        # Use a running metadata service when available, else in-process providers
+        return create_metadata_manager(
+            lambda: MetadataManager([AnimeDataProvider(), IMDbDataProvider()])
+        )
     except ImportError as e:
         print(f"Warning: Could not load metadata providers: {e}")
         return None
@@ -1,7 +1,9 @@
 import argparse
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from enum import Enum
@@ -9,6 +11,8 @@ from dataclasses import dataclass, field, asdict
 
 from video_thumbnail_generator import VideoThumbnailGenerator
 from file_grouper import FileGrouper, CustomJSONEncoder
+import json_stream
+import webapp_payload
 from presentation import Presenter, Colors, get_emoji
 try:
     sys.path.append(os.path.join(os.path.dirname(__file__), 'video-optimizer-v2'))
@@ -20,6 +24,33 @@ except ImportError:
 
 # Reusing Colors and emoji helpers from presentation.py
 
+# File record fields a group's analysis depends on, besides its title metadata
+FINGERPRINT_FILE_FIELDS = ('filepath', 'file_size', 'modified_time', 'episode_watched', 'plex_watch_status')
+
+
+def _group_fingerprint(group_files: List[Dict], title_metadata: Dict[str, Any]) -> str:
+    """Digest of everything a group's analysis is computed from.
+
+    Covers the group's files (paths, sizes, modification times and watch
+    state, in order) and its title metadata entry, which includes the
+    MyAnimeList watch status.
+    """
+    metadata_id = group_files[0].get('metadata_id') if group_files else None
+    payload = {
+        'files': [[file_info.get(key) for key in FINGERPRINT_FILE_FIELDS] for file_info in group_files],
+        'title': title_metadata.get(str(metadata_id)) if metadata_id is not None else None,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), cls=CustomJSONEncoder)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _webapp_sort_title(group: Dict[str, Any]) -> str:
+    """Sort key matching the webapp's series list order (title plus SNN season)."""
+    season = group.get('season')
+    suffix = f" S{str(season).rjust(2, '0')}" if season else ''
+    return f"{group.get('title')}{suffix}".casefold()
+
+
 # Enums for status values
 class SeriesStatus(str, Enum):
     """Enum for series completeness status values."""
@@ -357,6 +388,9 @@ Refresh Operations:
                            help='Export results to JSON file')
         parser.add_argument('--webapp-export', nargs='?', const=True, metavar='FILE',
                            help='Export results as a standalone HTML webapp. If filename omitted, derives name from --export argument (requires --export).')
+        parser.add_argument('--webapp-chunk-size', type=int, default=0, metavar='N',
+                           help='Embed only the first screen of series in the webapp and load the rest from '
+                                'compressed chunks of N series beside it (default: 0, embed everything)')
         parser.add_argument('--export-bundle', metavar='DIR',
                            help='Export complete bundle (webapp + metadata.json + thumbnails) to specified directory. '
                                 'This overrides --export, --webapp-export, and --generate-thumbnails. '
@@ -365,6 +399,12 @@ Refresh Operations:
         # Search arguments
         parser.add_argument('--recursive', '-r', action='store_true',
                            help='Recursively search subdirectories (default: False)')
+        parser.add_argument('--workers', type=int, default=1, metavar='N',
+                           help='Parse filenames in N processes, and look up metadata and analyze groups '
+                                'in N threads (default: 1, serial)')
+        parser.add_argument('--plex-snapshot', action='store_true',
+                           help='Answer Plex watch status from a snapshot of the Plex media parts, kept in '
+                                '~/.video_metadata_cache/plex_snapshot.pickle and rebuilt when the Plex database changes')
         
         # Output arguments
         parser.add_argument('--verbose', '-v', type=int, choices=[0, 1, 2, 3], default=1,
@@ -607,7 +647,7 @@ except ImportError:
     plex_provider_available = False
     def get_metadata_manager():
         return None
-    def get_plex_provider():
+    def get_plex_provider(use_snapshot=False):
         return None
 
 # MetadataManager class may not be available as a direct import
@@ -616,7 +656,8 @@ MetadataManager = None
 class SeriesCompletenessChecker:
     """Checks series collection completeness using FileGrouper and metadata providers."""
     
-    def __init__(self, metadata_manager=None, plex_provider=None, myanimelist_xml_path=None, metadata_only=False):
+    def __init__(self, metadata_manager=None, plex_provider=None, myanimelist_xml_path=None, metadata_only=False,
+                 workers: int = 1, webapp_chunk_size: int = 0):
         """Initialize the checker.
         
         Args:
@@ -624,6 +665,8 @@ class SeriesCompletenessChecker:
             plex_provider: Plex provider for watch status
             myanimelist_xml_path: Path to MyAnimeList XML file
             metadata_only: If True, skip FileGrouper initialization (for loading from JSON)
+            workers: Number of threads for metadata extraction and group analysis (1 = serial)
+            webapp_chunk_size: Series per lazily loaded webapp data chunk (0 = embed all series)
         """
         resolved_mal_path = (
             resolve_myanimelist_xml_path(myanimelist_xml_path)
@@ -635,8 +678,10 @@ class SeriesCompletenessChecker:
             print(f"Warning: No MyAnimeList XML found matching: {myanimelist_xml_path}")
 
         self.metadata_only = metadata_only
+        self.workers = max(1, int(workers or 1))
+        self.webapp_chunk_size = max(0, int(webapp_chunk_size or 0))
         if not metadata_only:
-            self.file_grouper = FileGrouper(metadata_manager, plex_provider, resolved_mal_path)
+            self.file_grouper = FileGrouper(metadata_manager, plex_provider, resolved_mal_path, workers=self.workers)
         else:
             self.file_grouper = None
         self.metadata_manager = metadata_manager
@@ -651,6 +696,8 @@ class SeriesCompletenessChecker:
         elif myanimelist_xml_path and MyAnimeListWatchStatusProvider is None:
             print("Warning: MyAnimeList functionality not available (video-optimizer-v2 not found)")
         self.completeness_results = {}
+        # Groups analyzed by the last analyze_series_collection call, as opposed to reused
+        self.reanalyzed_groups: List[str] = []
     
     def load_results(self, input_path: str) -> Dict[str, Any]:
         """Load analysis results from a previously saved JSON file.
@@ -662,15 +709,37 @@ class SeriesCompletenessChecker:
             Dictionary containing the loaded results
         """
         with open(input_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return json_stream.load(f)
     
-    def analyze_series_collection(self, files: List[Path], show_progress: bool = True) -> Dict[str, Any]:
-        """Analyze series collection for completeness."""
+    @staticmethod
+    def _as_grouper_export(previous_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Previous analysis results in the FileGrouper export layout, for incremental grouping."""
+        previous_groups = previous_results.get('groups', {})
+        return {
+            'groups': {group_key: analysis.get('files') or [] for group_key, analysis in previous_groups.items()},
+            'title_metadata': previous_results.get('title_metadata', {}),
+            'group_metadata': {
+                group_key: analysis['group_metadata']
+                for group_key, analysis in previous_groups.items()
+                if analysis.get('group_metadata')
+            },
+        }
+
+    def analyze_series_collection(self, files: List[Path], show_progress: bool = True,
+                                  previous_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze series collection for completeness.
+
+        With ``previous_results`` (an earlier export carrying group
+        fingerprints), unchanged files are not parsed or looked up again and
+        groups whose fingerprint is unchanged keep their previous analysis.
+        """
         if self.metadata_only or not self.file_grouper:
             raise RuntimeError("Cannot analyze files when initialized in metadata_only mode. Use load_results() instead.")
         
         # Group files by title and season with progress tracking
-        groups = self.file_grouper.group_files(files, ['title', 'season'], show_progress)
+        previous_export = self._as_grouper_export(previous_results) if previous_results else None
+        groups = self.file_grouper.group_files(files, ['title', 'season'], show_progress,
+                                               previous_export=previous_export)
 
         # Export title metadata for completeness analysis - include MyAnimeList watch status
         # Now using metadata IDs as keys, but we'll add season-specific entries after analysis
@@ -696,32 +765,42 @@ class SeriesCompletenessChecker:
                 'unknown_series': 0,
                 'total_episodes_found': 0,
                 'total_episodes_expected': 0
+            },
+            # Lets a later incremental run or bundle refresh skip unchanged groups
+            'group_fingerprints': {
+                group_key: _group_fingerprint(group_files, title_metadata_export)
+                for group_key, group_files in groups.items()
             }
         }
-        
-        # Analyze completeness with progress tracking
-        with tqdm(groups.items(), desc="Analyzing completeness", unit="series", disable=not show_progress) as pbar:
-            for group_key, group_files in pbar:
-                analysis = self._analyze_group_completeness(group_key, group_files)
-                results['groups'][group_key] = analysis.to_dict()
-                
-                # Update summary
-                results['completeness_summary']['total_series'] += 1
-                if analysis.status in [SeriesStatus.COMPLETE, SeriesStatus.COMPLETE_WITH_EXTRAS]:
-                    results['completeness_summary']['complete_series'] += 1
-                elif analysis.status in [SeriesStatus.INCOMPLETE, SeriesStatus.NO_EPISODE_NUMBERS]:
-                    results['completeness_summary']['incomplete_series'] += 1
-                else:
-                    results['completeness_summary']['unknown_series'] += 1
 
-                results['completeness_summary']['total_episodes_found'] += analysis.episodes_found
-                results['completeness_summary']['total_episodes_expected'] += analysis.episodes_expected
-                
-                # Update progress with current series name
-                display_title = analysis.title[:30]
-                if len(analysis.title) > 30:
-                    display_title += "..."
-                pbar.set_postfix(current=display_title)
+        previous_groups = previous_results.get('groups', {}) if previous_results else {}
+        previous_fingerprints = previous_results.get('group_fingerprints', {}) if previous_results else {}
+        changed_groups = {
+            group_key: group_files for group_key, group_files in groups.items()
+            if group_key not in previous_groups
+            or previous_fingerprints.get(group_key) != results['group_fingerprints'][group_key]
+        }
+        self.reanalyzed_groups = list(changed_groups)
+        if previous_results and show_progress:
+            print(f"Reusing {len(groups) - len(changed_groups)} of {len(groups)} unchanged series analyses")
+        
+        # Analyze completeness with progress tracking; results are merged in group order
+        analyses = dict(zip(changed_groups, self._analyze_groups(changed_groups, show_progress)))
+        for group_key in groups:
+            analysis = analyses[group_key].to_dict() if group_key in analyses else previous_groups[group_key]
+            results['groups'][group_key] = analysis
+            
+            # Update summary
+            results['completeness_summary']['total_series'] += 1
+            if analysis['status'] in [SeriesStatus.COMPLETE, SeriesStatus.COMPLETE_WITH_EXTRAS]:
+                results['completeness_summary']['complete_series'] += 1
+            elif analysis['status'] in [SeriesStatus.INCOMPLETE, SeriesStatus.NO_EPISODE_NUMBERS]:
+                results['completeness_summary']['incomplete_series'] += 1
+            else:
+                results['completeness_summary']['unknown_series'] += 1
+
+            results['completeness_summary']['total_episodes_found'] += analysis['episodes_found']
+            results['completeness_summary']['total_episodes_expected'] += analysis['episodes_expected']
         
         # NOTE: Season-specific metadata IDs are now correctly determined by FileGrouper
         # using ordinal season patterns ("2nd Season", etc.) during initial metadata extraction.
@@ -732,6 +811,47 @@ class SeriesCompletenessChecker:
         
         return results
     
+    def _analyze_groups(self, groups: Dict[str, List[Dict]], show_progress: bool = True) -> List[SeriesAnalysis]:
+        """Run _analyze_group_completeness for every group, in a thread pool when workers > 1.
+
+        Analyses are returned in group order whatever order they finish in.
+        The workers share the metadata manager, whose provider reads are
+        thread-safe, with its read connection pool sized to the worker count.
+        """
+        group_items = list(groups.items())
+        analyses: List[Optional[SeriesAnalysis]] = [None] * len(group_items)
+
+        def show_current(pbar, analysis: SeriesAnalysis) -> None:
+            # Update progress with current series name
+            display_title = analysis.title[:30]
+            if len(analysis.title) > 30:
+                display_title += "..."
+            pbar.set_postfix(current=display_title)
+
+        if self.workers <= 1 or len(group_items) <= 1:
+            with tqdm(group_items, desc="Analyzing completeness", unit="series", disable=not show_progress) as pbar:
+                for index, (group_key, group_files) in enumerate(pbar):
+                    analyses[index] = self._analyze_group_completeness(group_key, group_files)
+                    show_current(pbar, analyses[index])
+            return analyses
+
+        set_reader_count = getattr(self.metadata_manager, 'set_reader_count', None)
+        if callable(set_reader_count):
+            set_reader_count(self.workers)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                tqdm(total=len(group_items), desc="Analyzing completeness", unit="series", disable=not show_progress) as pbar:
+            futures = {
+                executor.submit(self._analyze_group_completeness, group_key, group_files): index
+                for index, (group_key, group_files) in enumerate(group_items)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                analyses[index] = future.result()
+                pbar.update(1)
+                show_current(pbar, analyses[index])
+        return analyses
+
     def _analyze_group_completeness(self, group_key: str, group_files: List[Dict]) -> SeriesAnalysis:
         """Analyze a single group for completeness.
         
@@ -1261,12 +1381,16 @@ class SeriesCompletenessChecker:
         return f"[{', '.join(ranges)}]"
     
     def export_results(self, results: Dict[str, Any], output_path: str) -> None:
-        """Export analysis results to JSON file."""
+        """Export analysis results to JSON file, writing groups one at a time."""
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+            json_stream.dump(results, f, cls=CustomJSONEncoder)
     
     def export_webapp(self, results: Dict[str, Any], output_path: str, use_relative_thumbnails: bool = False, thumbnail_relative_path: str = None) -> None:
-        """Export analysis results as a standalone HTML webapp."""
+        """Export analysis results as a standalone HTML webapp.
+
+        With ``webapp_chunk_size`` set, only the first screen of series is
+        embedded and the rest are loaded from chunks beside the HTML.
+        """
         import os
         import socket
         from pathlib import Path
@@ -1299,6 +1423,7 @@ class SeriesCompletenessChecker:
                 css_content = f.read()
             with open(js_template_path, 'r', encoding='utf-8') as f:
                 js_content = f.read()
+            payload_loader_content = webapp_payload.load_loader_script()
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Template file not found: {e}. Make sure all template files are in the same directory as this script.")
 
@@ -1314,12 +1439,21 @@ class SeriesCompletenessChecker:
         if not results.get('host_subnet_ip'):
             results['host_subnet_ip'] = _detect_host_subnet_ip()
 
+        # Inline the series the list shows first (it sorts by display title), chunk the rest
+        payload = results
+        if self.webapp_chunk_size:
+            groups = sorted(results.get('groups', {}).items(), key=lambda item: _webapp_sort_title(item[1]))
+            payload = {**results, 'groups': dict(groups)}
+        payload = webapp_payload.split_payload(
+            payload, 'groups', output_path, self.webapp_chunk_size, cls=CustomJSONEncoder
+        )
+
         # Prepare data for embedding (minify JSON)
-        json_data = json.dumps(results, separators=(',', ':'), cls=CustomJSONEncoder)
+        json_data = json.dumps(payload, separators=(',', ':'), cls=CustomJSONEncoder)
         
         # Replace placeholders in HTML template
         html_content = html_template.replace('[[embedded_css]]', css_content)
-        html_content = html_content.replace('[[embedded_js]]', js_content)
+        html_content = html_content.replace('[[embedded_js]]', f"{payload_loader_content}\n\n{js_content}")
         html_content = html_content.replace('[[embedded_json]]', json_data)
         
         # Write the final HTML file
@@ -1545,10 +1679,10 @@ class SeriesCompletenessChecker:
                 if metadata_id in title_metadata:
                     metadata = title_metadata[metadata_id]['metadata']
                     
-                    for field in show_metadata_fields:
-                        value = metadata.get(field)
+                    for field_name in show_metadata_fields:
+                        value = metadata.get(field_name)
                         formatted_value = self._format_metadata_value(value, max_length=12)
-                        metadata_info.append(f"{Colors.BRIGHT_BLACK}{field.capitalize()}: {formatted_value}{Colors.RESET}")
+                        metadata_info.append(f"{Colors.BRIGHT_BLACK}{field_name.capitalize()}: {formatted_value}{Colors.RESET}")
         
         # Build the complete line
         episodes_expected_str = str(episodes_expected) if episodes_expected else '?'
@@ -1755,10 +1889,30 @@ def _refresh_myanimelist_metadata(results: Dict[str, Any], myanimelist_xml_path:
                     'sources': []
                 }
         
+        # Groups without title-level MAL status are matched against the whole list,
+        # so they are only skipped while the list itself is unchanged
+        mal_digest = hashlib.sha256(json.dumps(
+            {str(mal_id): serialize_mal_status(mal_entry) for mal_id, mal_entry in mal_provider.anime_status_map.items()},
+            sort_keys=True, separators=(',', ':'), cls=CustomJSONEncoder
+        ).encode('utf-8')).hexdigest()
+        mal_list_unchanged = results.get('myanimelist_digest') == mal_digest
+        fingerprints = results.setdefault('group_fingerprints', {})
+
         # Update each series group with fresh MAL metadata
         groups_updated = 0
         groups_unchanged = 0
+        groups_skipped = 0
         for group_key, analysis in results['groups'].items():
+            group_files = analysis.get('files') or []
+            group_metadata_id = group_files[0].get('metadata_id') if group_files else None
+            has_title_mal_status = bool(
+                title_metadata.get(str(group_metadata_id), {}).get('myanimelist_watch_status')
+                if group_metadata_id is not None else None
+            )
+            if (fingerprints.get(group_key) == _group_fingerprint(group_files, title_metadata)
+                    and (has_title_mal_status or mal_list_unchanged)):
+                groups_skipped += 1
+                continue
             try:
                 title = analysis.get('title', '')
                 season = analysis.get('season')
@@ -1863,16 +2017,18 @@ def _refresh_myanimelist_metadata(results: Dict[str, Any], myanimelist_xml_path:
                             groups_updated += 1
                         else:
                             groups_unchanged += 1
+                fingerprints[group_key] = _group_fingerprint(group_files, title_metadata)
             except Exception as e:
                 if verbosity >= 2:
                     print(f"Warning: Error processing group '{group_key}': {e}")
                     import traceback
                     traceback.print_exc()
+        results['myanimelist_digest'] = mal_digest
         
         if verbosity >= 1:
             print(f"✓ MyAnimeList metadata refresh complete:")
             print(f"  Title metadata: {title_metadata_found} found, {title_metadata_updated} updated, {title_metadata_unchanged} unchanged, {title_metadata_cleared} cleared")
-            print(f"  Series groups: {groups_updated} updated, {groups_unchanged} unchanged")
+            print(f"  Series groups: {groups_updated} updated, {groups_unchanged} unchanged, {groups_skipped} skipped (fingerprint unchanged)")
             
             if verbosity >= 2 and update_details:
                 print(f"\nDetailed changes:")
@@ -1966,6 +2122,23 @@ def _handle_refresh_webapp_mode(checker: 'SeriesCompletenessChecker', json_path:
     if verbosity >= 1:
         print(f"✓ Webapp regenerated: {output_file}")
 
+def _load_previous_bundle_results(bundle_dir: str, verbosity: int) -> Optional[Dict[str, Any]]:
+    """Results from an existing bundle's metadata.json if it carries group fingerprints, else None."""
+    metadata_path = Path(bundle_dir) / 'metadata.json'
+    if not metadata_path.exists() or not (Path(bundle_dir) / 'thumbnails').is_dir():
+        return None
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            previous_results = json_stream.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read existing bundle metadata {metadata_path} ({e}); rebuilding the bundle")
+        return None
+    if not isinstance(previous_results, dict) or 'group_fingerprints' not in previous_results:
+        return None
+    if verbosity >= 1:
+        print(f"Updating existing bundle from {metadata_path}")
+    return previous_results
+
 def _handle_thumbnail_generation(files: List[Path], args, verbosity: int, checker: SeriesCompletenessChecker = None) -> Optional[str]:
     """Handle thumbnail generation and return the thumbnail directory path.
     
@@ -2058,7 +2231,7 @@ def main():
             metadata_manager = None
         
         try:
-            plex_provider = get_plex_provider()
+            plex_provider = get_plex_provider(use_snapshot=args.plex_snapshot)
         except Exception as e:
             if verbosity >= 2:
                 print(f"Warning: Could not initialize Plex provider: {e}")
@@ -2081,7 +2254,9 @@ def main():
         metadata_manager, 
         plex_provider,
         resolved_mal_path,
-        metadata_only=bool(refresh_mode)
+        metadata_only=bool(refresh_mode),
+        workers=args.workers,
+        webapp_chunk_size=args.webapp_chunk_size
     )
 
     # Handle refresh modes
@@ -2108,15 +2283,28 @@ def main():
             print("No series files found matching criteria.")
         return
 
-    # Handle thumbnail generation
-    thumbnail_dir_expanded = _handle_thumbnail_generation(files, args, verbosity)
+    # Re-exporting a bundle only reanalyzes groups that changed since its metadata.json
+    previous_results = _load_previous_bundle_results(args.export_bundle, verbosity) if args.export_bundle else None
+
+    # Handle thumbnail generation (after analysis for incremental bundles, to cover changed groups only)
+    if not previous_results:
+        thumbnail_dir_expanded = _handle_thumbnail_generation(files, args, verbosity)
     
     if verbosity >= 1:
         print(f"Found {len(files)} files")
         print("Analyzing series collection for completeness...")
     
     # Analyze collection
-    results = checker.analyze_series_collection(files)
+    results = checker.analyze_series_collection(files, previous_results=previous_results)
+
+    if previous_results:
+        changed_files = [
+            Path(file_info['filepath'])
+            for group_key in checker.reanalyzed_groups
+            for file_info in results['groups'][group_key].get('files', [])
+            if file_info.get('filepath')
+        ]
+        thumbnail_dir_expanded = _handle_thumbnail_generation(changed_files, args, verbosity)
     
     # Store thumbnail directory in results for later use
     if thumbnail_dir_expanded:
@@ -1,5 +1,8 @@
 // Series Completeness Webapp JavaScript
 
+// Start loading the next data chunk when the list is scrolled this close to its end
+const PAYLOAD_PREFETCH_PX = 1200;
+
 class SeriesCompletenessApp {
     constructor() {
         this.data = SERIES_DATA;
@@ -28,6 +31,7 @@ class SeriesCompletenessApp {
         this.popupTimeout = null;
         this.hideTimeout = null;
         this.currentPopupIndex = -1;
+        this.payloadLoader = null;
         this.normalizeSeriesData();
         this.init();
     }
@@ -279,11 +283,38 @@ class SeriesCompletenessApp {
     }
 
     init() {
+        this.initializePayloadLoader();
         this.setupEventListeners();
         this.updateHeaderStats();
         this.syncSearchContainerState('');
         this.filterAndDisplaySeries();
         this.showListOnMobile();
+        if (this.payloadLoader) {
+            this.payloadLoader.loadInBackground();
+        }
+    }
+
+    initializePayloadLoader() {
+        if (!this.data.payload_chunks || typeof WebappPayloadLoader === 'undefined') {
+            return;
+        }
+
+        this.payloadLoader = new WebappPayloadLoader(this.data.payload_chunks, {
+            onChunk: (groups) => this.appendSeriesChunk(groups)
+        });
+
+        const seriesList = document.getElementById('series-list');
+        seriesList.addEventListener('scroll', () => {
+            if (seriesList.scrollTop + seriesList.clientHeight >= seriesList.scrollHeight - PAYLOAD_PREFETCH_PX) {
+                this.payloadLoader.loadNext();
+            }
+        }, { passive: true });
+    }
+
+    appendSeriesChunk(groups) {
+        Object.assign(this.data.groups, groups);
+        this.normalizeSeriesData();
+        this.filterAndDisplaySeries();
     }
     
     setupEventListeners() {
@@ -710,7 +741,18 @@ class SeriesCompletenessApp {
         return terms.every((term) => series._filterSearchIndex.includes(term));
     }
     
+    hasActiveSeriesFilters() {
+        return Boolean(this.combinedQuery)
+            || this.statusFilter !== 'all'
+            || this.watchStatusFilter !== 'all'
+            || this.malStatusFilter !== 'all';
+    }
+
     async filterAndDisplaySeries() {
+        if (this.payloadLoader && !this.payloadLoader.isComplete && this.hasActiveSeriesFilters()) {
+            this.payloadLoader.loadAll();
+        }
+
         const groups = this.data.groups;
         this.filteredSeries = [];
         
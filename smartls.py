@@ -26,6 +26,7 @@ from utils import (
     icon_for_entry,
     should_use_color,
 )
+import webapp_payload
 
 try:
     import grp
@@ -646,6 +647,13 @@ class SmartLSArgumentParser:
             ),
         )
         parser.add_argument("--export-html", metavar="FILE", type=Path, help="Write a self-contained HTML report")
+        parser.add_argument(
+            "--webapp-chunk-size",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Embed only the first screen of entries in the HTML report and load the rest from compressed chunks of N entries beside it",
+        )
         parser.add_argument("--skip-errors", action="store_true", default=True, help="Continue past filesystem errors")
         parser.add_argument("--show-errors", action="store_true", help="Print collected scan errors to stderr")
         return parser
@@ -656,6 +664,8 @@ class SmartLSArgumentParser:
             self.parser.error("--depth must be >= 0")
         if args.limit is not None and args.limit <= 0:
             self.parser.error("--limit must be > 0")
+        if args.webapp_chunk_size < 0:
+            self.parser.error("--webapp-chunk-size must be >= 0")
         if args.group_by and not args.flat:
             self.parser.error("--group-by requires --flat")
         if args.columns and (args.json or args.csv):
@@ -900,20 +910,28 @@ def build_webapp_payload(scan_result: ScanResult, matched_entries: Sequence[Entr
 def render_webapp_html(payload: dict[str, object]) -> str:
     template = load_template_asset("smartls_webapp_template.html")
     css = load_template_asset("smartls_webapp_template.css")
+    loader = webapp_payload.load_loader_script()
     script = load_template_asset("smartls_webapp_template.js")
     serialized = json.dumps(payload, ensure_ascii=False).replace("</", "<\\/")
     return (
         template
         .replace("/*SMARTLS_CSS*/", css)
         .replace("/*SMARTLS_JSON*/", serialized)
-        .replace("/*SMARTLS_JS*/", script)
+        .replace("/*SMARTLS_JS*/", f"{loader}\n\n{script}")
     )
 
 
 def export_webapp_report(scan_result: ScanResult, matched_entries: Sequence[Entry], args: argparse.Namespace) -> Path:
     output_path = args.export_html.expanduser().resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    html = render_webapp_html(build_webapp_payload(scan_result, matched_entries, args))
+    # Directories stay inline because they shape the tree; matched entries can be chunked
+    payload = webapp_payload.split_payload(
+        build_webapp_payload(scan_result, matched_entries, args),
+        "entries",
+        output_path,
+        getattr(args, "webapp_chunk_size", 0),
+    )
+    html = render_webapp_html(payload)
     output_path.write_text(html, encoding="utf-8")
     return output_path
 
@@ -3,6 +3,8 @@
     const FILTER_INPUT_DEBOUNCE_MS = 800;
     const VIRTUAL_ROW_OVERSCAN = 10;
     const VIRTUAL_ROW_ESTIMATE = 44;
+    // Start loading the next data chunk when the tree is this many rows from its end
+    const PAYLOAD_PREFETCH_ROWS = 40;
     const nodeMap = new Map();
     const nameColumn = { key: "name_path", label: "Name", className: "col-name" };
     const optionalColumns = [
@@ -70,6 +72,10 @@
         folderCount: document.getElementById("folderCount"),
     };
 
+    const payloadLoader = report.payload_chunks && typeof WebappPayloadLoader !== "undefined"
+        ? new WebappPayloadLoader(report.payload_chunks, { onChunk: appendEntryChunk })
+        : null;
+
     function escapeHtml(value) {
         return String(value ?? "")
             .replace(/&/g, "&amp;")
@@ -731,6 +737,9 @@
 
     function applySmartFilterQuery(nextQuery) {
         state.query = nextQuery;
+        if (payloadLoader && state.query.trim()) {
+            payloadLoader.loadAll();
+        }
         try {
             const compiled = compileSmartFilter(state.query);
             state.compiledFilter = compiled.predicate;
@@ -742,7 +751,7 @@
         renderTable();
     }
 
-    function buildNodeTree() {
+    function buildNodeTree(keepExpanded) {
         nodeMap.clear();
 
         report.directories.forEach((directory) => {
@@ -785,7 +794,15 @@
             state.selectedKey = firstRoot ? firstRoot.path : report.entries[0]?.name_path || null;
         }
 
-        state.expanded = defaultExpandedPaths();
+        if (!keepExpanded) {
+            state.expanded = defaultExpandedPaths();
+        }
+    }
+
+    function appendEntryChunk(entries) {
+        report.entries = report.entries.concat(entries);
+        buildNodeTree(true);
+        renderTable();
     }
 
     function populateStaticSections() {
@@ -1184,6 +1201,9 @@
         if (!forceMeasurement && rangeKey === state.lastVirtualRangeKey) {
             return;
         }
+        if (payloadLoader && range.end >= state.virtualRows.length - PAYLOAD_PREFETCH_ROWS) {
+            payloadLoader.loadNext();
+        }
 
         state.lastVirtualRangeKey = rangeKey;
 
@@ -1525,4 +1545,7 @@
     renderColumnOptions();
     wireControls();
     renderTable();
+    if (payloadLoader) {
+        payloadLoader.loadInBackground();
+    }
 })();
\ No newline at end of file
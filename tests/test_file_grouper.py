@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+
+import pytest
+
+import file_grouper
+from file_grouper import CustomJSONEncoder, FileGrouper
+
+FIXTURE_FILES = [
+    "Show A/Season 1/Show.A.S01E01.1080p.mkv",
+    "Show A/Season 1/Show.A.S01E02.1080p.mkv",
+    "Show A/Season 1/Show.A.S01E03.1080p.mkv",
+    "Show A/Season 2/Show.A.S02E01.mkv",
+    "Show A/Season 2/Show.A.S02E02.mkv",
+    "Show B/Show.B.S01E01.mp4",
+    "Show B/Show.B.S01E02.mp4",
+    "Show B/Show.B.S01E02.sample.mp4",
+    "Movies/The.Movie.2010.1080p.mkv",
+    "Movies/Another.Film.1999.mkv",
+    "Movies/notes.txt",
+    "Skip/Show.C.S01E01.mkv",
+    "Top.Level.Show.S03E07.mkv",
+]
+INCLUDE = ["*.mkv", "*.mp4"]
+EXCLUDE = ["*sample*"]
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "library"
+    for index, relative in enumerate(FIXTURE_FILES):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * (index + 1))
+    return root
+
+
+def _discover(grouper, library, recursive=True):
+    return grouper.discover_files(
+        [str(library)], [str(library / "Skip")], INCLUDE, EXCLUDE, recursive=recursive, show_progress=False
+    )
+
+
+def _exported(value):
+    """JSON form of grouping results, as export_to_json writes them."""
+    return json.loads(json.dumps(value, cls=CustomJSONEncoder))
+
+
+class FakeProvider:
+    def get_episode_info(self, parent_id, season, episode):
+        return None
+
+
+class FakeMetadataManager:
+    """Resolves every title; lookups take longer for some titles so worker threads finish out of order."""
+
+    def __init__(self):
+        self.providers = [FakeProvider()]
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    def find_title(self, title, year=None, preferred_type=None):
+        with self._lock:
+            self.lookups += 1
+        time.sleep((len(title) % 3) * 0.003)
+        info = file_grouper.TitleInfo(id=f"id-{title.casefold()}", title=title, type="tv", year=year)
+        return info, self.providers[0]
+
+    def find_titles(self, queries):
+        return [self.find_title(*query) for query in queries]
+
+    def get_episode_info(self, provider, parent_id, season, episode):
+        return None
+
+
+def _group(library, workers, metadata_manager=None):
+    grouper = FileGrouper(metadata_manager=metadata_manager, workers=workers)
+    groups = grouper.group_files(_discover(grouper, library), show_progress=False)
+    return grouper, groups
+
+
+def test_parallel_grouping_matches_serial(library):
+    serial, serial_groups = _group(library, workers=1)
+    parallel, parallel_groups = _group(library, workers=4)
+
+    assert _exported(parallel_groups) == _exported(serial_groups)
+    assert list(parallel_groups) == list(serial_groups)
+    assert _exported(parallel.group_metadata) == _exported(serial.group_metadata)
+
+
+@pytest.mark.skipif(file_grouper.MetadataManager is None, reason="video-optimizer-v2 metadata modules unavailable")
+def test_parallel_metadata_extraction_matches_serial(library):
+    serial, serial_groups = _group(library, workers=1, metadata_manager=FakeMetadataManager())
+    parallel, parallel_groups = _group(library, workers=4, metadata_manager=FakeMetadataManager())
+
+    assert _exported(parallel_groups) == _exported(serial_groups)
+    assert _exported(parallel.group_metadata) == _exported(serial.group_metadata)
+    # title_metadata keeps the order a serial run first stored each title in
+    assert list(parallel.title_metadata) == list(serial.title_metadata)
+    assert parallel.title_metadata == serial.title_metadata
+    assert all(record.get("metadata_id") for records in serial_groups.values() for record in records)
+
+
+@pytest.mark.skipif(file_grouper.MetadataManager is None, reason="video-optimizer-v2 metadata modules unavailable")
+@pytest.mark.parametrize("workers", [1, 4])
+def test_incremental_grouping_matches_full_run(library, tmp_path, workers):
+    first, _groups = _group(library, workers=1, metadata_manager=FakeMetadataManager())
+    export_path = tmp_path / "groups.json"
+    first.export_to_json(str(export_path))
+
+    with open(library / "Show A/Season 1/Show.A.S01E02.1080p.mkv", "ab") as changed:
+        changed.write(b"more")
+    (library / "Show B/Show.B.S01E03.mp4").write_bytes(b"new")
+    (library / "Movies/Another.Film.1999.mkv").unlink()
+
+    incremental_manager = FakeMetadataManager()
+    incremental = FileGrouper(metadata_manager=incremental_manager, workers=workers)
+    incremental_groups = incremental.group_files(
+        _discover(incremental, library), show_progress=False, previous_export=FileGrouper.load_export(str(export_path))
+    )
+    full_manager = FakeMetadataManager()
+    full, full_groups = _group(library, workers=1, metadata_manager=full_manager)
+
+    assert _exported(incremental_groups) == _exported(full_groups)
+    assert list(incremental_groups) == list(full_groups)
+    assert _exported(incremental.group_metadata) == _exported(full.group_metadata)
+    assert _exported(dict(incremental._export_title_metadata())) == _exported(dict(full._export_title_metadata()))
+    # Only the changed and the new file were looked up again
+    assert 0 < incremental_manager.lookups < full_manager.lookups
+
+
+def test_incremental_grouping_without_changes_reuses_every_file(library, tmp_path, capsys):
+    first, first_groups = _group(library, workers=1)
+    export_path = tmp_path / "groups.json"
+    first.export_to_json(str(export_path))
+
+    again = FileGrouper()
+    groups = again.group_files(_discover(again, library), previous_export=FileGrouper.load_export(str(export_path)))
+    assert "Reusing 10 of 10 files" in capsys.readouterr().out
+    assert _exported(groups) == _exported(first_groups)
+    assert _exported(again.group_metadata) == _exported(first.group_metadata)
+
+
+def _rglob_reference(grouper, library):
+    """Files the rglob-based discovery found before iter_files replaced it."""
+    excluded = (library / "Skip").resolve()
+    return [
+        path for path in library.rglob("*")
+        if path.is_file()
+        and not grouper._is_path_excluded(path, excluded)
+        and any(grouper._matches_pattern(path.name, pattern) for pattern in INCLUDE)
+        and not any(grouper._matches_pattern(path.name, pattern) for pattern in EXCLUDE)
+    ]
+
+
+def _by_filepath(groups):
+    return {key: sorted(records, key=lambda record: record["filepath"]) for key, records in _exported(groups).items()}
+
+
+def test_iter_files_finds_the_same_files_as_rglob(library):
+    grouper = FileGrouper()
+    found = list(grouper.iter_files([str(library)], [str(library / "Skip")], INCLUDE, EXCLUDE, recursive=True))
+    assert sorted(found) == sorted(_rglob_reference(grouper, library))
+    assert len(found) == 10
+
+
+def test_iter_files_without_recursion_and_single_file(library):
+    grouper = FileGrouper()
+    top_level = library / "Top.Level.Show.S03E07.mkv"
+    assert list(grouper.iter_files([str(library)], include_patterns=INCLUDE)) == [top_level]
+    assert list(grouper.iter_files([str(top_level)], include_patterns=["*.mp4"])) == []
+    assert list(grouper.iter_files([str(library / "missing")])) == []
+
+
+def test_grouping_from_iter_files_matches_rglob_discovery(library):
+    reference = FileGrouper()
+    reference_groups = reference.group_files(_rglob_reference(reference, library), show_progress=False)
+
+    listed = FileGrouper()
+    list_groups = listed.group_files(_discover(listed, library), show_progress=False)
+
+    streamed = FileGrouper()
+    generator = streamed.iter_files([str(library)], [str(library / "Skip")], INCLUDE, EXCLUDE, recursive=True)
+    stream_groups = streamed.group_files(generator, show_progress=False)
+
+    assert _by_filepath(list_groups) == _by_filepath(reference_groups)
+    assert _exported(stream_groups) == _exported(list_groups)
+    assert len(list_groups["title:show a | year:Unknown"]) == 5
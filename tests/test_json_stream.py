@@ -0,0 +1,72 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+import json_stream
+
+DOCUMENT = {
+    "groups": {
+        "Show A": {"files": ["a 01.mkv", "a 02.mkv"], "episodes": 2, "ratio": 0.5},
+        "Shöw \"B\"\n": {"files": [], "meta": {"year": 2020, "watched": None, "done": True}},
+    },
+    "empty": {},
+    "numbers": [1, -2.5, 1e21, 12345678901234567890],
+    "text": "line\nbreak ☃",
+}
+
+
+def _dump(obj, **kwargs):
+    buffer = io.StringIO()
+    json_stream.dump(obj, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_dump_matches_json_dump(depth):
+    assert _dump(DOCUMENT, depth=depth) == json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+
+
+def test_dump_accepts_lazy_entries():
+    lazy = {"groups": iter(DOCUMENT["groups"].items()), "empty": iter(())}
+    expected = {"groups": DOCUMENT["groups"], "empty": {}}
+    assert _dump(lazy) == json.dumps(expected, indent=2, ensure_ascii=False)
+
+
+def test_dump_uses_encoder_class():
+    class DateEncoder(json.JSONEncoder):
+        def default(self, o):
+            if isinstance(o, date):
+                return o.isoformat()
+            return super().default(o)
+
+    obj = {"groups": {"a": {"aired": date(2024, 1, 2)}}}
+    assert json.loads(_dump(obj, cls=DateEncoder)) == {"groups": {"a": {"aired": "2024-01-02"}}}
+
+
+def test_dump_non_object_root():
+    assert _dump([1, {"a": 2}]) == json.dumps([1, {"a": 2}], indent=2)
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 2, 7, 64, json_stream.READ_CHUNK_CHARS])
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_load_round_trips_in_any_chunk_size(chunk_chars, depth):
+    text = _dump(DOCUMENT)
+    assert json_stream.load(io.StringIO(text), depth=depth, chunk_chars=chunk_chars) == DOCUMENT
+
+
+def test_load_compact_json_and_numbers_split_across_chunks():
+    text = json.dumps({"a": {"n": 123456, "f": -1.25e10}, "b": [1, 2]}, separators=(",", ":"))
+    for chunk_chars in range(1, len(text) + 1):
+        assert json_stream.load(io.StringIO(text), chunk_chars=chunk_chars) == json.loads(text)
+
+
+def test_load_non_object_root():
+    assert json_stream.load(io.StringIO(" [1, 2, {\"a\": 3}] "), chunk_chars=3) == [1, 2, {"a": 3}]
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '{"a" 1}', '{"a": 1} x', "{1: 2}", '{"a": {"b": }}'])
+def test_load_rejects_invalid_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        json_stream.load(io.StringIO(text), chunk_chars=2)
@@ -0,0 +1,118 @@
+import base64
+import gzip
+import json
+import re
+
+import webapp_payload
+
+
+def _read_chunk(directory, chunk):
+    text = (directory / chunk["file"]).read_text(encoding="utf-8")
+    match = re.fullmatch(rf'{webapp_payload.CHUNK_REGISTER_FUNCTION}\((".*?"), (\d+), "([A-Za-z0-9+/=]*)"\);\n', text)
+    assert match, text
+    return json.loads(match.group(1)), int(match.group(2)), json.loads(gzip.decompress(base64.b64decode(match.group(3))))
+
+
+def _reassemble(result, output_path):
+    manifest = result[webapp_payload.MANIFEST_KEY]
+    directory = webapp_payload.chunk_directory(output_path)
+    items = result[manifest["key"]]
+    items = dict(items) if isinstance(items, dict) else list(items)
+    for index, chunk in enumerate(manifest["chunks"]):
+        key, chunk_index, chunk_items = _read_chunk(directory, chunk)
+        assert (key, chunk_index) == (manifest["key"], index)
+        assert len(chunk_items) == chunk["items"]
+        if isinstance(items, dict):
+            items.update(chunk_items)
+        else:
+            items.extend(chunk_items)
+    return items
+
+
+def test_list_payload_round_trips(tmp_path):
+    output_path = tmp_path / "report.html"
+    payload = {"rows": [{"n": index, "name": f"Row {index} ☃"} for index in range(250)], "title": "t"}
+    result = webapp_payload.split_payload(payload, "rows", output_path, chunk_items=60, first_screen_items=100)
+
+    assert result["title"] == "t"
+    assert result["rows"] == payload["rows"][:100]
+    manifest = result[webapp_payload.MANIFEST_KEY]
+    assert manifest["encoding"] == webapp_payload.CHUNK_ENCODING
+    assert manifest["directory"] == "report_data"
+    assert manifest["total_items"] == 250
+    assert [chunk["items"] for chunk in manifest["chunks"]] == [60, 60, 30]
+    assert _reassemble(result, output_path) == payload["rows"]
+    # The input payload is left untouched
+    assert len(payload["rows"]) == 250 and webapp_payload.MANIFEST_KEY not in payload
+
+
+def test_dict_payload_keeps_order(tmp_path):
+    output_path = tmp_path / "series.html"
+    groups = {f"group {index:03d}": {"episodes": index} for index in range(150)}
+    result = webapp_payload.split_payload({"groups": groups}, "groups", output_path, chunk_items=20, first_screen_items=10)
+
+    assert list(result["groups"]) == list(groups)[:10]
+    reassembled = _reassemble(result, output_path)
+    assert list(reassembled) == list(groups)
+    assert reassembled == groups
+
+
+def test_continuation_items_stay_with_their_parent(tmp_path):
+    output_path = tmp_path / "netflix.html"
+    rows = []
+    for title in range(40):
+        rows.append({"title": title, "level": 0})
+        rows.extend({"title": title, "level": 1} for _ in range(title % 4))
+    result = webapp_payload.split_payload(
+        {"rows": rows}, "rows", output_path, chunk_items=7, first_screen_items=5,
+        is_continuation=lambda row: row["level"] > 0,
+    )
+
+    directory = webapp_payload.chunk_directory(output_path)
+    assert result["rows"][0]["level"] == 0
+    for chunk in result[webapp_payload.MANIFEST_KEY]["chunks"]:
+        assert _read_chunk(directory, chunk)[2][0]["level"] == 0
+    assert _reassemble(result, output_path) == rows
+
+
+def test_small_or_disabled_payloads_stay_inline(tmp_path):
+    output_path = tmp_path / "report.html"
+    payload = {"rows": list(range(100))}
+    assert webapp_payload.split_payload(payload, "rows", output_path, chunk_items=10) is payload
+    assert webapp_payload.split_payload({"rows": list(range(500))}, "rows", output_path, chunk_items=0)["rows"] == list(range(500))
+    assert webapp_payload.split_payload({"rows": list(range(500))}, "rows", output_path, chunk_items=-5)["rows"] == list(range(500))
+    assert not webapp_payload.chunk_directory(output_path).exists()
+
+
+def test_stale_chunks_are_removed(tmp_path):
+    output_path = tmp_path / "report.html"
+    webapp_payload.split_payload({"rows": list(range(500))}, "rows", output_path, chunk_items=10)
+    directory = webapp_payload.chunk_directory(output_path)
+    assert len(list(directory.glob(webapp_payload.CHUNK_FILE_PATTERN))) == 40
+
+    result = webapp_payload.split_payload({"rows": list(range(300))}, "rows", output_path, chunk_items=100)
+    assert sorted(path.name for path in directory.iterdir()) == ["chunk_0001.js", "chunk_0002.js"]
+    assert _reassemble(result, output_path) == list(range(300))
+
+    webapp_payload.split_payload({"rows": list(range(300))}, "rows", output_path, chunk_items=0)
+    assert not directory.exists()
+
+
+def test_remove_chunks_keeps_unrelated_files(tmp_path):
+    output_path = tmp_path / "report.html"
+    webapp_payload.split_payload({"rows": list(range(300))}, "rows", output_path, chunk_items=100)
+    directory = webapp_payload.chunk_directory(output_path)
+    (directory / "notes.txt").write_text("keep me", encoding="utf-8")
+
+    webapp_payload.remove_chunks(output_path)
+    assert [path.name for path in directory.iterdir()] == ["notes.txt"]
+
+
+def test_chunks_are_deterministic(tmp_path):
+    output_path = tmp_path / "report.html"
+    payload = {"rows": [{"n": index} for index in range(400)]}
+    webapp_payload.split_payload(payload, "rows", output_path, chunk_items=100)
+    directory = webapp_payload.chunk_directory(output_path)
+    first = {path.name: path.read_bytes() for path in directory.iterdir()}
+    webapp_payload.split_payload(payload, "rows", output_path, chunk_items=100)
+    assert {path.name: path.read_bytes() for path in directory.iterdir()} == first
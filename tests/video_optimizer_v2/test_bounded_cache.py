@@ -0,0 +1,112 @@
+import pytest
+
+import bounded_cache
+from bounded_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(bounded_cache.time, "monotonic", fake)
+    return fake
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now the least recently used
+    cache["c"] = 3
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_put_existing_key_refreshes_without_evicting():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"] = 10
+    cache["c"] = 3
+    assert cache.get("a") == 10
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(4, ttl=10)
+    cache["a"] = 1
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.expirations == 1
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = LRUCache(4, ttl=10)
+    cache.put("short", 1, ttl=1)
+    cache.put("long", 2)
+    clock.now += 5
+    assert "short" not in cache
+    assert "long" in cache
+
+
+def test_no_ttl_never_expires(clock):
+    cache = LRUCache(4)
+    cache["a"] = 1
+    clock.now += 10 ** 9
+    assert cache["a"] == 1
+
+
+def test_hit_miss_stats():
+    cache = LRUCache(4, name="test.stats")
+    cache["a"] = None
+    missing = object()
+    assert cache.get("a", missing) is None  # None is a cached value, not a miss
+    assert cache.get("b", missing) is missing
+    with pytest.raises(KeyError):
+        cache["c"]
+    assert "a" in cache  # membership tests are not counted
+
+    stats = cache.stats()
+    assert stats["name"] == "test.stats"
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["size"] == 1
+
+    cache.reset_stats()
+    assert cache.stats()["hit_rate"] is None
+
+
+def test_pop_and_clear():
+    cache = LRUCache(4)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_stats_lists_live_caches():
+    cache = LRUCache(4, name="test.registry")
+    cache["a"] = 1
+    names = [entry["name"] for entry in bounded_cache.cache_stats()]
+    assert "test.registry" in names
@@ -0,0 +1,133 @@
+import pytest
+
+from lookup_cache import LookupCache
+from metadata_provider import BaseMetadataProvider, MatchResult, MetadataManager, TitleInfo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    lookup_cache = LookupCache(str(tmp_path / "lookup_cache.db"))
+    yield lookup_cache
+    lookup_cache.close()
+
+
+def _match(title_id="tt1", title="Example Show"):
+    return MatchResult(TitleInfo(id=title_id, title=title, type="tv", year=2020, genres=["Drama"]), 91.5, 1.2)
+
+
+def test_round_trips_match_results(cache):
+    key = ("example show", 2020, "tv")
+    cache.put("imdb", "v1", key, _match())
+    found, result = cache.get("imdb", "v1", key)
+    assert found is True
+    assert result == _match()
+
+
+def test_negative_results_are_cached(cache):
+    key = ("no such show", None, None)
+    cache.put("imdb", "v1", key, None)
+    assert cache.get("imdb", "v1", key) == (True, None)
+    assert cache.get("imdb", "v1", ("other", None, None)) == (False, None)
+
+
+def test_new_dataset_version_purges_older_entries(cache):
+    old_key = ("old show", None, None)
+    cache.put("imdb", "v1", old_key, _match("tt1", "Old Show"))
+    cache.put("anime", "v1", old_key, _match("a1", "Old Show"))
+
+    assert cache.get("imdb", "v2", old_key) == (False, None)
+    # The purge dropped v1 entries for that provider only
+    assert cache.get("imdb", "v1", old_key) == (False, None)
+    assert cache.get("anime", "v1", old_key)[0] is True
+    assert cache.stats()["imdb"]["entries"] == 0
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "lookup_cache.db")
+    key = ("example show", 2020, None)
+    first = LookupCache(path)
+    first.put("imdb", "v1", key, _match())
+    first.close()
+
+    second = LookupCache(path)
+    try:
+        assert second.get("imdb", "v1", key) == (True, _match())
+    finally:
+        second.close()
+
+
+def test_stats_count_hits_and_misses(cache):
+    key = ("example show", None, None)
+    cache.get("imdb", "v1", key)
+    cache.put("imdb", "v1", key, _match())
+    cache.get("imdb", "v1", key)
+    cache.get("imdb", "v1", key)
+
+    stats = cache.stats()["imdb"]
+    assert stats["entries"] == 1
+    assert stats["negative_entries"] == 0
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+class VersionedProvider(BaseMetadataProvider):
+    """Provider whose data 'loads' on the first lookup, like the IMDb and anime providers."""
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self._db_loaded_once = False
+        self._db_loaded_until_ts = None
+        self.version_reads = 0
+
+    def get_dataset_version(self):
+        self.version_reads += 1
+        return f"v{self._db_loaded_until_ts}" if self._db_loaded_once else None
+
+    def find_title(self, title, year=None):
+        self._db_loaded_once = True
+        self._db_loaded_until_ts = self._db_loaded_until_ts or 100
+        return _match(title_id=title, title=title)
+
+    def get_episode_info(self, parent_id, season, episode):
+        return None
+
+    def refresh_data(self):
+        self._db_loaded_until_ts += 100
+
+
+def test_manager_reads_dataset_version_again_only_after_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(LookupCache, "default_path", staticmethod(lambda: str(tmp_path / "lookup_cache.db")))
+    provider = VersionedProvider(str(tmp_path / "provider"))
+    manager = MetadataManager([provider])
+    try:
+        for title in ("one", "two", "three"):
+            manager.find_title(title)
+        # Before the first lookup (no data yet) and after it loaded the data
+        assert provider.version_reads == 2
+
+        provider.refresh_data()
+        manager.find_title("four")
+        assert provider.version_reads == 3
+        assert manager._lookup_cache.get("versionedprovider", "v200", ("four", None, None))[0] is True
+        assert manager._lookup_cache.get("versionedprovider", "v100", ("one", None, None)) == (False, None)
+    finally:
+        manager._lookup_cache.close()
+
+
+class UnversionedProvider(VersionedProvider):
+    def get_dataset_version(self):
+        self.version_reads += 1
+        return None
+
+
+def test_manager_caches_missing_dataset_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(LookupCache, "default_path", staticmethod(lambda: str(tmp_path / "lookup_cache.db")))
+    provider = UnversionedProvider(str(tmp_path / "provider"))
+    provider.find_title("warm up")
+    manager = MetadataManager([provider])
+    try:
+        for title in ("one", "two", "three"):
+            manager.find_title(title)
+        assert provider.version_reads == 1
+    finally:
+        manager._lookup_cache.close()
@@ -0,0 +1,76 @@
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+from metadata_provider import BaseMetadataProvider, MatchResult, MetadataManager, TitleInfo
+
+THREADS = 8
+TITLES_PER_THREAD = 150
+
+
+class CountingProvider(BaseMetadataProvider):
+    """Matches every title with a low score, so the cascade asks every provider."""
+
+    def find_title(self, title, year=None):
+        return MatchResult(TitleInfo(id=title, title=title, type="movie"), 50.0)
+
+    def get_episode_info(self, parent_id, season, episode):
+        return None
+
+    def refresh_data(self):
+        pass
+
+
+class OtherProvider(CountingProvider):
+    pass
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return MetadataManager(
+        [CountingProvider(str(tmp_path / "one")), OtherProvider(str(tmp_path / "two"))], persistent_cache=False
+    )
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target):
+    threads = [threading.Thread(target=target, args=(number,)) for number in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+
+
+def test_concurrent_lookups_are_all_counted(manager, frequent_thread_switches):
+    _run_threads(
+        lambda number: [manager.find_title(f"title {number} {index}") for index in range(TITLES_PER_THREAD)]
+    )
+
+    stats = manager.provider_timing_stats()
+    assert [entry["provider"] for entry in stats] == ["CountingProvider", "OtherProvider"]
+    assert [entry["lookups"] for entry in stats] == [THREADS * TITLES_PER_THREAD] * 2
+    assert all(entry["skipped_by_score"] == 0 and entry["skipped_by_budget"] == 0 for entry in stats)
+
+
+
+def test_data_version_migration_keeps_old_expiry():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE data_version (dataset TEXT PRIMARY KEY, updated INTEGER)")
+    conn.execute("INSERT INTO data_version VALUES ('anime_offline_database', 1700000000)")
+
+    BaseMetadataProvider._migrate_data_version_columns(conn)
+    BaseMetadataProvider._migrate_data_version_columns(conn)
+
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(data_version)")]
+    assert columns == ["dataset", "updated", "expires_at", "default_ttl", "last_modified"]
+    assert conn.execute("SELECT expires_at FROM data_version").fetchone() == (1700000000,)
+    conn.close()
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from lookup_cache import LookupCache
+from metadata_provider import BaseMetadataProvider, MatchResult, TitleInfo
+from metadata_service import MetadataLookupService
+
+
+class BlockingProvider(BaseMetadataProvider):
+    """find_title waits on ``barrier``; refresh_data records how many lookups were running."""
+
+    barrier = None
+    release = None
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self._state_lock = threading.Lock()
+        self.active_lookups = 0
+        self.lookups_during_refresh = None
+
+    def find_title(self, title, year=None):
+        with self._state_lock:
+            self.active_lookups += 1
+        try:
+            if self.barrier is not None:
+                self.barrier.wait()
+            if self.release is not None:
+                self.release.wait(5)
+            return MatchResult(TitleInfo(id=title, title=title, type="movie"), 90.0)
+        finally:
+            with self._state_lock:
+                self.active_lookups -= 1
+
+    def get_episode_info(self, parent_id, season, episode):
+        return None
+
+    def refresh_data(self):
+        with self._state_lock:
+            self.lookups_during_refresh = self.active_lookups
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(LookupCache, "default_path", staticmethod(lambda: str(tmp_path / "lookup_cache.db")))
+    lookup_service = MetadataLookupService(
+        address=str(tmp_path / "service.sock"),
+        provider_factories={"blocking": lambda: BlockingProvider(str(tmp_path / "provider"))},
+    )
+    yield lookup_service
+    for manager, _versions in lookup_service._managers.values():
+        manager._lookup_cache.close()
+
+
+def _run_in_threads(targets):
+    errors = []
+
+    def run(target):
+        try:
+            target()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    return threads, errors
+
+
+def _find_title(service, title):
+    return service.handle({"op": "manager", "method": "find_title", "args": (title,)})
+
+
+class FakeConnection:
+    """Stands in for a client connection that sends ``requests`` and then hangs up."""
+
+    def __init__(self, requests):
+        self.requests = list(requests)
+        self.responses = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def recv(self):
+        if not self.requests:
+            raise EOFError
+        return self.requests.pop(0)
+
+    def send(self, response):
+        self.responses.append(response)
+
+
+def test_lookups_from_different_connections_run_concurrently(service):
+    service.handle({"op": "hello"})
+    connections = [
+        FakeConnection([{"op": "manager", "method": "find_title", "args": (title,)}]) for title in ("one", "two")
+    ]
+    # Each lookup only returns once the other one is running as well
+    BlockingProvider.barrier = threading.Barrier(2, timeout=5)
+    try:
+        threads, errors = _run_in_threads([lambda conn=conn: service._serve_connection(conn) for conn in connections])
+        for thread in threads:
+            thread.join(10)
+    finally:
+        BlockingProvider.barrier = None
+    assert errors == []
+    assert [conn.responses[0][0] for conn in connections] == ["ok", "ok"]
+    assert service.request_counts["manager"] == 2
+
+
+def test_provider_maintenance_waits_for_running_lookups(service):
+    service.handle({"op": "hello"})
+    provider = service._get_manager(None).providers[0]
+    BlockingProvider.release = threading.Event()
+    try:
+        lookups, lookup_errors = _run_in_threads([lambda: _find_title(service, "one")])
+        deadline = time.monotonic() + 5
+        while not provider.active_lookups and time.monotonic() < deadline:
+            time.sleep(0.01)
+        refresh, refresh_errors = _run_in_threads(
+            [lambda: service.handle({"op": "provider", "provider": "BlockingProvider", "method": "refresh_data"})]
+        )
+        refresh[0].join(0.2)
+        assert refresh[0].is_alive()
+        BlockingProvider.release.set()
+        for thread in lookups + refresh:
+            thread.join(10)
+    finally:
+        BlockingProvider.release.set()
+        BlockingProvider.release = None
+    assert lookup_errors == [] and refresh_errors == []
+    assert provider.lookups_during_refresh == 0
+
+
+def test_private_provider_methods_are_rejected(service):
+    with pytest.raises(ValueError):
+        service.handle({"op": "provider", "provider": "BlockingProvider", "method": "_get_connection"})
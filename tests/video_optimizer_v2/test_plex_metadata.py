@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import plex_metadata
+from plex_metadata import PlexMediaSnapshot, PlexMetadataProvider, PlexPartPathIndex
+
+MEDIA_PARTS = [
+    ("/plex/movies/Exact.Movie.2010.mkv", "Exact Movie", 2),
+    ("/plex/other/place/Renamed.Folder.mkv", "Renamed Folder", 0),
+    ("/plex/movies/Partial.Movie.mkv.bak", "Partial Movie", 1),
+    ("/plex/movies/Director's Cut - Some_Film.mkv", "Some Film", 0),
+    ("/plex/archive/SomeXFilm.mkv", "Wildcard Trap", 0),
+]
+
+
+@pytest.fixture
+def provider(tmp_path):
+    db_dir = tmp_path / "Plug-in Support" / "Databases"
+    db_dir.mkdir(parents=True)
+    conn = sqlite3.connect(db_dir / "com.plexapp.plugins.library.db")
+    # Plex keeps its database in WAL mode
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE library_sections (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE metadata_items (id INTEGER PRIMARY KEY, guid TEXT, title TEXT, year INTEGER, library_section_id INTEGER);
+        CREATE TABLE media_items (id INTEGER PRIMARY KEY, metadata_item_id INTEGER);
+        CREATE TABLE media_parts (id INTEGER PRIMARY KEY, media_item_id INTEGER, file TEXT, duration INTEGER);
+        CREATE TABLE metadata_item_views (guid TEXT, viewed_at INTEGER);
+        INSERT INTO library_sections VALUES (1, 'Movies');
+        """
+    )
+    for item_id, (path, title, views) in enumerate(MEDIA_PARTS, start=1):
+        conn.execute("INSERT INTO metadata_items VALUES (?, ?, ?, 2010, 1)", (item_id, f"guid-{item_id}", title))
+        conn.execute("INSERT INTO media_items VALUES (?, ?)", (item_id, item_id))
+        conn.execute("INSERT INTO media_parts VALUES (?, ?, ?, 1000)", (item_id, item_id, path))
+        conn.executemany(
+            "INSERT INTO metadata_item_views VALUES (?, ?)", [(f"guid-{item_id}", 1700000000 + view) for view in range(views)]
+        )
+    conn.commit()
+    conn.close()
+
+    plex = PlexMetadataProvider(plex_data_dir=str(tmp_path), snapshot_path=str(tmp_path / "snapshot.pickle"))
+    plex._server_hash_checked = True
+    yield plex
+    plex.close()
+
+
+REQUESTS = {
+    "/plex/movies/Exact.Movie.2010.mkv": "Exact Movie",
+    "/local/library/RENAMED.FOLDER.mkv": "Renamed Folder",
+    "/local/library/Partial.Movie.mkv": "Partial Movie",
+    "/local/library/Some_Film.mkv": "Some Film",
+    "/local/library/Missing.Movie.mkv": None,
+}
+
+
+def _titles(statuses):
+    return {path: status.plex_title if status else None for path, status in statuses.items()}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fixture paths are POSIX paths")
+@pytest.mark.parametrize("use_snapshot", [False, True])
+def test_watch_statuses_fall_back_from_exact_to_file_name_to_substring(provider, use_snapshot):
+    provider.use_snapshot = use_snapshot
+    statuses = provider.get_watch_statuses(REQUESTS)
+
+    assert _titles(statuses) == REQUESTS
+    assert statuses["/plex/movies/Exact.Movie.2010.mkv"].watch_count == 2
+    assert statuses["/local/library/Partial.Movie.mkv"].watched is True
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fixture paths are POSIX paths")
+def test_single_watch_status_uses_the_same_fallbacks(provider):
+    assert provider.get_watch_status("/elsewhere/Partial.Movie.mkv").plex_title == "Partial Movie"
+    assert provider.get_watch_status("/elsewhere/Nothing.mkv") is None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fixture paths are POSIX paths")
+def test_unmatched_files_share_one_media_parts_read(provider, monkeypatch):
+    builds = []
+    build_part_path_index = provider._build_part_path_index
+
+    def counting_build(cursor):
+        builds.append(cursor)
+        return build_part_path_index(cursor)
+
+    monkeypatch.setattr(provider, "_build_part_path_index", counting_build)
+    missing = [f"/local/library/Missing.{index}.mkv" for index in range(50)]
+    statuses = provider.get_watch_statuses(missing + list(REQUESTS))
+
+    assert _titles(statuses) == {**dict.fromkeys(missing), **REQUESTS}
+    assert len(builds) == 1
+
+
+def test_part_path_index_searches_in_path_order():
+    index = PlexPartPathIndex(["/b/Show.S01E01.mkv", "/a/show.s01e01.MKV", "/c/Show.S01E01.mkv.bak", "/d/Other.mkv"])
+
+    assert index.with_basename("/local/SHOW.S01E01.mkv") == ["/a/show.s01e01.MKV", "/b/Show.S01E01.mkv"]
+    assert index.containing("Show.S01E01.mkv") == ["/a/show.s01e01.MKV", "/b/Show.S01E01.mkv", "/c/Show.S01E01.mkv.bak"]
+    assert index.containing("mkv\n/d") == []
+    assert index.containing("") == []
+    assert index.containing("Missing.mkv") == []
+
+
+def test_concurrent_callers_build_and_save_one_snapshot(provider, tmp_path, monkeypatch):
+    provider.use_snapshot = True
+    builds = []
+    build = PlexMediaSnapshot.build.__func__
+
+    def slow_build(cls, db_path, conn):
+        builds.append(db_path)
+        time.sleep(0.05)
+        return build(cls, db_path, conn)
+
+    monkeypatch.setattr(plex_metadata.PlexMediaSnapshot, "build", classmethod(slow_build))
+    snapshots = []
+    threads = [threading.Thread(target=lambda: snapshots.append(provider.get_snapshot())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(builds) == 1
+    assert len(snapshots) == 4 and all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert sorted(path.name for path in tmp_path.glob("snapshot.pickle*")) == ["snapshot.pickle"]
+    stored = PlexMediaSnapshot.load(str(tmp_path / "snapshot.pickle"), provider.db_path)
+    assert stored.entries == snapshots[0].entries
+
+
+def test_snapshot_lookup_many_matches_lookup_order():
+    entries = {path: {"file_path": path} for path in ["/a/Movie.mkv.bak", "/b/Movie.mkv", "/c/Other.mkv"]}
+    snapshot = PlexMediaSnapshot("plex.db", (None, None), entries)
+
+    found = snapshot.lookup_many([
+        ("/local/MOVIE.mkv", "/local/MOVIE.mkv"),
+        ("/c/Other.mkv", "/c/Other.mkv"),
+        ("/local/Movie.mk", "/local/Movie.mk"),
+        ("/local/Missing.mkv", "/local/Missing.mkv"),
+    ])
+    assert [entry["file_path"] if entry else None for entry in found] == [
+        "/b/Movie.mkv", "/c/Other.mkv", "/a/Movie.mkv.bak", None,
+    ]
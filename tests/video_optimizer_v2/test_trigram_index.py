@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from trigram_index import TrigramIndex, title_trigrams
+
+TITLES = [
+    (1, "Shingeki no Kyojin"),
+    (1, "Attack on Titan"),
+    (2, "Kimetsu no Yaiba"),
+    (2, "Demon Slayer"),
+    (3, "Sword Art Online"),
+    (4, "Fullmetal Alchemist: Brotherhood"),
+]
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def index(conn):
+    trigram_index = TrigramIndex("title_trigram")
+    trigram_index.rebuild(conn, TITLES)
+    return trigram_index
+
+
+def test_title_trigrams_ignore_case_spaces_and_punctuation():
+    assert title_trigrams("Kyo-Jin") == title_trigrams("kyojin")
+    assert title_trigrams("ab") == {"  a", " ab", "ab "}
+    assert title_trigrams("") == set()
+    assert title_trigrams(None) == set()
+
+
+def test_invalid_index_name_is_rejected():
+    with pytest.raises(ValueError):
+        TrigramIndex("bad name; DROP TABLE x")
+
+
+def test_candidates_tolerate_typos_and_split_words(conn, index):
+    assert index.candidates(conn, "Singeki no Kyo Jin", 3)[0][:2] == (1, "Shingeki no Kyojin")
+    assert index.candidates(conn, "Demon Slayr", 3)[0][:2] == (2, "Demon Slayer")
+    assert index.candidates(conn, "Fulmetal Alchemist", 3)[0][0] == 4
+
+
+def test_candidates_collapse_titles_per_ref_id(conn, index):
+    ref_ids = [ref_id for ref_id, _title, _shared in index.candidates(conn, "no", 10)]
+    assert len(ref_ids) == len(set(ref_ids))
+
+
+def test_candidates_respect_limit_and_order(conn, index):
+    results = index.candidates(conn, "Sword Art Onlin", 2)
+    assert len(results) <= 2
+    shared_counts = [shared for _ref_id, _title, shared in results]
+    assert shared_counts == sorted(shared_counts, reverse=True)
+    assert index.candidates(conn, "Sword Art Online", 0) == []
+
+
+def test_duplicate_titles_are_indexed_once(conn):
+    index = TrigramIndex("dedupe_trigram")
+    assert index.rebuild(conn, [(1, "Naruto"), (1, "NARUTO!"), (2, "Naruto")]) == 2
+
+
+def test_remove_drops_entries_and_postings(conn, index):
+    assert index.remove(conn, [1]) == 2
+    assert all(ref_id != 1 for ref_id, _title, _shared in index.candidates(conn, "Shingeki no Kyojin", 5))
+    assert index.stats(conn)["entries"] == len(TITLES) - 2
+
+
+def test_add_extends_existing_index(conn, index):
+    index.add(conn, [(5, "Shingeki no Bahamut")])
+    ref_ids = [ref_id for ref_id, _title, _shared in index.candidates(conn, "Shingeki no Bahamut", 5)]
+    assert ref_ids[0] == 5
+    assert 1 in ref_ids
+
+
+def test_unbuilt_index_returns_no_candidates(conn):
+    index = TrigramIndex("missing_trigram")
+    assert index.is_built(conn) is False
+    assert index.candidates(conn, "Demon Slayer", 5) == []
+    assert index.stats(conn) == {"entries": 0, "grams": 0}
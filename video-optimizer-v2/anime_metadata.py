@@ -1,4 +1,5 @@
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
+import io
 import os
 import re
 import json
@@ -10,9 +11,12 @@ import time
 from difflib import SequenceMatcher
 from datetime import timedelta
 import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from tqdm import tqdm
 from metadata_provider import BaseMetadataProvider, TitleInfo, EpisodeInfo, MatchResult
+from bounded_cache import LRUCache
+from trigram_index import TrigramIndex
+import sql_profiler
 import enum
 
 try:
@@ -52,9 +56,98 @@ ANIME_STATUS_TEXT_TO_ID = {
 ANIME_STATUS_ID_TO_TEXT = {v: k for k, v in ANIME_STATUS_TEXT_TO_ID.items()}
 ANIME_STATUS_ID_TO_TEXT[AnimeStatus.UNKNOWN] = "UNKNOWN"
 
+# Episode table cache value for "not looked up yet"; None marks a title that does not exist
+_NO_EPISODE_TABLE = object()
+
+_JSON_WHITESPACE = re.compile(r'[ \t\r\n]*')
+
+
+def _iter_json_array_items(stream, array_key: str, chunk_size: int = 1 << 20):
+    """
+    Yield the items of the array stored under ``array_key`` in a top-level JSON
+    object, reading the text ``stream`` in chunks so only one item is decoded
+    at a time. Other top-level values are decoded and discarded.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buffer, pos
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def decode_value():
+        nonlocal pos
+        while True:
+            next_char()
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A value ending exactly at the buffer end may be a truncated number
+            if end < len(buffer) or not fill():
+                pos = end
+                return value
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        found = next_char()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, found '{found}'")
+        pos += 1
+
+    expect('{')
+    if next_char() == '}':
+        return
+    while True:
+        key = decode_value()
+        expect(':')
+        if key == array_key:
+            expect('[')
+            if next_char() == ']':
+                pos += 1
+            else:
+                while True:
+                    yield decode_value()
+                    separator = next_char()
+                    pos += 1
+                    if separator == ']':
+                        break
+                    if separator != ',':
+                        raise ValueError(f"Expected ',' or ']' in JSON array, found '{separator}'")
+        else:
+            decode_value()
+        separator = next_char()
+        pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found '{separator}'")
+
 class AnimeDataProvider(BaseMetadataProvider):
     ANIME_DB_URL = "https://github.com/manami-project/anime-offline-database/releases/download/latest/anime-offline-database-minified.json.zst"
     MAX_RETRIES = 3
+    SEARCH_CACHE_MAX = 1000
+    # Seconds; None keeps entries until evicted or the data is reloaded
+    SEARCH_CACHE_TTL = None
+    # Titles whose season list is kept in memory for episode lookups
+    EPISODE_TABLE_CACHE_MAX = 256
     
     # Define relevance scores for different title types
     TITLE_WEIGHTS = {
@@ -91,14 +184,19 @@ class AnimeDataProvider(BaseMetadataProvider):
     def __init__(self):
         super().__init__('anime', provider_weight=1.0)
         # Provider-level default TTL is provided via BaseMetadataProvider.cache_duration
-        self._search_cache = {}  # Cache recent search results
+        # Recent title/episode lookups
+        self._search_cache = LRUCache(self.SEARCH_CACHE_MAX, ttl=self.SEARCH_CACHE_TTL, name="anime.search")
+        # Per title: (year, seasons sharing its base title), loaded on the first episode lookup
+        self._episode_table_cache = LRUCache(self.EPISODE_TABLE_CACHE_MAX, name="anime.episode_tables")
+        # Typo-tolerant candidate lookup over titles and synonyms, used when FTS finds nothing
+        self._trigram_index = TrigramIndex("anime_trigram")
         # In-process guard to avoid re-checking/reloading DB on every lookup.
         self._db_loaded_once = False
         self._db_loaded_until_ts: Optional[int] = None
         self._db_path = os.path.join(self.cache_dir, "anime_data.db")
         # Which data_version.dataset rows represent this provider's sources
         self.CACHE_EXPIRY_DATASETS = ['anime_offline_database']
-        self._init_connection_pool(pool_size=3)
+        self._init_connection_pool()
         self._init_database()
         self._load_cache_duration()
         expired = self._get_expired_datasets(self.CACHE_EXPIRY_DATASETS)
@@ -112,12 +210,19 @@ class AnimeDataProvider(BaseMetadataProvider):
     # Age (in years) at which bonus falls to zero
     YEAR_RECENCY_DECAY_YEARS = 10
     EXACT_MATCH_SCORE = 1000.0
+    MAX_MATCH_SCORE = EXACT_MATCH_SCORE
     PREFIX_SCORE_BASE = 700.0
     PREFIX_SCORE_RANGE = 140.0
     PREFIX_SCORE_CAP = 899.0
     FUZZY_SCORE_BASE = 400.0
     FUZZY_SCORE_RANGE = 260.0
     FUZZY_SCORE_CAP = 749.0
+    # Entries per executemany batch while ingesting the offline database
+    INGEST_BATCH_SIZE = 2000
+    # Max anime ids per IN (...) query when fetching candidate synonyms
+    SYNONYM_FETCH_BATCH_SIZE = 500
+    # Anime ids taken from the trigram index for fine scoring when FTS finds nothing
+    TRIGRAM_CANDIDATE_LIMIT = 20
 
     def _parse_season_from_title(self, title: str) -> tuple[Optional[int], str]:
         """
@@ -326,7 +431,7 @@ class AnimeDataProvider(BaseMetadataProvider):
     def _init_database(self) -> None:
         """Initialize SQLite database with optimized schema"""
         try:
-            with sqlite3.connect(self._db_path, timeout=30.0) as conn:
+            with sql_profiler.connect(self._db_path, timeout=30.0) as conn:
                 conn.execute("PRAGMA busy_timeout=30000")
                 conn.execute("PRAGMA synchronous=NORMAL")
                 conn.execute("PRAGMA cache_size=10000")
@@ -399,10 +504,14 @@ class AnimeDataProvider(BaseMetadataProvider):
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS data_version (
                         dataset TEXT PRIMARY KEY,
-                        updated INTEGER
+                        updated INTEGER,
+                        expires_at INTEGER,
+                        default_ttl INTEGER,
+                        last_modified INTEGER
                     )
                 """)
-                
+                self._migrate_data_version_columns(conn)
+
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_synonyms_id ON synonyms(id)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_synonyms_title_nocase ON synonyms(title COLLATE NOCASE)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_id ON sources(id)")
@@ -441,6 +550,7 @@ class AnimeDataProvider(BaseMetadataProvider):
                         tokenize='porter unicode61'
                     )
                 """)
+                self._trigram_index.create_tables(conn)
                 conn.commit()
         except Exception as e:
             logging.error(f"Failed to initialize anime database: {str(e)}")
@@ -500,6 +610,12 @@ class AnimeDataProvider(BaseMetadataProvider):
 
     def load_database(self) -> None:
         """Load the anime database into SQLite, downloading if needed"""
+        if self._loaded_in_process():
+            return
+        with self._load_lock:
+            self._load_database_if_needed()
+
+    def _load_database_if_needed(self) -> None:
         now_ts = int(time.time())
 
         # Fast-path: DB already validated/loaded in this process and not expired.
@@ -511,6 +627,7 @@ class AnimeDataProvider(BaseMetadataProvider):
 
         if self._is_data_current():
             logging.info("Database contains current anime data")
+            self._ensure_trigram_index()
             self._db_loaded_once = True
             try:
                 self._db_loaded_until_ts = int(self.get_cache_expiry().timestamp())
@@ -539,46 +656,13 @@ class AnimeDataProvider(BaseMetadataProvider):
                     logging.error(f"Failed to download anime database: {e}")
                     raise
 
-            # Decompress the zst file
+            # Stream-decompress and parse entries one at a time straight into the database
             try:
-                with open(zst_path, "rb") as zst_file:
-                    dctx = zstd.ZstdDecompressor()
-                    try:
-                        # Try regular decompression first
-                        json_bytes = dctx.decompress(zst_file.read())
-                    except zstd.ZstdError as e:
-                        # If we get a "could not determine content size in frame header" error,
-                        # use streaming decompression instead
-                        if "could not determine content size in frame header" in str(e):
-                            logging.info("Using streaming decompression due to missing content size in zst header")
-                            zst_file.seek(0)  # Reset file position
-                            reader = dctx.stream_reader(zst_file)
-                            json_bytes = reader.read()
-                        else:
-                            raise
-                    json_str = json_bytes.decode("utf-8")
+                self._load_zst_to_db(zst_path)
             except Exception as e:
-                logging.error(f"Failed to decompress anime database: {e}")
+                logging.error(f"Failed to load anime database from {zst_path}: {e}")
                 raise
 
-            # Write the JSON string to a temporary file for compatibility with _load_json_to_db
-            temp_json = os.path.join(self.cache_dir, "temp_anime.json")
-            try:
-                with open(temp_json, "w", encoding="utf-8") as f:
-                    f.write(json_str)
-            except Exception as e:
-                logging.error(f"Failed to write temp JSON file: {e}")
-                raise
-
-            # Parse and insert into database
-            self._load_json_to_db(temp_json)
-
-            # Clean up temp file, but keep the zst file
-            try:
-                os.remove(temp_json)
-            except Exception:
-                pass
-
         except Exception as e:
             logging.error(f"Error processing anime database: {e}")
             raise
@@ -591,10 +675,50 @@ class AnimeDataProvider(BaseMetadataProvider):
 
         return
 
+    def _build_trigram_index(self, conn: sqlite3.Connection) -> None:
+        """Index every title and synonym in the trigram index."""
+        entries = self._trigram_index.rebuild(conn, conn.execute("SELECT id, title FROM synonyms").fetchall())
+        conn.commit()
+        logging.info(f"Indexed {entries} anime titles for trigram search")
+
+    def _ensure_trigram_index(self) -> None:
+        """Build the trigram index for databases loaded before it existed."""
+        with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
+            if not self._trigram_index.is_built(conn):
+                self._build_trigram_index(conn)
+
+    def _get_trigram_candidates(self, conn: sqlite3.Connection, title: str) -> list:
+        """Candidates (id and matching title) sharing the most character trigrams with ``title``."""
+        return [
+            {'id': anime_id, 'title': matched_title}
+            for anime_id, matched_title, _shared in self._trigram_index.candidates(conn, title, self.TRIGRAM_CANDIDATE_LIMIT)
+        ]
+
+    def _load_zst_to_db(self, zst_path: str) -> None:
+        """Load a zstd-compressed anime offline database into SQLite without decompressing it to disk"""
+        with open(zst_path, "rb") as zst_file:
+            # stream_reader also handles frames without a content size in the header
+            reader = zstd.ZstdDecompressor().stream_reader(zst_file)
+            with io.TextIOWrapper(reader, encoding="utf-8") as text_stream:
+                self._load_entries_to_db(_iter_json_array_items(text_stream, 'data'))
+
     def _load_json_to_db(self, json_file: str) -> None:
-        """Load JSON data into SQLite database"""
+        """Load an uncompressed anime offline database JSON file into SQLite"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            self._load_entries_to_db(_iter_json_array_items(f, 'data'))
+
+    def _load_entries_to_db(self, entries) -> None:
+        """
+        Load anime entries into the SQLite database.
+
+        Entries are consumed one at a time and inserted in batches of
+        INGEST_BATCH_SIZE, so memory use does not depend on the size of the
+        source document. Season numbers need every entry of a base-title group,
+        so only the fields used for season detection are kept until the end,
+        when the derived season numbers are applied with a single UPDATE pass.
+        """
         try:
-            with sqlite3.connect(self._db_path, timeout=60.0) as conn:
+            with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
                 conn.execute("PRAGMA synchronous=OFF")
                 conn.execute("PRAGMA temp_store=MEMORY")
                 conn.execute("PRAGMA cache_size=100000")
@@ -614,6 +738,7 @@ class AnimeDataProvider(BaseMetadataProvider):
                     conn.execute("DROP TABLE IF EXISTS data_version")
                     conn.execute("DROP VIEW IF EXISTS anime_synonym_view")
                     conn.execute("DROP TABLE IF EXISTS anime_fts")
+                    self._trigram_index.drop_tables(conn)
                     # Recreate schema 
                     self._init_database()
                 else:
@@ -637,113 +762,128 @@ class AnimeDataProvider(BaseMetadataProvider):
                         (int(status_id), status_text)
                     )
 
+                anime_count = 0
+                synonym_count = 0
+                # Slim copies of the entries for season detection after the stream ends
+                season_entries = []
+
+                anime_batch = []
+                synonyms_batch = []
+                sources_batch = []
+                related_batch = []
+
+                def flush_batches():
+                    conn.executemany(
+                        """INSERT OR REPLACE INTO anime_title 
+                           (id, title, type, episodes, status, year, duration, tags, score, season_number, base_title)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        anime_batch
+                    )
+                    conn.executemany(
+                        "INSERT INTO synonyms (id, title) VALUES (?, ?)",
+                        synonyms_batch
+                    )
+                    conn.executemany(
+                        "INSERT INTO sources (id, url) VALUES (?, ?)",
+                        sources_batch
+                    )
+                    conn.executemany(
+                        "INSERT INTO related (id, related_id) VALUES (?, ?)",
+                        related_batch
+                    )
+                    anime_batch.clear()
+                    synonyms_batch.clear()
+                    sources_batch.clear()
+                    related_batch.clear()
+
                 with tqdm(desc="Processing anime database", unit='entries') as pbar:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # First pass: collect all entries for season analysis
-                        all_entries = data['data']
+                    for entry in entries:
+                        # Get MAL id from sources
+                        mal_id = None
+                        for src in entry.get('sources', []):
+                            if "myanimelist.net/anime/" in src:
+                                try:
+                                    mal_id = int(src.rstrip('/').split('/')[-1])
+                                    break
+                                except Exception:
+                                    continue
+                        if not mal_id:
+                            logging.debug(f"Skipping entry without valid MAL id: {entry.get('title', 'Unknown')}")
+                            continue
+
+                        title = entry['title']
+                        type_id = self._get_type_id(entry.get('type'))
+                        episodes = self.safe_int(entry.get('episodes'))
+                        status_id = self._get_status_id(entry.get('status'))
+                        year = self.safe_int(entry.get('animeSeason', {}).get('year'))
+                        duration = self.safe_int(entry.get('duration'))
+                        tags = ','.join(entry.get('tags', []))
                         
-                        # Group entries by base title for season detection
-                        grouped_entries = self._group_anime_by_base_title(all_entries)
+                        # Extract score from JSON data
+                        score = None
+                        if 'score' in entry and 'median' in entry['score']:
+                            try:
+                                score = float(entry['score']['median'])
+                            except (ValueError, TypeError):
+                                score = None
                         
-                        # Derive season numbers
-                        season_assignments = self._derive_seasons_from_years(grouped_entries)
-
-                        anime_batch = []
-                        synonyms_batch = []
-                        sources_batch = []
-                        related_batch = []
-
-                        for entry in all_entries:
-                            # Get MAL id from sources
-                            mal_id = None
-                            for src in entry.get('sources', []):
-                                if "myanimelist.net/anime/" in src:
-                                    try:
-                                        mal_id = int(src.rstrip('/').split('/')[-1])
-                                        break
-                                    except Exception:
-                                        continue
-                            if not mal_id:
-                                logging.debug(f"Skipping entry without valid MAL id: {entry.get('title', 'Unknown')}")
-                                continue
-
-                            title = entry['title']
-                            type_id = self._get_type_id(entry.get('type'))
-                            episodes = self.safe_int(entry.get('episodes'))
-                            status_id = self._get_status_id(entry.get('status'))
-                            year = self.safe_int(entry.get('animeSeason', {}).get('year'))
-                            duration = self.safe_int(entry.get('duration'))
-                            tags = ','.join(entry.get('tags', []))
-                            
-                            # Extract score from JSON data
-                            score = None
-                            if 'score' in entry and 'median' in entry['score']:
-                                try:
-                                    score = float(entry['score']['median'])
-                                except (ValueError, TypeError):
-                                    score = None
-                            
-                            # Get season information
-                            season_number = season_assignments.get(mal_id, 1)
-                            _, base_title = self._parse_season_from_title(title)
-                            if not base_title:
-                                base_title = self._extract_base_title(title)
-
-                            anime_batch.append(
-                                (mal_id, title, type_id, episodes, status_id, year, duration, tags, score, season_number, base_title)
-                            )
-
-                            # Main title as synonym
-                            synonyms_batch.append((mal_id, title))
-                            # Do NOT insert into fts_batch here
-
-                            # Synonyms
-                            for synonym in entry.get('synonyms', []):
-                                if synonym and synonym != title:
-                                    synonyms_batch.append((mal_id, synonym))
-                                    # Do NOT insert into fts_batch here
-
-                            # Other sources
-                            for src in entry.get('sources', []):
-                                if "myanimelist.net/anime/" not in src:
-                                    sources_batch.append((mal_id, src))
-
-                            # Related anime
-                            for rel in entry.get('relatedAnime', []):
-                                rel_id = None
-                                if "myanimelist.net/anime/" in rel:
-                                    try:
-                                        rel_id = int(rel.rstrip('/').split('/')[-1])
-                                        related_batch.append((mal_id, rel_id))
-                                        break
-                                    except Exception:
-                                        print(f"Skipping related anime without valid MAL id: {rel}")
-                                        continue
-
-                            pbar.update(1)
-
-                        # Bulk insert
-                        conn.executemany(
-                            """INSERT OR REPLACE INTO anime_title 
-                               (id, title, type, episodes, status, year, duration, tags, score, season_number, base_title)
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                            anime_batch
-                        )
-                        conn.executemany(
-                            "INSERT INTO synonyms (id, title) VALUES (?, ?)",
-                            synonyms_batch
-                        )
-                        # REMOVE: conn.executemany("INSERT INTO anime_fts (rowid, title, id) VALUES (?, ?, ?)", fts_batch)
-                        conn.executemany(
-                            "INSERT INTO sources (id, url) VALUES (?, ?)",
-                            sources_batch
-                        )
-                        conn.executemany(
-                            "INSERT INTO related (id, related_id) VALUES (?, ?)",
-                            related_batch
+                        season_entries.append({
+                            'title': title,
+                            'type': entry.get('type'),
+                            'sources': [f"https://myanimelist.net/anime/{mal_id}"],
+                            'animeSeason': {'year': entry.get('animeSeason', {}).get('year')},
+                        })
+                        _, base_title = self._parse_season_from_title(title)
+                        if not base_title:
+                            base_title = self._extract_base_title(title)
+
+                        # Season number is filled in once all entries have been seen
+                        anime_batch.append(
+                            (mal_id, title, type_id, episodes, status_id, year, duration, tags, score, 1, base_title)
                         )
+                        anime_count += 1
+
+                        # Main title as synonym
+                        synonyms_batch.append((mal_id, title))
+
+                        # Synonyms
+                        for synonym in entry.get('synonyms', []):
+                            if synonym and synonym != title:
+                                synonyms_batch.append((mal_id, synonym))
+
+                        # Other sources
+                        for src in entry.get('sources', []):
+                            if "myanimelist.net/anime/" not in src:
+                                sources_batch.append((mal_id, src))
+
+                        # Related anime
+                        for rel in entry.get('relatedAnime', []):
+                            rel_id = None
+                            if "myanimelist.net/anime/" in rel:
+                                try:
+                                    rel_id = int(rel.rstrip('/').split('/')[-1])
+                                    related_batch.append((mal_id, rel_id))
+                                    break
+                                except Exception:
+                                    print(f"Skipping related anime without valid MAL id: {rel}")
+                                    continue
+
+                        if len(anime_batch) >= self.INGEST_BATCH_SIZE:
+                            synonym_count += len(synonyms_batch)
+                            flush_batches()
+                        pbar.update(1)
+
+                    synonym_count += len(synonyms_batch)
+                    flush_batches()
+
+                # Derive season numbers from the whole dataset and apply the ones that differ from the default
+                grouped_entries = self._group_anime_by_base_title(season_entries)
+                season_assignments = self._derive_seasons_from_years(grouped_entries)
+                del season_entries, grouped_entries
+                conn.executemany(
+                    "UPDATE anime_title SET season_number = ? WHERE id = ?",
+                    [(season, mal_id) for mal_id, season in season_assignments.items() if season != 1]
+                )
 
                 # Update version info: write expires_at, last_modified and updated
                 # Do not overwrite `default_ttl` here; that value should be
@@ -788,10 +928,11 @@ class AnimeDataProvider(BaseMetadataProvider):
                     except Exception:
                         pass
                 conn.commit()
-                logging.info(f"Loaded {len(anime_batch)} anime entries and {len(synonyms_batch)} synonyms")
+                logging.info(f"Loaded {anime_count} anime entries and {synonym_count} synonyms")
 
                 # After inserting all data, rebuild the FTS table from the content table
                 conn.execute("INSERT INTO anime_fts(anime_fts) VALUES('rebuild')")
+                self._build_trigram_index(conn)
 
         except Exception as e:
             logging.error(f"Error loading anime JSON to database: {str(e)}")
@@ -801,12 +942,15 @@ class AnimeDataProvider(BaseMetadataProvider):
         """Find title information using database queries"""
         self.load_database()
         cache_key = f"{title.lower()}_{year if year else ''}"
-        if cache_key in self._search_cache:
-            return self._search_cache[cache_key]
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
         best_score = 0.0
         anime_data = None  # Initialize to prevent UnboundLocalError
         prepared_query = self._prepare_similarity_query(title)
         conn = self._get_connection()
+        # anime_synonym_view rows fetched while ranking, reused for the final score
+        synonym_rows_by_id = {}
         try:
             candidates = []
             # 0. Try exact match first
@@ -829,14 +973,13 @@ class AnimeDataProvider(BaseMetadataProvider):
                         direct_candidates,
                         conn=conn,
                         prepared_query=prepared_query,
+                        synonym_rows_by_id=synonym_rows_by_id,
                     )
                     if ranked_direct_candidates:
                         anime_data = ranked_direct_candidates[0]
-                        best_score = self._best_score_for_anime_id(
-                            conn,
-                            title,
-                            anime_data['id'],
-                            prepared_query=prepared_query,
+                        best_score = self._best_score_from_rows(
+                            prepared_query,
+                            synonym_rows_by_id.get(anime_data['id'], []),
                         )
 
             if anime_data is None:
@@ -854,7 +997,10 @@ class AnimeDataProvider(BaseMetadataProvider):
                     (fts_query,)
                 )
                 candidates = cursor.fetchall()  # Get all candidates for post-filtering
-                
+                if not candidates:
+                    # Typos and romanization variants miss every FTS prefix token
+                    candidates = self._get_trigram_candidates(conn, title)
+
                 # Post-filter candidates to prefer better matches
                 if candidates:
                     candidates = self._rank_candidates(
@@ -862,6 +1008,7 @@ class AnimeDataProvider(BaseMetadataProvider):
                         candidates,
                         conn=conn,
                         prepared_query=prepared_query,
+                        synonym_rows_by_id=synonym_rows_by_id,
                     )
                     
             # 3. The first candidate is the top scorer, much better results than fuzzer
@@ -869,12 +1016,10 @@ class AnimeDataProvider(BaseMetadataProvider):
                 top_candidate = candidates[0]
                 anime_data = top_candidate
                 if anime_data:
-                    best_score = self._best_score_for_anime_id(
-                        conn,
-                        title,
-                        anime_data['id'],
+                    best_score = self._best_score_from_rows(
+                        prepared_query,
+                        synonym_rows_by_id.get(anime_data['id'], []),
                         bm25_score=top_candidate['score'] if 'score' in top_candidate.keys() else None,
-                        prepared_query=prepared_query,
                     )
         finally:
             self._return_connection(conn)
@@ -884,12 +1029,6 @@ class AnimeDataProvider(BaseMetadataProvider):
                 info=title_info, score=best_score, provider_weight=self.provider_weight
             )
             self._search_cache[cache_key] = result
-            if len(self._search_cache) > 1000:
-                try:
-                    oldest = next(iter(self._search_cache))
-                    del self._search_cache[oldest]
-                except Exception:
-                    self._search_cache.clear()
             return result
 
     def _get_exact_candidates(self, conn: sqlite3.Connection, title: str) -> sqlite3.Cursor:
@@ -1000,103 +1139,144 @@ class AnimeDataProvider(BaseMetadataProvider):
             sources=sources
         )
 
-    def get_episode_info(self, parent_id: int, season: Optional[int], episode: int) -> Optional[EpisodeInfo]:
-        """Get episode information with season/episode calculation"""
-        self.load_database()
-        episode_key = f"{parent_id}_{season}_{episode}"
-        if episode_key in self._search_cache:
-            return self._search_cache[episode_key]
+    def _get_episode_table(self, parent_id: int) -> Optional[Tuple[Optional[int], List[Dict[str, Any]]]]:
+        """(year, seasons sharing the title's base title) for a title, or None if it does not exist.
+
+        Seasons are ordered by season number and year. The first lookup for a
+        title loads them in one query; later episode lookups are served from memory.
+        """
+        table = self._episode_table_cache.get(parent_id, _NO_EPISODE_TABLE)
+        if table is not _NO_EPISODE_TABLE:
+            return table
         conn = self._get_connection()
         try:
-            cursor = conn.execute(
-                "SELECT * FROM anime_title WHERE id = ?",
+            rows = conn.execute(
+                """
+                SELECT p.year AS parent_year,
+                       s.id, s.title, s.episodes, s.season_number, s.year, s.status
+                FROM anime_title p
+                LEFT JOIN anime_title s ON s.base_title = p.base_title
+                WHERE p.id = ?
+                ORDER BY s.season_number, s.year
+                """,
                 (parent_id,)
-            )
-            row = cursor.fetchone()
-            if row and episode is not None:
-                # Get the base title to find all seasons
-                base_title = row['base_title'] if 'base_title' in row.keys() else row['title']
-                
-                # Find all seasons of this anime ordered by season number
-                cursor = conn.execute(
-                    """
-                    SELECT id, title, episodes, season_number, year, status
-                    FROM anime_title 
-                    WHERE base_title = ?
-                    ORDER BY season_number, year
-                    """,
-                    (base_title,)
-                )
-                all_seasons = cursor.fetchall()
-                
-                calculated_season = season
-                calculated_episode = episode
-                
-                # If no explicit season provided, calculate from absolute episode number
-                if season is None and all_seasons:
-                    episode_counter = 0
-                    found = False
-                    
-                    for season_row in all_seasons:
-                        season_episodes = season_row['episodes'] or 12  # Default to 12 if unknown
-                        season_num = season_row['season_number']
-                        season_status = season_row['status']
-                        
-                        # For ongoing or upcoming series with low episode counts, be more lenient
-                        # and assume episodes belong to the current season
-                        if season_status in (AnimeStatus.ONGOING, AnimeStatus.UPCOMING) and season_episodes < 12:
-                            # For ongoing/upcoming series with less than 12 episodes registered,
-                            # assume this is the current season and accept higher episode numbers
-                            if episode <= episode_counter + 50:  # Reasonable limit for a single season
-                                calculated_season = season_num
-                                calculated_episode = episode - episode_counter
-                                found = True
-                                break
-                        elif episode <= episode_counter + season_episodes:
-                            # Episode falls within this season
-                            calculated_season = season_num
-                            calculated_episode = episode - episode_counter
-                            found = True
-                            break
-                        
-                        episode_counter += season_episodes
-                    
-                    # If episode number is beyond all known seasons, create new season
-                    if not found:
-                        # Get the last season number
-                        last_season = max(s['season_number'] for s in all_seasons) if all_seasons else 0
-                        remaining_episodes = episode - episode_counter
-                        
-                        if remaining_episodes > 0:
-                            # Start a new season
-                            calculated_season = last_season + 1
-                            calculated_episode = remaining_episodes
-                
-                episode_info = EpisodeInfo(
-                    title=f"Episode {calculated_episode}",
-                    season=calculated_season if calculated_season is not None else 1,
-                    episode=calculated_episode,
-                    parent_id=str(parent_id),
-                    year=row['year']
-                )
-                
-                self._search_cache[episode_key] = episode_info
-                return episode_info
+            ).fetchall()
         finally:
             self._return_connection(conn)
-        return None
+        table = None
+        if rows:
+            seasons = [
+                {key: row[key] for key in ('id', 'title', 'episodes', 'season_number', 'year', 'status')}
+                for row in rows
+                if row['id'] is not None
+            ]
+            table = (rows[0]['parent_year'], seasons)
+        self._episode_table_cache[parent_id] = table
+        return table
+
+    def get_episode_info(self, parent_id: int, season: Optional[int], episode: int) -> Optional[EpisodeInfo]:
+        """Get episode information with season/episode calculation"""
+        self.load_database()
+        if episode is None:
+            return None
+        table = self._get_episode_table(parent_id)
+        if table is None:
+            return None
+        year, all_seasons = table
+
+        calculated_season = season
+        calculated_episode = episode
+
+        # If no explicit season provided, calculate from absolute episode number
+        if season is None and all_seasons:
+            episode_counter = 0
+            found = False
+
+            for season_row in all_seasons:
+                season_episodes = season_row['episodes'] or 12  # Default to 12 if unknown
+                season_num = season_row['season_number']
+                season_status = season_row['status']
+
+                # For ongoing or upcoming series with low episode counts, be more lenient
+                # and assume episodes belong to the current season
+                if season_status in (AnimeStatus.ONGOING, AnimeStatus.UPCOMING) and season_episodes < 12:
+                    # For ongoing/upcoming series with less than 12 episodes registered,
+                    # assume this is the current season and accept higher episode numbers
+                    if episode <= episode_counter + 50:  # Reasonable limit for a single season
+                        calculated_season = season_num
+                        calculated_episode = episode - episode_counter
+                        found = True
+                        break
+                elif episode <= episode_counter + season_episodes:
+                    # Episode falls within this season
+                    calculated_season = season_num
+                    calculated_episode = episode - episode_counter
+                    found = True
+                    break
+
+                episode_counter += season_episodes
+
+            # If episode number is beyond all known seasons, create new season
+            if not found:
+                # Get the last season number
+                last_season = max(s['season_number'] for s in all_seasons) if all_seasons else 0
+                remaining_episodes = episode - episode_counter
+
+                if remaining_episodes > 0:
+                    # Start a new season
+                    calculated_season = last_season + 1
+                    calculated_episode = remaining_episodes
+
+        return EpisodeInfo(
+            title=f"Episode {calculated_episode}",
+            season=calculated_season if calculated_season is not None else 1,
+            episode=calculated_episode,
+            parent_id=str(parent_id),
+            year=year
+        )
 
-    def _rank_candidates(self, query_title: str, candidates: list, conn=None, prepared_query=None) -> list:
+    def _rank_candidates(self, query_title: str, candidates: list, conn=None, prepared_query=None, synonym_rows_by_id=None) -> list:
         """
         Re-rank candidates based on title similarity to prefer better matches.
         Prioritizes:
         1. Exact matches
         2. Longer title matches (more words in common)
         3. Higher proportion of query words present
+
+        With a connection, every title and synonym of the candidate anime is
+        scored; those rows are fetched in one batched query and returned rows
+        come from anime_synonym_view. Fetched rows are added to
+        ``synonym_rows_by_id`` when a dict is passed in.
         """
         if not candidates:
             return candidates
 
+        resolved_prepared_query = prepared_query or self._prepare_similarity_query(query_title)
+        if conn is not None:
+            # Keep the most favourable bm25 per anime; the score only grows with the bm25 bonus
+            bm25_by_id = {}
+            for candidate in candidates:
+                candidate_id = self._row_or_dict_value(candidate, 'id')
+                if candidate_id is None:
+                    continue
+                bm25_score = candidate['score'] if 'score' in candidate.keys() else None
+                if candidate_id not in bm25_by_id or self._bm25_bonus(bm25_score) > self._bm25_bonus(bm25_by_id[candidate_id]):
+                    bm25_by_id[candidate_id] = bm25_score
+
+            rows_by_id = self._fetch_synonym_rows(conn, list(bm25_by_id))
+            if synonym_rows_by_id is not None:
+                synonym_rows_by_id.update(rows_by_id)
+
+            scored_rows = []
+            for candidate_id, bm25_score in bm25_by_id.items():
+                rows = rows_by_id.get(candidate_id)
+                if not rows:
+                    continue
+                combined_score = self._best_score_from_rows(resolved_prepared_query, rows, bm25_score=bm25_score)
+                scored_rows.append((combined_score, rows[0]))
+            scored_rows.sort(key=lambda x: x[0], reverse=True)
+            return [row for _score, row in scored_rows]
+
         scored_candidates = []
         best_candidate_by_id = {}
         best_score_by_id = {}
@@ -1105,22 +1285,12 @@ class AnimeDataProvider(BaseMetadataProvider):
             if candidate_id is None:
                 continue
             bm25_score = candidate['score'] if 'score' in candidate.keys() else None
-            if conn is not None:
-                combined_score = self._best_score_for_anime_id(
-                    conn,
-                    query_title,
-                    candidate_id,
-                    bm25_score=bm25_score,
-                    prepared_query=prepared_query,
-                )
-            else:
-                resolved_prepared_query = prepared_query or self._prepare_similarity_query(query_title)
-                combined_score = self._score_title_match_prepared(
-                    resolved_prepared_query,
-                    candidate['title'] if 'title' in candidate else '',
-                    bm25_score=bm25_score,
-                    candidate_year=self._row_or_dict_value(candidate, 'year'),
-                )
+            combined_score = self._score_title_match_prepared(
+                resolved_prepared_query,
+                candidate['title'] if 'title' in candidate else '',
+                bm25_score=bm25_score,
+                candidate_year=self._row_or_dict_value(candidate, 'year'),
+            )
             if candidate_id not in best_score_by_id or combined_score > best_score_by_id[candidate_id]:
                 best_score_by_id[candidate_id] = combined_score
                 best_candidate_by_id[candidate_id] = candidate
@@ -1130,18 +1300,27 @@ class AnimeDataProvider(BaseMetadataProvider):
         
         # Sort by combined score (descending) and return candidates only
         scored_candidates.sort(key=lambda x: x[0], reverse=True)
-        if conn is not None:
-            ranked_rows = []
-            for _score, candidate in scored_candidates:
-                row = conn.execute(
-                    "SELECT * FROM anime_synonym_view WHERE id = ? ORDER BY year DESC LIMIT 1",
-                    (candidate['id'],),
-                ).fetchone()
-                if row is not None:
-                    ranked_rows.append(row)
-            return ranked_rows
         return [candidate for score, candidate in scored_candidates]
 
+    def _fetch_synonym_rows(self, conn, anime_ids: list) -> dict:
+        """Fetch anime_synonym_view rows for many anime ids with batched IN queries.
+
+        Each id's rows come newest year first, so ``rows[0]`` is its representative row.
+        """
+        rows_by_id = {}
+        unique_ids = list(dict.fromkeys(anime_ids))
+        for start in range(0, len(unique_ids), self.SYNONYM_FETCH_BATCH_SIZE):
+            batch = unique_ids[start:start + self.SYNONYM_FETCH_BATCH_SIZE]
+            placeholders = ','.join('?' for _ in batch)
+            # Newest row first per id, as the old per-id "ORDER BY year DESC LIMIT 1" picked
+            cursor = conn.execute(
+                f"SELECT * FROM anime_synonym_view WHERE id IN ({placeholders}) ORDER BY id, year DESC",
+                tuple(batch),
+            )
+            for row in cursor:
+                rows_by_id.setdefault(row['id'], []).append(row)
+        return rows_by_id
+
     def _best_score_for_anime_id(
         self,
         conn,
@@ -1150,13 +1329,14 @@ class AnimeDataProvider(BaseMetadataProvider):
         bm25_score: Optional[float] = None,
         prepared_query=None,
     ) -> float:
-        rows = conn.execute(
-            "SELECT * FROM anime_synonym_view WHERE id = ?",
-            (anime_id,),
-        ).fetchall()
+        rows = self._fetch_synonym_rows(conn, [anime_id]).get(anime_id, [])
+        resolved_prepared_query = prepared_query or self._prepare_similarity_query(query_title)
+        return self._best_score_from_rows(resolved_prepared_query, rows, bm25_score=bm25_score)
+
+    def _best_score_from_rows(self, prepared_query, rows: list, bm25_score: Optional[float] = None) -> float:
+        """Best match score over the main titles and synonyms in anime_synonym_view rows."""
         best_score = 0.0
         seen_titles = set()
-        resolved_prepared_query = prepared_query or self._prepare_similarity_query(query_title)
         for row in rows:
             candidate_year = self._row_or_dict_value(row, 'year')
             for candidate_text in (self._row_or_dict_value(row, 'title'), self._row_or_dict_value(row, 'synonym')):
@@ -1164,7 +1344,7 @@ class AnimeDataProvider(BaseMetadataProvider):
                     continue
                 seen_titles.add(candidate_text)
                 score = self._score_title_match_prepared(
-                    resolved_prepared_query,
+                    prepared_query,
                     candidate_text,
                     bm25_score=bm25_score,
                     candidate_year=candidate_year,
@@ -1231,8 +1411,7 @@ class AnimeDataProvider(BaseMetadataProvider):
         coverage = (len(query_words & candidate_words) / len(query_words)) if query_words else 0.0
         quality = min(1.0, (ratio * 0.7) + (coverage * 0.3))
 
-        if bm25_score is not None:
-            quality = min(1.0, quality + min(0.05, max(0.0, -float(bm25_score)) / 100.0))
+        quality = min(1.0, quality + self._bm25_bonus(bm25_score))
 
         is_prefix_match = (
             candidate_normalized.startswith(query_normalized)
@@ -1264,6 +1443,13 @@ class AnimeDataProvider(BaseMetadataProvider):
 
         return min(base_score + year_bonus, max_score)
 
+    @staticmethod
+    def _bm25_bonus(bm25_score: Optional[float]) -> float:
+        """Small quality bonus for strong FTS hits (bm25 is negative, lower is better)."""
+        if bm25_score is None:
+            return 0.0
+        return min(0.05, max(0.0, -float(bm25_score)) / 100.0)
+
     def _similarity_ratio(self, left: str, right: str) -> float:
         if rapidfuzz_fuzz is not None:
             return rapidfuzz_fuzz.ratio(left, right) / 100.0
@@ -1320,6 +1506,7 @@ class AnimeDataProvider(BaseMetadataProvider):
         previous_duration = self.cache_duration
         self.set_cache_expiry(0)
         self._search_cache.clear()
+        self._episode_table_cache.clear()
         self.load_database()
 
         # Restore configured TTL so refreshed data does not remain immediately expired.
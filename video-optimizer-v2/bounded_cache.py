@@ -0,0 +1,125 @@
+"""Thread-safe bounded LRU cache shared by the metadata providers and MetadataManager.
+
+Every cache keeps hit/miss/eviction/expiration counters; ``cache_stats()``
+returns them for all live caches so long-running services can export them.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+_MISSING = object()
+
+# Live caches, for cache_stats(); weak so dropped providers/managers are not kept alive
+_registry: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+class LRUCache:
+    """Least-recently-used cache with a fixed capacity and optional per-entry TTL (seconds).
+
+    Supports the dict operations the providers use (``get``, ``[]``, ``in``,
+    ``len``, ``pop``, ``clear``). ``None`` is a valid cached value; use
+    ``get(key, default)`` with a sentinel default to tell it apart from a miss.
+    """
+
+    def __init__(self, capacity: int = 1024, ttl: Optional[float] = None, name: str = "cache"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _registry.add(self)
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return the live value or _MISSING; expired entries are dropped. Caller holds the lock."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Insert or refresh ``key``; ``ttl`` overrides the cache default for this entry."""
+        effective_ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + effective_ttl if effective_ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    __setitem__ = put
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Membership tests do not count as hits or misses
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "capacity": self.capacity,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+    def __repr__(self) -> str:
+        return f"LRUCache(name={self.name!r}, size={len(self)}, capacity={self.capacity}, ttl={self.ttl})"
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters for every live LRUCache, sorted by name."""
+    return sorted((cache.stats() for cache in list(_registry)), key=lambda entry: entry["name"])
@@ -2,11 +2,15 @@ import gzip
 import inspect
 import logging
 import math
+import multiprocessing
 import os
+import queue
 import re
 import sqlite3
 import time
-from email.utils import parsedate_to_datetime
+import traceback
+from contextlib import contextmanager
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
@@ -15,13 +19,57 @@ import requests
 from rapidfuzz import fuzz, process
 from tqdm import tqdm
 
+try:
+    # process.cdist returns numpy arrays; without numpy scoring falls back to process.extract
+    import numpy
+except ImportError:
+    numpy = None
+
+from bounded_cache import LRUCache
 from metadata_provider import BaseMetadataProvider, EpisodeInfo, MatchResult, TitleInfo
+from trigram_index import TrigramIndex
+import sql_profiler
 
 
-CacheValue = Union[MatchResult, EpisodeInfo, List[EpisodeInfo]]
 RowLike = Union[sqlite3.Row, Dict[str, Any]]
 
 
+class _EpisodeTable:
+    """Every episode of one series, loaded in one query, with pre-normalized search titles."""
+
+    __slots__ = ("episodes", "by_number", "search_rows")
+
+    def __init__(self) -> None:
+        # Ordered by season, episode, id
+        self.episodes: List[EpisodeInfo] = []
+        # (season, episode) -> first episode with that number
+        self.by_number: Dict[Tuple[Optional[int], Optional[int]], EpisodeInfo] = {}
+        # (search_title_lower, normalized search_title, is_primary, episode)
+        self.search_rows: List[Tuple[str, str, bool, EpisodeInfo]] = []
+
+
+def _parse_dataset_worker(
+    provider_class: type,
+    settings: Dict[str, Any],
+    dataset_name: str,
+    dataset_path: str,
+    batch_size: int,
+    result_queue: Any,
+) -> None:
+    """Worker process entry point: parse one dataset and put compact row batches on result_queue."""
+    started_at = time.perf_counter()
+    try:
+        # Only the parsing/filtering helpers are needed, so skip __init__ (no database or connections)
+        parser = provider_class.__new__(provider_class)
+        for name, value in settings.items():
+            setattr(parser, name, value)
+        for kind, rows in parser._iter_dataset_batches(dataset_name, dataset_path, batch_size):
+            result_queue.put(("rows", kind, rows))
+        result_queue.put(("done", dataset_name, time.perf_counter() - started_at))
+    except Exception:
+        result_queue.put(("error", dataset_name, traceback.format_exc()))
+
+
 class IMDbDataProvider(BaseMetadataProvider):
     DATASETS = {
         "title.basics": "https://datasets.imdbws.com/title.basics.tsv.gz",
@@ -59,7 +107,14 @@ class IMDbDataProvider(BaseMetadataProvider):
     FTS_LIMIT_WITH_YEAR = 200
     FTS_LIMIT_WITHOUT_YEAR = 300
     FUZZY_MATCH_LIMIT = 200
+    # Bulk fuzzy scoring: queries sharing one cdist matrix are capped by matrix size,
+    # and matrices this large or larger are scored with FUZZY_SCORE_WORKERS threads
+    FUZZY_MATRIX_MAX_CELLS = 200000
+    FUZZY_PARALLEL_MIN_CELLS = 20000
+    FUZZY_SCORE_WORKERS = -1
     MAX_CANDIDATES = 1000
+    # Titles taken from the trigram index when the all-words FTS query finds nothing
+    TRIGRAM_CANDIDATE_LIMIT = 100
     EPISODE_FUZZY_LIMIT = 750
 
     YEAR_EXACT_BONUS = 40
@@ -70,6 +125,10 @@ class IMDbDataProvider(BaseMetadataProvider):
     YEAR_RECENCY_DECAY_YEARS = 10
     EXACT_PRIMARY_MATCH_SCORE = 1000.0
     EXACT_ALIAS_MATCH_SCORE = 950.0
+    # Bonuses are capped at the base score, so an exact primary-title match is the ceiling
+    MAX_MATCH_SCORE = EXACT_PRIMARY_MATCH_SCORE
+    # Fuzzy and prefix matching over millions of titles costs more than the anime lookups
+    LOOKUP_COST = 3.0
     PREFIX_SCORE_BASE = 700.0
     PREFIX_SCORE_RANGE = 140.0
     PREFIX_SCORE_CAP = 899.0
@@ -78,13 +137,52 @@ class IMDbDataProvider(BaseMetadataProvider):
     FUZZY_SCORE_CAP = 749.0
 
     SEARCH_CACHE_MAX = 1000
-    SEARCH_CACHE_EVICT = 500
     TITLE_CACHE_MAX = 5000
-    TITLE_CACHE_EVICT = 1000
+    # Series whose full episode list is kept in memory
+    EPISODE_TABLE_CACHE_MAX = 256
+    # Seconds; None keeps entries until evicted or the data is reloaded
+    SEARCH_CACHE_TTL = None
     EXACT_MATCH_LIMIT = 50
     PREFIX_MATCH_LIMIT = 100
     SQL_TIMING_ENABLED = False
 
+    # Parallel rebuild: number of worker processes parsing datasets (0 or 1 = serial, in-process)
+    REBUILD_WORKERS = 0
+    REBUILD_BATCH_SIZE = 50000
+    REBUILD_QUEUE_MAX_BATCHES = 16
+    # Attributes copied into worker processes; they drive the parse-time filters
+    REBUILD_WORKER_SETTINGS = (
+        "REQUIRED_COLUMNS",
+        "MIN_VOTES_THRESHOLD",
+        "RECENT_YEAR_CUTOFF",
+        "FILTER_ADULT_CONTENT",
+        "ALLOWED_TITLE_TYPES",
+        "FILTER_AKA_LANGUAGES",
+        "AKA_ALLOWED_LANGUAGES",
+        "TITLE_TYPE_CODES",
+    )
+    # Largest datasets first so the longest parse starts as early as possible
+    REBUILD_DATASET_ORDER = ("title.akas", "title.basics", "title.episode", "title.ratings")
+    # Apply row diffs to the existing tables when data expires instead of wiping them
+    INCREMENTAL_REFRESH = True
+    # (table, key columns) pairs diffed by the incremental refresh
+    INCREMENTAL_DIFF_TABLES = (
+        ("title_core", ("id",)),
+        ("episode_core", ("id",)),
+        ("title_search", ("title_id", "search_title")),
+        ("episode_search", ("episode_id", "search_title")),
+    )
+    REBUILD_STAGING_INSERTS = {
+        "ratings": "INSERT OR REPLACE INTO temp_ratings (id, rating, votes) VALUES (?, ?, ?)",
+        "title_basics": (
+            "INSERT OR REPLACE INTO temp_title_basics "
+            "(id, title, original_title, type, year, end_year, runtime_minutes, genres) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        ),
+        "episode_basics": "INSERT OR REPLACE INTO temp_episode_basics (id, title, title_lower, year, runtime_minutes) VALUES (?, ?, ?, ?, ?)",
+        "episode_links": "INSERT OR REPLACE INTO temp_episode_links (id, parent_id, season, episode) VALUES (?, ?, ?, ?)",
+        "aka": "INSERT OR IGNORE INTO temp_aka_staging (title_id, title, title_lower) VALUES (?, ?, ?)",
+    }
+
     TITLE_TYPE_CODES = {
         "movie": 1,
         "tvSeries": 2,
@@ -103,14 +201,18 @@ class IMDbDataProvider(BaseMetadataProvider):
 
     def __init__(self):
         super().__init__("imdb", provider_weight=0.9)
-        self._search_cache: Dict[str, CacheValue] = {}
-        self._title_cache: Dict[int, TitleInfo] = {}
+        self._search_cache = LRUCache(self.SEARCH_CACHE_MAX, ttl=self.SEARCH_CACHE_TTL, name="imdb.search")
+        self._title_cache = LRUCache(self.TITLE_CACHE_MAX, name="imdb.title")
+        self._episode_table_cache = LRUCache(self.EPISODE_TABLE_CACHE_MAX, name="imdb.episode_tables")
+        # Typo-tolerant candidate lookup over title_search, built with the FTS index
+        self._trigram_index = TrigramIndex("title_trigram")
         self._db_path = os.path.join(self.cache_dir, "imdb_data.db")
         self.CACHE_EXPIRY_DATASETS = list(self.DATASETS.keys())
-        self._connection_pool: List[sqlite3.Connection] = []
-        self._pool_size = 3
+        self._init_connection_pool()
         self._db_loaded_once = False
         self._db_loaded_until_ts: Optional[int] = None
+        # Seconds per stage of the most recent rebuild, in execution order
+        self.rebuild_timings: Dict[str, float] = {}
         self._init_database()
         self._load_cache_duration()
 
@@ -126,36 +228,11 @@ class IMDbDataProvider(BaseMetadataProvider):
         except Exception:
             self._db_loaded_until_ts = resolved_now_ts + int(self.cache_duration.total_seconds())
 
-    def _get_connection(self) -> sqlite3.Connection:
-        if self._connection_pool:
-            return self._connection_pool.pop()
-
-        conn = sqlite3.connect(self._db_path, timeout=30.0)
-        conn.execute("PRAGMA query_only=ON")
-        conn.execute("PRAGMA cache_size=50000")
-        conn.execute("PRAGMA temp_store=MEMORY")
-        conn.execute("PRAGMA mmap_size=268435456")
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def _return_connection(self, conn: sqlite3.Connection) -> None:
-        if len(self._connection_pool) < self._pool_size:
-            self._connection_pool.append(conn)
-        else:
-            conn.close()
-
-    def _close_connection_pool(self) -> None:
-        while self._connection_pool:
-            conn = self._connection_pool.pop()
-            try:
-                conn.close()
-            except Exception:
-                pass
-
     def _reset_database_for_reload(self) -> None:
         self._close_connection_pool()
         self._search_cache.clear()
         self._title_cache.clear()
+        self._episode_table_cache.clear()
         self._clear_loaded_state()
 
         for suffix in ("", "-wal", "-shm"):
@@ -169,8 +246,8 @@ class IMDbDataProvider(BaseMetadataProvider):
 
         self._init_database()
 
-    def _init_database(self) -> None:
-        with sqlite3.connect(self._db_path, timeout=30.0) as conn:
+    def _init_database(self, db_path: Optional[str] = None) -> None:
+        with sql_profiler.connect(db_path or self._db_path, timeout=30.0) as conn:
             conn.execute("PRAGMA busy_timeout=30000")
             conn.execute("PRAGMA synchronous=NORMAL")
             conn.execute("PRAGMA cache_size=10000")
@@ -235,6 +312,7 @@ class IMDbDataProvider(BaseMetadataProvider):
                 );
                 """
             )
+            self._trigram_index.create_tables(conn)
             conn.commit()
 
     def _load_cache_duration(self) -> None:
@@ -352,13 +430,19 @@ class IMDbDataProvider(BaseMetadataProvider):
             self._return_connection(conn)
 
     def _verify_data_integrity(self) -> None:
-        with sqlite3.connect(self._db_path) as conn:
+        with sql_profiler.connect(self._db_path) as conn:
             logging.info("title_core=%s", conn.execute("SELECT COUNT(*) FROM title_core").fetchone()[0])
             logging.info("title_search=%s", conn.execute("SELECT COUNT(*) FROM title_search").fetchone()[0])
             logging.info("episode_core=%s", conn.execute("SELECT COUNT(*) FROM episode_core").fetchone()[0])
             logging.info("episode_search=%s", conn.execute("SELECT COUNT(*) FROM episode_search").fetchone()[0])
 
-    def _ensure_data_loaded(self) -> None:
+    def _ensure_data_loaded(self, allow_incremental: Optional[bool] = None) -> None:
+        if self._loaded_in_process():
+            return
+        with self._load_lock:
+            self._load_data_if_needed(allow_incremental)
+
+    def _load_data_if_needed(self, allow_incremental: Optional[bool] = None) -> None:
         now_ts = int(time.time())
         if getattr(self, "_db_loaded_once", False):
             loaded_until_ts = getattr(self, "_db_loaded_until_ts", None)
@@ -372,24 +456,242 @@ class IMDbDataProvider(BaseMetadataProvider):
             and self._has_episode_title_data()
             and self._has_episode_runtime_support()
         ):
+            self._ensure_trigram_index()
+            self._mark_database_loaded(now_ts)
+            return
+
+        if allow_incremental is None:
+            allow_incremental = self.INCREMENTAL_REFRESH
+        if (
+            allow_incremental
+            and self._has_title_search_data()
+            and self._has_episode_title_data()
+            and self._has_episode_runtime_support()
+        ):
+            self._refresh_incrementally()
             self._mark_database_loaded(now_ts)
             return
 
         self._reset_database_for_reload()
+        self.rebuild_timings = {}
+        rebuild_started_at = time.perf_counter()
 
         dataset_paths: Dict[str, str] = {}
         source_timestamps: Dict[str, int] = {}
         for dataset_name in self.DATASETS:
-            dataset_path, source_ts = self._ensure_dataset_cache_file(dataset_name)
+            with self._timed_stage(f"download {dataset_name}"):
+                dataset_path, source_ts = self._ensure_dataset_cache_file(dataset_name)
             dataset_paths[dataset_name] = dataset_path
             source_timestamps[dataset_name] = source_ts
 
         self._rebuild_read_optimized_tables(dataset_paths, source_timestamps)
-        self._verify_data_integrity()
-        self._optimize_database_for_reads()
+        with self._timed_stage("verify"):
+            self._verify_data_integrity()
+        with self._timed_stage("optimize for reads"):
+            self._optimize_database_for_reads()
+        self.rebuild_timings["total"] = time.perf_counter() - rebuild_started_at
+        self._print_rebuild_timings()
         self._mark_database_loaded(now_ts)
 
+    def _get_dataset_versions(self) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        """Return dataset -> (last_modified, updated) from data_version."""
+        try:
+            with sql_profiler.connect(self._db_path, timeout=30.0) as conn:
+                rows = conn.execute("SELECT dataset, last_modified, updated FROM data_version").fetchall()
+        except sqlite3.Error:
+            return {}
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def _refresh_incrementally(self) -> None:
+        """
+        Bring existing tables up to date by applying row diffs.
+
+        Datasets are revalidated with conditional GETs. When none changed, only
+        the expiry is extended. Otherwise the read-optimized tables are rebuilt
+        into a side snapshot database (every derived table joins several
+        datasets, so all of them are parsed from the local cache), and only
+        rows that differ from the snapshot are upserted or deleted in the live
+        tables and the FTS index. Readers keep working throughout.
+        """
+        self.rebuild_timings = {}
+        refresh_started_at = time.perf_counter()
+        versions = self._get_dataset_versions()
+
+        dataset_paths: Dict[str, str] = {}
+        source_timestamps: Dict[str, int] = {}
+        changed_datasets: List[str] = []
+        for dataset_name in self.DATASETS:
+            last_modified, updated = versions.get(dataset_name, (None, None))
+            gz_cache = os.path.join(self.cache_dir, f"{dataset_name}.tsv.gz")
+            # A cached file newer than the last build was never applied to the tables
+            cached_file_is_newer = (
+                updated is None
+                or not os.path.exists(gz_cache)
+                or int(os.path.getmtime(gz_cache)) > int(updated)
+            )
+            with self._timed_stage(f"download {dataset_name}"):
+                dataset_path, source_ts, downloaded = self._fetch_dataset(dataset_name, since_ts=last_modified)
+            dataset_paths[dataset_name] = dataset_path
+            source_timestamps[dataset_name] = source_ts
+            if downloaded or cached_file_is_newer:
+                changed_datasets.append(dataset_name)
+
+        if not changed_datasets:
+            with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
+                for dataset_name, source_ts in source_timestamps.items():
+                    self._upsert_dataset_version(conn, dataset_name, source_ts)
+                conn.commit()
+            logging.info("IMDb datasets unchanged; extended cache expiry without rebuilding")
+            return
+
+        logging.info("IMDb datasets changed: %s", ", ".join(changed_datasets))
+        snapshot_path = f"{os.path.splitext(self._db_path)[0]}.next.db"
+        self._remove_database_files(snapshot_path)
+        try:
+            self._init_database(snapshot_path)
+            self._rebuild_read_optimized_tables(dataset_paths, source_timestamps, db_path=snapshot_path)
+            with self._timed_stage("apply row diffs"):
+                diff_counts = self._apply_snapshot_diff(snapshot_path, source_timestamps)
+        finally:
+            self._remove_database_files(snapshot_path)
+
+        self._search_cache.clear()
+        self._title_cache.clear()
+        self._episode_table_cache.clear()
+        self.rebuild_timings["total"] = time.perf_counter() - refresh_started_at
+        self._print_rebuild_timings()
+        print("IMDb incremental refresh row changes:")
+        for table, (upserted, deleted) in diff_counts.items():
+            print(f"  {table:<36} +{upserted} / -{deleted}")
+
+    @staticmethod
+    def _remove_database_files(db_path: str) -> None:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.remove(f"{db_path}{suffix}")
+            except FileNotFoundError:
+                continue
+
+    def _apply_snapshot_diff(self, snapshot_path: str, source_timestamps: Dict[str, int]) -> Dict[str, Tuple[int, int]]:
+        """Upsert/delete the rows that differ between the snapshot and the live tables; returns table -> (upserted, deleted)."""
+        diff_counts: Dict[str, Tuple[int, int]] = {}
+        with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
+            self._timed_execute(conn, "ATTACH DATABASE ? AS next", (snapshot_path,))
+            try:
+                # FTS rows are keyed by title_id only, so collect the titles whose search rows change
+                conn.executescript(
+                    """
+                    DROP TABLE IF EXISTS temp.changed_search_title_ids;
+                    CREATE TEMP TABLE changed_search_title_ids (title_id INTEGER PRIMARY KEY) WITHOUT ROWID;
+                    INSERT OR IGNORE INTO changed_search_title_ids
+                    SELECT title_id FROM (
+                        SELECT title_id, search_title, search_title_lower, is_primary FROM main.title_search
+                        EXCEPT
+                        SELECT title_id, search_title, search_title_lower, is_primary FROM next.title_search
+                    )
+                    UNION
+                    SELECT title_id FROM (
+                        SELECT title_id, search_title, search_title_lower, is_primary FROM next.title_search
+                        EXCEPT
+                        SELECT title_id, search_title, search_title_lower, is_primary FROM main.title_search
+                    );
+                    """
+                )
+
+                for table, key_columns in self.INCREMENTAL_DIFF_TABLES:
+                    columns = ", ".join(str(row[1]) for row in conn.execute(f"PRAGMA next.table_info({table})").fetchall())
+                    keys = ", ".join(key_columns)
+                    deleted = self._timed_execute(
+                        conn,
+                        f"""
+                        DELETE FROM main.{table} WHERE ({keys}) IN (
+                            SELECT {keys} FROM main.{table}
+                            EXCEPT
+                            SELECT {keys} FROM next.{table}
+                        )
+                        """,
+                    ).rowcount
+                    upserted = self._timed_execute(
+                        conn,
+                        f"""
+                        INSERT OR REPLACE INTO main.{table} ({columns})
+                        SELECT {columns} FROM next.{table}
+                        EXCEPT
+                        SELECT {columns} FROM main.{table}
+                        """,
+                    ).rowcount
+                    diff_counts[table] = (upserted, deleted)
+
+                fts_deleted = self._timed_execute(
+                    conn,
+                    "DELETE FROM title_fts WHERE title_id IN (SELECT title_id FROM changed_search_title_ids)",
+                ).rowcount
+                fts_inserted = self._timed_execute(
+                    conn,
+                    """
+                    INSERT INTO title_fts (title, title_id)
+                    SELECT search_title, title_id FROM main.title_search
+                    WHERE title_id IN (SELECT title_id FROM changed_search_title_ids)
+                    """,
+                ).rowcount
+                diff_counts["title_fts"] = (fts_inserted, fts_deleted)
+
+                changed_title_ids = [row[0] for row in conn.execute("SELECT title_id FROM changed_search_title_ids")]
+                trigram_deleted = self._trigram_index.remove(conn, changed_title_ids)
+                trigram_inserted = self._trigram_index.add(
+                    conn,
+                    conn.execute(
+                        """
+                        SELECT title_id, search_title FROM main.title_search
+                        WHERE title_id IN (SELECT title_id FROM changed_search_title_ids)
+                        """
+                    ).fetchall(),
+                )
+                diff_counts[self._trigram_index.name] = (trigram_inserted, trigram_deleted)
+
+                for dataset_name, source_ts in source_timestamps.items():
+                    self._upsert_dataset_version(conn, dataset_name, source_ts)
+                self._timed_execute(conn, "DROP TABLE IF EXISTS temp.changed_search_title_ids")
+                conn.commit()
+            finally:
+                self._timed_execute(conn, "DETACH DATABASE next")
+            self._timed_execute(conn, "PRAGMA optimize")
+        return diff_counts
+
+    @contextmanager
+    def _timed_stage(self, stage: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.rebuild_timings[stage] = self.rebuild_timings.get(stage, 0.0) + time.perf_counter() - started_at
+
+    def _print_rebuild_timings(self) -> None:
+        print("IMDb rebuild timings:")
+        for stage, seconds in self.rebuild_timings.items():
+            print(f"  {stage:<36} {seconds:9.2f} s")
+
+    def _get_rebuild_workers(self) -> int:
+        env_value = os.environ.get("IMDB_REBUILD_WORKERS")
+        if env_value:
+            try:
+                return max(0, int(env_value))
+            except ValueError:
+                logging.warning("Ignoring invalid IMDB_REBUILD_WORKERS=%r", env_value)
+        return max(0, int(self.REBUILD_WORKERS or 0))
+
     def _ensure_dataset_cache_file(self, dataset_name: str) -> Tuple[str, int]:
+        dataset_path, source_ts, _downloaded = self._fetch_dataset(dataset_name)
+        return dataset_path, source_ts
+
+    def _fetch_dataset(self, dataset_name: str, since_ts: Optional[int] = None) -> Tuple[str, int, bool]:
+        """
+        Make sure a dataset is cached locally; returns (path, source timestamp, downloaded).
+
+        A stale cached file is revalidated with If-Modified-Since (``since_ts``,
+        else the file mtime) and only downloaded again when the server has a
+        newer copy.
+        """
         url = self.DATASETS[dataset_name]
         gz_cache = os.path.join(self.cache_dir, f"{dataset_name}.tsv.gz")
         source_last_modified_ts: Optional[int] = None
@@ -401,43 +703,62 @@ class IMDbDataProvider(BaseMetadataProvider):
             if age_days < self.cache_duration.days:
                 need_download = False
 
-        if need_download:
-            for attempt in range(self.MAX_RETRIES):
-                try:
-                    response = requests.get(url, stream=True)
-                    response.raise_for_status()
-                    total_size = int(response.headers.get("content-length", 0))
-                    lm_header = response.headers.get("last-modified")
-                    if lm_header:
-                        try:
-                            source_last_modified_ts = int(parsedate_to_datetime(lm_header).timestamp())
-                        except Exception:
-                            source_last_modified_ts = None
-
-                    with tqdm(total=total_size, desc=f"Downloading {dataset_name}", unit="B", unit_scale=True) as pbar:
-                        with open(gz_cache, "wb") as handle:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                if chunk:
-                                    handle.write(chunk)
-                                    pbar.update(len(chunk))
-                    break
-                except Exception as exc:
-                    logging.error("Error downloading %s (attempt %s): %s", dataset_name, attempt + 1, exc)
-                    if attempt == self.MAX_RETRIES - 1:
-                        raise
-        else:
-            source_last_modified_ts = int(os.path.getmtime(gz_cache))
+        if not need_download:
+            return gz_cache, int(os.path.getmtime(gz_cache)), False
+
+        headers: Dict[str, str] = {}
+        known_ts: Optional[int] = None
+        if os.path.exists(gz_cache):
+            known_ts = int(since_ts or os.path.getmtime(gz_cache))
+            headers["If-Modified-Since"] = formatdate(known_ts, usegmt=True)
 
-        return gz_cache, source_last_modified_ts or int(time.time())
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                response = requests.get(url, stream=True, headers=headers)
+                if response.status_code == 304 and known_ts is not None:
+                    response.close()
+                    # Restart the local age check so the file is not revalidated on every lookup
+                    os.utime(gz_cache, None)
+                    logging.info("%s not modified since %s", dataset_name, headers["If-Modified-Since"])
+                    return gz_cache, known_ts, False
+                response.raise_for_status()
+                total_size = int(response.headers.get("content-length", 0))
+                lm_header = response.headers.get("last-modified")
+                if lm_header:
+                    try:
+                        source_last_modified_ts = int(parsedate_to_datetime(lm_header).timestamp())
+                    except Exception:
+                        source_last_modified_ts = None
+
+                with tqdm(total=total_size, desc=f"Downloading {dataset_name}", unit="B", unit_scale=True) as pbar:
+                    with open(gz_cache, "wb") as handle:
+                        for chunk in response.iter_content(chunk_size=8192):
+                            if chunk:
+                                handle.write(chunk)
+                                pbar.update(len(chunk))
+                break
+            except Exception as exc:
+                logging.error("Error downloading %s (attempt %s): %s", dataset_name, attempt + 1, exc)
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+
+        return gz_cache, source_last_modified_ts or int(time.time()), True
 
     def _rebuild_read_optimized_tables(
         self,
         dataset_paths: Dict[str, str],
         source_timestamps: Dict[str, int],
+        db_path: Optional[str] = None,
     ) -> None:
-        ratings_by_id, qualifying_title_ids = self._load_ratings_map(dataset_paths["title.ratings"])
+        workers = self._get_rebuild_workers()
+        if workers > 1:
+            self._rebuild_read_optimized_tables_parallel(dataset_paths, source_timestamps, workers, db_path=db_path)
+            return
 
-        with sqlite3.connect(self._db_path, timeout=60.0) as conn:
+        with self._timed_stage("parse title.ratings"):
+            ratings_by_id, qualifying_title_ids = self._load_ratings_map(dataset_paths["title.ratings"])
+
+        with sql_profiler.connect(db_path or self._db_path, timeout=60.0) as conn:
             self._timed_execute(conn, "PRAGMA synchronous=OFF")
             self._timed_execute(conn, "PRAGMA temp_store=MEMORY")
             self._timed_execute(conn, "PRAGMA cache_size=100000")
@@ -476,28 +797,310 @@ class IMDbDataProvider(BaseMetadataProvider):
                 """
             )
 
-            surviving_parent_ids = self._load_title_basics_into_final_tables(
-                conn,
-                dataset_paths["title.basics"],
-                ratings_by_id,
-                qualifying_title_ids,
+            with self._timed_stage("parse+write title.basics"):
+                surviving_parent_ids = self._load_title_basics_into_final_tables(
+                    conn,
+                    dataset_paths["title.basics"],
+                    ratings_by_id,
+                    qualifying_title_ids,
+                )
+            with self._timed_stage("parse+write title.episode"):
+                self._load_episode_links_into_temp(conn, dataset_paths["title.episode"], surviving_parent_ids)
+            with self._timed_stage("materialize episode_core"):
+                self._materialize_episode_core(conn)
+            with self._timed_stage("primary search tables"):
+                self._populate_primary_search_tables(conn)
+            with self._timed_stage("parse+write title.akas"):
+                self._load_aka_search_rows(conn, dataset_paths["title.akas"])
+
+            with self._timed_stage("commit"):
+                for dataset_name, source_ts in source_timestamps.items():
+                    self._upsert_dataset_version(conn, dataset_name, source_ts)
+
+                conn.executescript(
+                    """
+                    DROP TABLE IF EXISTS temp_aka_staging;
+                    DROP TABLE IF EXISTS temp_episode_links;
+                    DROP TABLE IF EXISTS temp_episode_basics;
+                    """
+                )
+                conn.commit()
+
+    def _rebuild_read_optimized_tables_parallel(
+        self,
+        dataset_paths: Dict[str, str],
+        source_timestamps: Dict[str, int],
+        workers: int,
+        db_path: Optional[str] = None,
+    ) -> None:
+        """
+        Rebuild with one worker process per dataset parsing and filtering TSV rows.
+
+        Workers only apply row-local filters and send compact tuples; this
+        process is the single SQLite writer. Everything that depends on another
+        dataset (vote threshold, ratings, surviving episode parents, aka joins)
+        is resolved afterwards with set-based SQL over the staging tables.
+        """
+        context = multiprocessing.get_context()
+        result_queue = context.Queue(maxsize=self.REBUILD_QUEUE_MAX_BATCHES)
+        settings = {name: getattr(self, name) for name in self.REBUILD_WORKER_SETTINGS}
+        pending = [name for name in self.REBUILD_DATASET_ORDER if name in dataset_paths]
+        active: Dict[str, Any] = {}
+        rows_written: Dict[str, int] = {}
+
+        def start_next_worker() -> None:
+            dataset_name = pending.pop(0)
+            worker = context.Process(
+                target=_parse_dataset_worker,
+                args=(type(self), settings, dataset_name, dataset_paths[dataset_name], self.REBUILD_BATCH_SIZE, result_queue),
+                name=f"imdb-parse-{dataset_name}",
+                daemon=True,
             )
-            self._load_episode_links_into_temp(conn, dataset_paths["title.episode"], surviving_parent_ids)
-            self._materialize_episode_core(conn)
-            self._populate_primary_search_tables(conn)
-            self._load_aka_search_rows(conn, dataset_paths["title.akas"])
+            worker.start()
+            active[dataset_name] = worker
 
-            for dataset_name, source_ts in source_timestamps.items():
-                self._upsert_dataset_version(conn, dataset_name, source_ts)
+        with sql_profiler.connect(db_path or self._db_path, timeout=60.0) as conn:
+            self._timed_execute(conn, "PRAGMA synchronous=OFF")
+            self._timed_execute(conn, "PRAGMA temp_store=MEMORY")
+            self._timed_execute(conn, "PRAGMA cache_size=100000")
+
+            self._timed_execute(conn, "DELETE FROM title_fts")
+            self._timed_execute(conn, "DELETE FROM title_search")
+            self._timed_execute(conn, "DELETE FROM episode_search")
+            self._timed_execute(conn, "DELETE FROM episode_core")
+            self._timed_execute(conn, "DELETE FROM title_core")
 
             conn.executescript(
                 """
-                DROP TABLE IF EXISTS temp_aka_staging;
-                DROP TABLE IF EXISTS temp_episode_links;
-                DROP TABLE IF EXISTS temp_episode_basics;
+                CREATE TEMP TABLE temp_ratings (
+                    id INTEGER PRIMARY KEY,
+                    rating INTEGER,
+                    votes INTEGER
+                ) WITHOUT ROWID;
+
+                CREATE TEMP TABLE temp_title_basics (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    original_title TEXT,
+                    type INTEGER NOT NULL,
+                    year INTEGER,
+                    end_year INTEGER,
+                    runtime_minutes INTEGER,
+                    genres TEXT
+                ) WITHOUT ROWID;
+
+                CREATE TEMP TABLE temp_episode_basics (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    title_lower TEXT NOT NULL,
+                    year INTEGER,
+                    runtime_minutes INTEGER
+                ) WITHOUT ROWID;
+
+                CREATE TEMP TABLE temp_episode_links (
+                    id INTEGER PRIMARY KEY,
+                    parent_id INTEGER NOT NULL,
+                    season INTEGER,
+                    episode INTEGER
+                ) WITHOUT ROWID;
+
+                CREATE TEMP TABLE temp_aka_staging (
+                    title_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    title_lower TEXT NOT NULL,
+                    PRIMARY KEY (title_id, title_lower)
+                ) WITHOUT ROWID;
                 """
             )
-            conn.commit()
+
+            with self._timed_stage("parse+stage datasets (parallel)"):
+                try:
+                    while pending and len(active) < workers:
+                        start_next_worker()
+                    write_seconds = 0.0
+                    while active:
+                        try:
+                            message = result_queue.get(timeout=1.0)
+                        except queue.Empty:
+                            crashed = [name for name, worker in active.items() if not worker.is_alive()]
+                            if crashed:
+                                raise RuntimeError(f"IMDb parse worker(s) exited without finishing: {', '.join(crashed)}")
+                            continue
+
+                        tag = message[0]
+                        if tag == "rows":
+                            _tag, kind, rows = message
+                            started_at = time.perf_counter()
+                            conn.executemany(self.REBUILD_STAGING_INSERTS[kind], rows)
+                            write_seconds += time.perf_counter() - started_at
+                            rows_written[kind] = rows_written.get(kind, 0) + len(rows)
+                        elif tag == "done":
+                            _tag, dataset_name, parse_seconds = message
+                            self.rebuild_timings[f"parse {dataset_name} (worker)"] = parse_seconds
+                            active.pop(dataset_name).join()
+                            if pending:
+                                start_next_worker()
+                        else:
+                            _tag, dataset_name, error_text = message
+                            raise RuntimeError(f"Parsing {dataset_name} failed in worker process:\n{error_text}")
+                    self.rebuild_timings["write staging rows"] = write_seconds
+                finally:
+                    for worker in active.values():
+                        worker.terminate()
+                        worker.join()
+
+            for kind, count in rows_written.items():
+                logging.info("Staged %s %s rows", count, kind)
+
+            with self._timed_stage("materialize title_core"):
+                threshold_clause = ""
+                params: Tuple[Any, ...] = ()
+                if self.MIN_VOTES_THRESHOLD is not None:
+                    threshold_clause = "WHERE r.votes >= ?"
+                    params = (self.MIN_VOTES_THRESHOLD,)
+                self._timed_execute(
+                    conn,
+                    f"""
+                    INSERT OR REPLACE INTO title_core (
+                        id, title, original_title, type, year, end_year, runtime_minutes, genres, rating, votes
+                    )
+                    SELECT b.id, b.title, b.original_title, b.type, b.year, b.end_year, b.runtime_minutes, b.genres, r.rating, r.votes
+                    FROM temp_title_basics b
+                    LEFT JOIN temp_ratings r ON r.id = b.id
+                    {threshold_clause}
+                    """,
+                    params,
+                )
+            with self._timed_stage("materialize episode_core"):
+                self._timed_execute(
+                    conn,
+                    """
+                    INSERT OR REPLACE INTO episode_core (id, parent_id, season, episode, title, year, runtime_minutes, rating, votes)
+                    SELECT l.id, l.parent_id, l.season, l.episode, b.title, b.year, b.runtime_minutes, r.rating, r.votes
+                    FROM temp_episode_links l
+                    JOIN temp_episode_basics b ON b.id = l.id
+                    JOIN title_core t ON t.id = l.parent_id
+                    LEFT JOIN temp_ratings r ON r.id = l.id
+                    """
+                )
+            with self._timed_stage("primary search tables"):
+                self._populate_primary_search_tables(conn)
+            with self._timed_stage("aka search rows"):
+                self._merge_aka_search_rows(conn)
+
+            with self._timed_stage("commit"):
+                for dataset_name, source_ts in source_timestamps.items():
+                    self._upsert_dataset_version(conn, dataset_name, source_ts)
+
+                conn.executescript(
+                    """
+                    DROP TABLE IF EXISTS temp_aka_staging;
+                    DROP TABLE IF EXISTS temp_episode_links;
+                    DROP TABLE IF EXISTS temp_episode_basics;
+                    DROP TABLE IF EXISTS temp_title_basics;
+                    DROP TABLE IF EXISTS temp_ratings;
+                    """
+                )
+                conn.commit()
+
+    def _iter_dataset_rows(self, dataset_name: str, dataset_path: str) -> Iterable[List[Any]]:
+        required_cols = self.REQUIRED_COLUMNS[dataset_name]
+        with gzip.open(dataset_path, "rt", encoding="utf-8") as handle:
+            header = handle.readline().strip().split("\t")
+            col_indices = [header.index(col) for col in required_cols]
+            for line in handle:
+                if not line.strip():
+                    continue
+                fields = line.rstrip("\n\r").split("\t")
+                yield self._extract_row_values(fields, required_cols, col_indices)
+
+    def _iter_dataset_batches(
+        self,
+        dataset_name: str,
+        dataset_path: str,
+        batch_size: int,
+    ) -> Iterable[Tuple[str, List[Tuple[Any, ...]]]]:
+        """
+        Parse one dataset into (staging kind, rows) batches for the parallel rebuild.
+
+        Only filters that need nothing but the row itself are applied here.
+        """
+        required_cols = self.REQUIRED_COLUMNS[dataset_name]
+        batches: Dict[str, List[Tuple[Any, ...]]] = {}
+
+        def add(kind: str, row: Tuple[Any, ...]) -> Optional[List[Tuple[Any, ...]]]:
+            batch = batches.setdefault(kind, [])
+            batch.append(row)
+            if len(batch) >= batch_size:
+                batches[kind] = []
+                return batch
+            return None
+
+        for row_data in self._iter_dataset_rows(dataset_name, dataset_path):
+            full_batch = None
+            if dataset_name == "title.ratings":
+                data_dict = dict(zip(required_cols, row_data))
+                title_id = self._parse_tconst_int(data_dict.get("tconst"))
+                if title_id is None:
+                    continue
+                rating = self._as_float(data_dict.get("averageRating"))
+                rating_int = int(rating * 10) if rating is not None else None
+                full_batch = add("ratings", (title_id, rating_int, self._as_int(data_dict.get("numVotes"))))
+                kind = "ratings"
+            elif dataset_name == "title.basics":
+                if not self._should_keep_title("title.basics", row_data, required_cols):
+                    continue
+                data_dict = dict(zip(required_cols, row_data))
+                title_id = self._parse_tconst_int(data_dict.get("tconst"))
+                if title_id is None:
+                    continue
+                title_type = self._as_str(data_dict.get("titleType"))
+                title = self._normalize_space_collapsed_text(self._as_str(data_dict.get("primaryTitle")))
+                if not title:
+                    continue
+                if title_type == "tvEpisode":
+                    kind = "episode_basics"
+                    row = (
+                        title_id,
+                        title,
+                        title.lower(),
+                        self._as_int(data_dict.get("startYear")),
+                        self._as_int(data_dict.get("runtimeMinutes")),
+                    )
+                else:
+                    kind = "title_basics"
+                    row = (
+                        title_id,
+                        title,
+                        self._normalize_space_collapsed_text(self._as_str(data_dict.get("originalTitle"))) or None,
+                        self.TITLE_TYPE_CODES.get(title_type or "movie", self.TITLE_TYPE_CODES["movie"]),
+                        self._as_int(data_dict.get("startYear")),
+                        self._as_int(data_dict.get("endYear")),
+                        self._as_int(data_dict.get("runtimeMinutes")),
+                        self._compress_genres(self._as_str(data_dict.get("genres"))),
+                    )
+                full_batch = add(kind, row)
+            elif dataset_name == "title.episode":
+                data_dict = dict(zip(required_cols, row_data))
+                episode_id = self._parse_tconst_int(data_dict.get("tconst"))
+                parent_id = self._parse_tconst_int(data_dict.get("parentTconst"))
+                if episode_id is None or parent_id is None:
+                    continue
+                kind = "episode_links"
+                full_batch = add(kind, (episode_id, parent_id, self._as_int(data_dict.get("seasonNumber")), self._as_int(data_dict.get("episodeNumber"))))
+            elif dataset_name == "title.akas":
+                compressed = self._compress_row("title.akas", row_data, required_cols, None)
+                if not compressed:
+                    continue
+                title_id, title, title_lower, _language, _region = compressed["row"]
+                kind = "aka"
+                full_batch = add(kind, (title_id, title, title_lower))
+            if full_batch:
+                yield kind, full_batch
+
+        for kind, batch in batches.items():
+            if batch:
+                yield kind, batch
 
     def _load_ratings_map(self, dataset_path: str) -> Tuple[Dict[int, Tuple[Optional[int], Optional[int]]], set[int]]:
         ratings_by_id: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
@@ -736,6 +1339,9 @@ class IMDbDataProvider(BaseMetadataProvider):
                 batch,
             )
 
+        self._merge_aka_search_rows(conn)
+
+    def _merge_aka_search_rows(self, conn: sqlite3.Connection) -> None:
         self._timed_execute(
             conn,
             """
@@ -984,26 +1590,27 @@ class IMDbDataProvider(BaseMetadataProvider):
             return normalized.replace(" ", "")
         return normalized
 
-    def _score_partial_title_match(
+    def _similarity_forms(self, title: str) -> Tuple[str, str, frozenset]:
+        """Normalized title, its space-free form and its word set, as compared by partial-title scoring."""
+        normalized = self._normalize_title_for_similarity(title)
+        return normalized, normalized.replace(" ", ""), frozenset(normalized.split())
+
+    def _partial_title_base_score(
         self,
-        query: str,
-        candidate_title: str,
-        row: RowLike,
-        year: Optional[int],
-    ) -> float:
-        query_normalized = self._normalize_title_for_similarity(query)
-        candidate_normalized = self._normalize_title_for_similarity(candidate_title)
-        query_compact = self._normalize_title_for_similarity(query, compact=True)
-        candidate_compact = self._normalize_title_for_similarity(candidate_title, compact=True)
+        query_forms: Tuple[str, str, frozenset],
+        candidate_forms: Tuple[str, str, frozenset],
+        ratio: float,
+    ) -> Optional[Tuple[float, float]]:
+        """(base score, score cap) of a partial-title candidate before bonuses, or None if either side is empty.
+
+        ``ratio`` is the better of the normalized and compact fuzz.ratio scores (0-100).
+        """
+        query_normalized, query_compact, query_words = query_forms
+        candidate_normalized, candidate_compact, candidate_words = candidate_forms
         if not query_normalized or not candidate_normalized:
-            return 0.0
+            return None
 
-        ratio = max(
-            fuzz.ratio(query_normalized, candidate_normalized) / 100.0,
-            fuzz.ratio(query_compact, candidate_compact) / 100.0,
-        )
-        query_words = set(query_normalized.split())
-        candidate_words = set(candidate_normalized.split())
+        ratio = ratio / 100.0
         coverage = (len(query_words & candidate_words) / len(query_words)) if query_words else 0.0
         quality = min(1.0, (ratio * 0.7) + (coverage * 0.3))
 
@@ -1012,13 +1619,15 @@ class IMDbDataProvider(BaseMetadataProvider):
             or candidate_compact.startswith(query_compact)
         )
         if is_prefix_match:
-            base_score = self.PREFIX_SCORE_BASE + (quality * self.PREFIX_SCORE_RANGE)
-            max_score = self.PREFIX_SCORE_CAP
-        else:
-            base_score = self.FUZZY_SCORE_BASE + (quality * self.FUZZY_SCORE_RANGE)
-            max_score = self.FUZZY_SCORE_CAP
-
-        return self._apply_candidate_bonuses(row, base_score, year, max_score=max_score)
+            return self.PREFIX_SCORE_BASE + (quality * self.PREFIX_SCORE_RANGE), self.PREFIX_SCORE_CAP
+        return self.FUZZY_SCORE_BASE + (quality * self.FUZZY_SCORE_RANGE), self.FUZZY_SCORE_CAP
+
+    def _max_bonus_score(self, base_score: float, max_score: float) -> float:
+        """Upper bound of _apply_candidate_bonuses for ``base_score``; sums in the same order so it never undershoots."""
+        return min(
+            base_score + max(self.YEAR_EXACT_BONUS, self.YEAR_CLOSE_BONUS, 0) + self.VOTE_BONUS_CAP + self.YEAR_RECENCY_MAX_BONUS,
+            max_score,
+        )
 
     @staticmethod
     def _build_prefix_search_patterns(title_lower: str) -> List[str]:
@@ -1073,192 +1682,334 @@ class IMDbDataProvider(BaseMetadataProvider):
             tuple(params),
         ).fetchall()
 
-    def _extract_matches(self, query: str, choices: Dict[int, str], limit: int) -> List[Tuple[str, float, int]]:
-        extractor = getattr(process, "extract", None)
-        if callable(extractor):
-            raw_matches = extractor(query, choices, scorer=fuzz.ratio, limit=limit)
-            if isinstance(raw_matches, Iterable):
-                matches: List[Tuple[str, float, int]] = []
-                for candidate_title, score, candidate_id in raw_matches:
-                    matches.append((str(candidate_title), float(score), int(candidate_id)))
-                return matches
-        scored = [(candidate_title, float(fuzz.ratio(query, candidate_title)), candidate_id) for candidate_id, candidate_title in choices.items()]
-        scored.sort(key=lambda item: item[1], reverse=True)
-        return scored[:limit]
-
-    def _get_fuzzy_candidates(self, conn: sqlite3.Connection, title_lower: str, year: Optional[int]) -> List[sqlite3.Row]:
-        candidates: List[sqlite3.Row] = []
+    def _ratio_rows(
+        self,
+        queries: Sequence[str],
+        choices: Sequence[str],
+        columns: Sequence[Sequence[int]],
+    ) -> List[List[float]]:
+        """fuzz.ratio of each query against its own choices (``columns[i]`` indexes into ``choices``).
+
+        With numpy the whole query x choice matrix is scored in one process.cdist
+        call; otherwise each query is scored against its choices with one
+        process.extract call.
+        """
+        if numpy is not None and choices:
+            workers = self.FUZZY_SCORE_WORKERS if len(queries) * len(choices) >= self.FUZZY_PARALLEL_MIN_CELLS else 1
+            matrix = process.cdist(
+                queries, choices, scorer=fuzz.ratio, processor=None, dtype=numpy.float64, workers=workers
+            )
+            return [matrix[offset, list(query_columns)].tolist() for offset, query_columns in enumerate(columns)]
+
+        rows: List[List[float]] = []
+        for query, query_columns in zip(queries, columns):
+            scores = [0.0] * len(query_columns)
+            query_choices = [choices[column] for column in query_columns]
+            for _choice, score, position in process.extract(
+                query, query_choices, scorer=fuzz.ratio, processor=None, limit=None
+            ):
+                scores[position] = float(score)
+            rows.append(scores)
+        return rows
+
+    def _get_fts_candidates(self, conn: sqlite3.Connection, fts_query: str, year: Optional[int]) -> List[sqlite3.Row]:
+        if year is not None:
+            cursor = conn.execute(
+                """
+                SELECT c.id, c.title, c.type, c.year, c.end_year, c.runtime_minutes, c.genres,
+                       CASE WHEN c.rating IS NULL THEN NULL ELSE c.rating / 10.0 END AS rating,
+                       c.votes, f.score, f.title AS matched_title
+                FROM (
+                    SELECT title_id, title, bm25(title_fts, 10.0) AS score
+                    FROM title_fts
+                    WHERE title_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ?
+                ) f
+                JOIN title_core c ON c.id = f.title_id
+                WHERE (c.year BETWEEN ? AND ? OR c.year IS NULL)
+                  AND c.votes >= ?
+                ORDER BY f.score, c.votes DESC
+                LIMIT ?
+                """,
+                (fts_query, self.FTS_LIMIT_WITH_YEAR, year - self.YEAR_TOLERANCE, year + self.YEAR_TOLERANCE, self.MIN_VOTES_THRESHOLD or 0, self.FTS_LIMIT_WITH_YEAR),
+            )
+        else:
+            cursor = conn.execute(
+                """
+                SELECT c.id, c.title, c.type, c.year, c.end_year, c.runtime_minutes, c.genres,
+                       CASE WHEN c.rating IS NULL THEN NULL ELSE c.rating / 10.0 END AS rating,
+                       c.votes, f.score, f.title AS matched_title
+                FROM (
+                    SELECT title_id, title, bm25(title_fts, 10.0) AS score
+                    FROM title_fts
+                    WHERE title_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ?
+                ) f
+                JOIN title_core c ON c.id = f.title_id
+                WHERE c.votes >= ?
+                ORDER BY f.score, c.votes DESC
+                LIMIT ?
+                """,
+                (fts_query, self.FTS_LIMIT_WITHOUT_YEAR, self.MIN_VOTES_THRESHOLD or 0, self.FTS_LIMIT_WITHOUT_YEAR),
+            )
+        return cursor.fetchall()
+
+    def _get_trigram_candidates(self, conn: sqlite3.Connection, title_lower: str, year: Optional[int]) -> List[Dict[str, Any]]:
+        """Titles sharing the most character trigrams with the query, most shared first."""
+        matches = self._trigram_index.candidates(conn, title_lower, self.TRIGRAM_CANDIDATE_LIMIT)
+        if not matches:
+            return []
+        matched_title_by_id = {title_id: matched_title for title_id, matched_title, _shared in matches}
+
+        year_clause = ""
+        params: List[Any] = list(matched_title_by_id)
+        params.append(self.MIN_VOTES_THRESHOLD or 0)
+        if year is not None:
+            year_clause = " AND (c.year BETWEEN ? AND ? OR c.year IS NULL)"
+            params.extend([year - self.YEAR_TOLERANCE, year + self.YEAR_TOLERANCE])
+        placeholders = ",".join("?" for _ in matched_title_by_id)
+        rows_by_id = {
+            row["id"]: row
+            for row in conn.execute(
+                f"""
+                SELECT c.id, c.title, c.type, c.year, c.end_year, c.runtime_minutes, c.genres,
+                       CASE WHEN c.rating IS NULL THEN NULL ELSE c.rating / 10.0 END AS rating,
+                       c.votes
+                FROM title_core c
+                WHERE c.id IN ({placeholders})
+                  AND c.votes >= ?
+                  {year_clause}
+                """,
+                tuple(params),
+            )
+        }
+        candidates: List[Dict[str, Any]] = []
+        for title_id, matched_title in matched_title_by_id.items():
+            row = rows_by_id.get(title_id)
+            if row is not None:
+                candidates.append(dict(row, score=None, matched_title=matched_title))
+        return candidates
+
+    def _get_fuzzy_candidates(self, conn: sqlite3.Connection, title_lower: str, year: Optional[int]) -> List[RowLike]:
+        """Candidates for fuzzy scoring, from the first source that returns any.
+
+        Sources are FTS with every query word, then the trigram index (typos,
+        romanization variants, merged words), then FTS with any query word.
+        """
+        fts_queries = self._build_fts_queries(title_lower)
+        candidates: List[RowLike] = []
         try:
-            for fts_query in self._build_fts_queries(title_lower):
-                if year is not None:
-                    cursor = conn.execute(
-                        """
-                        SELECT c.id, c.title, c.type, c.year, c.end_year, c.runtime_minutes, c.genres,
-                               CASE WHEN c.rating IS NULL THEN NULL ELSE c.rating / 10.0 END AS rating,
-                               c.votes, f.score, f.title AS matched_title
-                        FROM (
-                            SELECT title_id, title, bm25(title_fts, 10.0) AS score
-                            FROM title_fts
-                            WHERE title_fts MATCH ?
-                            ORDER BY score
-                            LIMIT ?
-                        ) f
-                        JOIN title_core c ON c.id = f.title_id
-                        WHERE (c.year BETWEEN ? AND ? OR c.year IS NULL)
-                          AND c.votes >= ?
-                        ORDER BY f.score, c.votes DESC
-                        LIMIT ?
-                        """,
-                        (fts_query, self.FTS_LIMIT_WITH_YEAR, year - self.YEAR_TOLERANCE, year + self.YEAR_TOLERANCE, self.MIN_VOTES_THRESHOLD or 0, self.FTS_LIMIT_WITH_YEAR),
-                    )
-                else:
-                    cursor = conn.execute(
-                        """
-                        SELECT c.id, c.title, c.type, c.year, c.end_year, c.runtime_minutes, c.genres,
-                               CASE WHEN c.rating IS NULL THEN NULL ELSE c.rating / 10.0 END AS rating,
-                               c.votes, f.score, f.title AS matched_title
-                        FROM (
-                            SELECT title_id, title, bm25(title_fts, 10.0) AS score
-                            FROM title_fts
-                            WHERE title_fts MATCH ?
-                            ORDER BY score
-                            LIMIT ?
-                        ) f
-                        JOIN title_core c ON c.id = f.title_id
-                        WHERE c.votes >= ?
-                        ORDER BY f.score, c.votes DESC
-                        LIMIT ?
-                        """,
-                        (fts_query, self.FTS_LIMIT_WITHOUT_YEAR, self.MIN_VOTES_THRESHOLD or 0, self.FTS_LIMIT_WITHOUT_YEAR),
-                    )
-                candidates = cursor.fetchall()
+            if fts_queries:
+                candidates = self._get_fts_candidates(conn, fts_queries[0], year)
+        except Exception as exc:
+            logging.debug("FTS search failed: %s", exc)
+            fts_queries = []
+        if not candidates:
+            candidates = self._get_trigram_candidates(conn, title_lower, year)
+        try:
+            for fts_query in fts_queries[1:]:
                 if candidates:
                     break
+                candidates = self._get_fts_candidates(conn, fts_query, year)
         except Exception as exc:
             logging.debug("FTS search failed: %s", exc)
         return candidates[: self.MAX_CANDIDATES]
 
-    def _select_best_fuzzy_match(
+    def _group_fuzzy_jobs(
+        self,
+        prepared: List[Tuple[int, List[Dict[str, Any]], List[str]]],
+    ) -> Iterable[List[Tuple[int, List[Dict[str, Any]], List[str]]]]:
+        """Split jobs into groups whose query x distinct-candidate matrix stays within FUZZY_MATRIX_MAX_CELLS."""
+        group: List[Tuple[int, List[Dict[str, Any]], List[str]]] = []
+        group_titles: set = set()
+        for job in prepared:
+            new_titles = set(job[2]) - group_titles
+            if group and (len(group) + 1) * (len(group_titles) + len(new_titles)) > self.FUZZY_MATRIX_MAX_CELLS:
+                yield group
+                group, group_titles = [], set()
+                new_titles = set(job[2])
+            group.append(job)
+            group_titles |= new_titles
+        if group:
+            yield group
+
+    def _select_best_fuzzy_matches(
         self,
         conn: sqlite3.Connection,
-        query: str,
-        candidates: List[Dict[str, Any]],
-        year: Optional[int],
-    ) -> Optional[MatchResult]:
-        if not candidates:
-            return None
+        jobs: Sequence[Tuple[str, List[Dict[str, Any]], Optional[int]]],
+    ) -> List[Optional[MatchResult]]:
+        """Pick the best candidate for each (query, candidates, year) job.
+
+        Each distinct candidate title is normalized once, and the raw, normalized
+        and compact fuzz.ratio scores of a group of queries against the union of
+        their candidates are computed as three matrices. The top FUZZY_MATCH_LIMIT
+        candidates by raw ratio (ties in candidate order) are rescored and the
+        first highest total wins, as when scoring one query at a time.
+        """
+        results: List[Optional[MatchResult]] = [None] * len(jobs)
+        prepared: List[Tuple[int, List[Dict[str, Any]], List[str]]] = []
+        for index, (_query, candidates, _year) in enumerate(jobs):
+            rows: List[Dict[str, Any]] = []
+            titles: List[str] = []
+            seen_ids: set = set()
+            for row in candidates:
+                row_id = int(row["id"])
+                if row_id in seen_ids:
+                    continue
+                seen_ids.add(row_id)
+                rows.append(row)
+                titles.append(str(row.get("matched_title") or row["title"]))
+            if rows:
+                prepared.append((index, rows, titles))
+
+        forms_by_title: Dict[str, Tuple[str, str, frozenset]] = {}
+        for group in self._group_fuzzy_jobs(prepared):
+            columns: Dict[str, int] = {}
+            for _index, _rows, titles in group:
+                for candidate_title in titles:
+                    columns.setdefault(candidate_title, len(columns))
+            choices = list(columns)
+            choice_forms = []
+            for candidate_title in choices:
+                forms = forms_by_title.get(candidate_title)
+                if forms is None:
+                    forms = forms_by_title[candidate_title] = self._similarity_forms(candidate_title)
+                choice_forms.append(forms)
+
+            queries = [jobs[index][0] for index, _rows, _titles in group]
+            query_forms = [self._similarity_forms(query) for query in queries]
+            group_columns = [[columns[candidate_title] for candidate_title in titles] for _index, _rows, titles in group]
+            raw_rows = self._ratio_rows(queries, choices, group_columns)
+            normalized_rows = self._ratio_rows(
+                [forms[0] for forms in query_forms], [forms[0] for forms in choice_forms], group_columns
+            )
+            compact_rows = self._ratio_rows(
+                [forms[1] for forms in query_forms], [forms[1] for forms in choice_forms], group_columns
+            )
 
-        search_dict: Dict[int, str] = {}
-        candidate_by_id: Dict[int, Dict[str, Any]] = {}
-        for row in candidates:
-            row_id = int(row["id"])
-            if row_id in candidate_by_id:
-                continue
-            candidate_by_id[row_id] = row
-            search_dict[row_id] = str(row.get("matched_title") or row["title"])
+            for offset, (index, rows, _titles) in enumerate(group):
+                year = jobs[index][2]
+                raw_row = raw_rows[offset]
+                ranked = sorted(range(len(rows)), key=lambda position: -raw_row[position])
+
+                # (score ceiling, rank, position, base score, cap), highest ceiling first
+                scored = []
+                for rank, position in enumerate(ranked[: self.FUZZY_MATCH_LIMIT]):
+                    ratio = max(normalized_rows[offset][position], compact_rows[offset][position])
+                    base = self._partial_title_base_score(
+                        query_forms[offset], choice_forms[group_columns[offset][position]], ratio
+                    )
+                    if base is not None:
+                        scored.append((self._max_bonus_score(*base), rank, position) + base)
+                scored.sort(key=lambda item: (-item[0], item[1]))
+
+                # Highest total wins and ties go to the best raw ratio rank; stop once no ceiling can reach the leader
+                best_row = None
+                best_score = 0.0
+                best_rank = len(ranked)
+                for ceiling, rank, position, base_score, max_score in scored:
+                    if ceiling < best_score:
+                        break
+                    total_score = self._apply_candidate_bonuses(rows[position], base_score, year, max_score=max_score)
+                    if total_score > best_score or (best_row is not None and total_score == best_score and rank < best_rank):
+                        best_score = total_score
+                        best_rank = rank
+                        best_row = rows[position]
+
+                if best_row is not None:
+                    results[index] = MatchResult(
+                        info=self._create_title_info_from_row_fast(best_row, conn),
+                        score=best_score,
+                        provider_weight=self.provider_weight,
+                    )
+        return results
 
-        title_matches = self._extract_matches(query, search_dict, self.FUZZY_MATCH_LIMIT)
-        best_match = None
-        best_score = 0.0
-        for matched_title, _fuzzy_score, row_id in title_matches:
-            row = candidate_by_id.get(row_id)
-            if row is None:
-                continue
-            total_score = self._score_partial_title_match(query, matched_title, row, year)
-            if total_score > best_score:
-                best_score = total_score
-                best_match = self._create_title_info_from_row_fast(row, conn)
+    def find_title(self, title: str, year: Optional[int] = None) -> Optional[MatchResult]:
+        return self.find_titles([(title, year, None)])[0]
 
-        if best_match is None:
-            return None
-        return MatchResult(info=best_match, score=best_score, provider_weight=self.provider_weight)
+    def find_title_with_type_hint(self, title: str, preferred_type: str, year: Optional[int] = None) -> Optional[MatchResult]:
+        return self.find_titles([(title, year, preferred_type)])[0]
 
-    def find_title(self, title: str, year: Optional[int] = None) -> Optional[MatchResult]:
+    def find_titles(
+        self,
+        queries: Sequence[Tuple[str, Optional[int], Optional[str]]],
+    ) -> List[Optional[MatchResult]]:
+        """Resolve many (title, year, preferred_type) lookups in order.
+
+        Each query gives the same result as find_title / find_title_with_type_hint;
+        exact candidates are still checked per query, but the fuzzy and prefix
+        stages of all queries that reach them are scored together.
+        """
         self._ensure_data_loaded()
-        cache_key = f"{title.lower()}_{year}"
-        cached = self._search_cache.get(cache_key)
-        if isinstance(cached, MatchResult):
-            return cached
-
-        conn = self._get_connection()
-        try:
+        results: List[Optional[MatchResult]] = [None] * len(queries)
+        # (result index, title, title_lower, year, preferred type codes or None, cache key)
+        pending: List[Tuple[int, str, str, Optional[int], Optional[set], str]] = []
+        for index, (title, year, preferred_type) in enumerate(queries):
+            type_codes = self.PREFERRED_TYPE_HINT_CODES.get(preferred_type) if preferred_type else None
+            cache_key = f"{title.lower()}_{year}_{preferred_type}" if type_codes else f"{title.lower()}_{year}"
+            cached = self._search_cache.get(cache_key)
+            if isinstance(cached, MatchResult):
+                results[index] = cached
+                continue
             title_lower = re.sub(r"\s+", " ", title.lower()).strip()
-            exact_candidates = self._get_exact_candidates(conn, title_lower, year)
-            if exact_candidates:
-                best_match, best_score = self._select_exact_match(exact_candidates, conn, year)
-                if best_match is not None:
-                    result = MatchResult(info=best_match, score=best_score, provider_weight=self.provider_weight)
-                    self._search_cache[cache_key] = result
-                    return result
-
-            candidates = [dict(row) for row in self._get_fuzzy_candidates(conn, title_lower, year)]
-            result = self._select_best_fuzzy_match(conn, title, candidates, year)
-            if result is not None:
-                self._search_cache[cache_key] = result
-                if len(self._search_cache) > self.SEARCH_CACHE_MAX:
-                    oldest_keys = list(self._search_cache.keys())[: self.SEARCH_CACHE_EVICT]
-                    for key in oldest_keys:
-                        del self._search_cache[key]
-                return result
-
-            prefix_candidates = [dict(row) for row in self._get_prefix_candidates(conn, title_lower, year)]
-            result = self._select_best_fuzzy_match(conn, title, prefix_candidates, year)
-            if result is not None:
-                self._search_cache[cache_key] = result
-                if len(self._search_cache) > self.SEARCH_CACHE_MAX:
-                    oldest_keys = list(self._search_cache.keys())[: self.SEARCH_CACHE_EVICT]
-                    for key in oldest_keys:
-                        del self._search_cache[key]
-                return result
-        finally:
-            self._return_connection(conn)
+            pending.append((index, title, title_lower, year, type_codes, cache_key))
+        if not pending:
+            return results
 
-        return None
+        def keep(row: RowLike, type_codes: Optional[set]) -> bool:
+            return type_codes is None or row["type"] in type_codes
 
-    def find_title_with_type_hint(self, title: str, preferred_type: str, year: Optional[int] = None) -> Optional[MatchResult]:
-        self._ensure_data_loaded()
-        preferred_type_codes = self.PREFERRED_TYPE_HINT_CODES.get(preferred_type)
-        if not preferred_type_codes:
-            return self.find_title(title, year)
-
-        cache_key = f"{title.lower()}_{year}_{preferred_type}"
-        cached = self._search_cache.get(cache_key)
-        if isinstance(cached, MatchResult):
-            return cached
+        def store(job: Tuple[int, str, str, Optional[int], Optional[set], str], result: MatchResult) -> None:
+            results[job[0]] = result
+            self._search_cache[job[5]] = result
 
         conn = self._get_connection()
         try:
-            title_lower = re.sub(r"\s+", " ", title.lower()).strip()
-            exact_candidates = [row for row in self._get_exact_candidates(conn, title_lower, year) if row["type"] in preferred_type_codes]
-            if exact_candidates:
-                best_match, best_score = self._select_exact_match(exact_candidates, conn, year)
-                if best_match is not None:
-                    result = MatchResult(info=best_match, score=best_score, provider_weight=self.provider_weight)
-                    self._search_cache[cache_key] = result
-                    return result
-
-            candidates = [dict(row) for row in self._get_fuzzy_candidates(conn, title_lower, year) if row["type"] in preferred_type_codes]
-            result = self._select_best_fuzzy_match(conn, title, candidates, year)
-            if result is not None:
-                self._search_cache[cache_key] = result
-                return result
-
-            prefix_candidates = [
-                dict(row)
-                for row in self._get_prefix_candidates(conn, title_lower, year)
-                if row["type"] in preferred_type_codes
-            ]
-            result = self._select_best_fuzzy_match(conn, title, prefix_candidates, year)
-            if result is not None:
-                self._search_cache[cache_key] = result
-                return result
+            fuzzy_jobs = []
+            for job in pending:
+                _index, _title, title_lower, year, type_codes, _cache_key = job
+                exact_candidates = [row for row in self._get_exact_candidates(conn, title_lower, year) if keep(row, type_codes)]
+                if exact_candidates:
+                    best_match, best_score = self._select_exact_match(exact_candidates, conn, year)
+                    if best_match is not None:
+                        store(job, MatchResult(info=best_match, score=best_score, provider_weight=self.provider_weight))
+                        continue
+                candidates = [dict(row) for row in self._get_fuzzy_candidates(conn, title_lower, year) if keep(row, type_codes)]
+                fuzzy_jobs.append((job, candidates))
+
+            fuzzy_results = self._select_best_fuzzy_matches(
+                conn, [(job[1], candidates, job[3]) for job, candidates in fuzzy_jobs]
+            )
+            prefix_jobs = []
+            for (job, _candidates), result in zip(fuzzy_jobs, fuzzy_results):
+                if result is not None:
+                    store(job, result)
+                    continue
+                _index, _title, title_lower, year, type_codes, _cache_key = job
+                candidates = [dict(row) for row in self._get_prefix_candidates(conn, title_lower, year) if keep(row, type_codes)]
+                prefix_jobs.append((job, candidates))
+
+            prefix_results = self._select_best_fuzzy_matches(
+                conn, [(job[1], candidates, job[3]) for job, candidates in prefix_jobs]
+            )
+            unmatched_typed_jobs = []
+            for (job, _candidates), result in zip(prefix_jobs, prefix_results):
+                if result is not None:
+                    store(job, result)
+                elif job[4] is not None:
+                    unmatched_typed_jobs.append(job)
         finally:
             self._return_connection(conn)
 
-        fallback = self.find_title(title, year)
-        if fallback is not None:
-            self._search_cache[cache_key] = fallback
-        return fallback
+        # Type-hinted lookups with no match of the preferred type fall back to an untyped lookup
+        if unmatched_typed_jobs:
+            fallbacks = self.find_titles([(job[1], job[3], None) for job in unmatched_typed_jobs])
+            for job, fallback in zip(unmatched_typed_jobs, fallbacks):
+                if fallback is not None:
+                    store(job, fallback)
+        return results
 
     def _create_title_info_from_row_fast(self, row: RowLike, conn: sqlite3.Connection) -> TitleInfo:
         row_id = int(self._row_value(row, "id"))
@@ -1304,10 +2055,6 @@ class IMDbDataProvider(BaseMetadataProvider):
             plot=None,
         )
         self._title_cache[row_id] = title_info
-        if len(self._title_cache) > self.TITLE_CACHE_MAX:
-            oldest_keys = list(self._title_cache.keys())[: self.TITLE_CACHE_EVICT]
-            for key in oldest_keys:
-                del self._title_cache[key]
         return title_info
 
     def _parse_parent_id(self, parent_id: str) -> Optional[int]:
@@ -1321,12 +2068,11 @@ class IMDbDataProvider(BaseMetadataProvider):
         except (TypeError, ValueError):
             return None
 
-    def get_episode_info(self, parent_id: str, season: int, episode: int) -> Optional[EpisodeInfo]:
-        self._ensure_data_loaded()
-        cache_key = f"{parent_id}_{season}_{episode}"
-        cached = self._search_cache.get(cache_key)
-        if isinstance(cached, EpisodeInfo):
-            return cached
+    def _get_episode_table(self, parent_id: str) -> Optional[_EpisodeTable]:
+        """All episodes of a series; the first lookup for a parent loads them, later ones are served from memory."""
+        table = self._episode_table_cache.get(parent_id)
+        if table is not None:
+            return table
 
         internal_parent_id = self._parse_parent_id(parent_id)
         if internal_parent_id is None:
@@ -1334,87 +2080,77 @@ class IMDbDataProvider(BaseMetadataProvider):
 
         conn = self._get_connection()
         try:
-            row = conn.execute(
+            rows = conn.execute(
                 """
-                SELECT e.id, e.title, e.year, e.rating, e.votes, e.runtime_minutes
+                SELECT e.id, e.season, e.episode, e.title, e.year, e.rating, e.votes, e.runtime_minutes,
+                       s.search_title, s.search_title_lower, s.is_primary
                 FROM episode_core e
-                WHERE e.parent_id = ? AND e.season = ? AND e.episode = ?
-                LIMIT 1
+                LEFT JOIN episode_search s ON s.episode_id = e.id
+                WHERE e.parent_id = ?
+                ORDER BY e.season, e.episode, e.id
                 """,
-                (internal_parent_id, season, episode),
-            ).fetchone()
-            if row is None:
-                return None
-            episode_info = EpisodeInfo(
-                title=row["title"],
-                season=season,
-                episode=episode,
-                parent_id=parent_id,
-                id=f"tt{row['id']:07d}",
-                year=row["year"],
-                runtime_minutes=row["runtime_minutes"],
-                rating=float(row["rating"] / 10.0) if row["rating"] else None,
-                votes=row["votes"],
-            )
-            self._search_cache[cache_key] = episode_info
-            return episode_info
+                (internal_parent_id,),
+            ).fetchall()
         finally:
             self._return_connection(conn)
 
-    def list_episodes(self, parent_id: str, season: Optional[int] = None) -> List[EpisodeInfo]:
+        table = _EpisodeTable()
+        episodes_by_id: Dict[int, EpisodeInfo] = {}
+        for row in rows:
+            episode_info = episodes_by_id.get(row["id"])
+            if episode_info is None:
+                episode_info = episodes_by_id[row["id"]] = EpisodeInfo(
+                    title=row["title"],
+                    season=row["season"],
+                    episode=row["episode"],
+                    parent_id=parent_id,
+                    id=f"tt{row['id']:07d}",
+                    year=row["year"],
+                    runtime_minutes=row["runtime_minutes"],
+                    rating=float(row["rating"] / 10.0) if row["rating"] else None,
+                    votes=row["votes"],
+                )
+                table.episodes.append(episode_info)
+                table.by_number.setdefault((row["season"], row["episode"]), episode_info)
+            if row["search_title"] is not None:
+                table.search_rows.append(
+                    (
+                        row["search_title_lower"],
+                        self._normalize_episode_lookup_title(row["search_title"]),
+                        bool(row["is_primary"]),
+                        episode_info,
+                    )
+                )
+        self._episode_table_cache[parent_id] = table
+        return table
+
+    def get_episode_info(self, parent_id: str, season: int, episode: int) -> Optional[EpisodeInfo]:
         self._ensure_data_loaded()
-        cache_key = f"episodes_{parent_id}_{season}"
-        cached = self._search_cache.get(cache_key)
-        if isinstance(cached, list):
-            return cached
+        table = self._get_episode_table(parent_id)
+        if table is None:
+            return None
+        return table.by_number.get((season, episode))
 
-        internal_parent_id = self._parse_parent_id(parent_id)
-        if internal_parent_id is None:
+    def list_episodes(self, parent_id: str, season: Optional[int] = None) -> List[EpisodeInfo]:
+        self._ensure_data_loaded()
+        table = self._get_episode_table(parent_id)
+        if table is None:
             return []
-
-        conn = self._get_connection()
-        try:
-            params: List[Any] = [internal_parent_id]
-            sql = (
-                "SELECT e.id, e.season, e.episode, e.title, e.year, e.rating, e.votes, e.runtime_minutes "
-                "FROM episode_core e WHERE e.parent_id = ?"
-            )
-            if season is not None:
-                sql += " AND e.season = ?"
-                params.append(season)
-            sql += " ORDER BY e.season, e.episode, e.id"
-            rows = conn.execute(sql, tuple(params)).fetchall()
-
-            episodes: List[EpisodeInfo] = []
-            for row in rows:
-                if row["season"] is None or row["episode"] is None:
-                    continue
-                episodes.append(
-                    EpisodeInfo(
-                        title=row["title"],
-                        season=row["season"],
-                        episode=row["episode"],
-                        parent_id=parent_id,
-                        id=f"tt{row['id']:07d}",
-                        year=row["year"],
-                        runtime_minutes=row["runtime_minutes"],
-                        rating=float(row["rating"] / 10.0) if row["rating"] else None,
-                        votes=row["votes"],
-                    )
-                )
-            self._search_cache[cache_key] = episodes
-            return episodes
-        finally:
-            self._return_connection(conn)
+        return [
+            episode_info
+            for episode_info in table.episodes
+            if episode_info.season is not None
+            and episode_info.episode is not None
+            and (season is None or episode_info.season == season)
+        ]
 
     @staticmethod
     def _normalize_episode_lookup_title(text: Optional[str]) -> str:
         normalized = re.sub(r"[^\w\s]", " ", (text or "").lower())
         return re.sub(r"\s+", " ", normalized).strip()
 
-    @classmethod
-    def _score_episode_title_match(cls, normalized_query: str, candidate_title: Optional[str]) -> Optional[int]:
-        normalized_title = cls._normalize_episode_lookup_title(candidate_title)
+    @staticmethod
+    def _score_normalized_episode_title(normalized_query: str, normalized_title: str) -> Optional[int]:
         if not normalized_title:
             return None
         score = fuzz.ratio(normalized_query, normalized_title)
@@ -1424,103 +2160,64 @@ class IMDbDataProvider(BaseMetadataProvider):
             score += 25
         return int(score)
 
+    @classmethod
+    def _score_episode_title_match(cls, normalized_query: str, candidate_title: Optional[str]) -> Optional[int]:
+        return cls._score_normalized_episode_title(normalized_query, cls._normalize_episode_lookup_title(candidate_title))
+
     def find_episode_by_title(self, parent_id: str, episode_title: str, season: Optional[int] = None) -> Optional[EpisodeInfo]:
         self._ensure_data_loaded()
         normalized_query = self._normalize_episode_lookup_title(episode_title)
         if not normalized_query:
             return None
 
-        internal_parent_id = self._parse_parent_id(parent_id)
-        if internal_parent_id is None:
+        table = self._get_episode_table(parent_id)
+        if table is None:
             return None
+        search_rows = [
+            search_row for search_row in table.search_rows
+            if season is None or search_row[3].season == season
+        ]
 
-        conn = self._get_connection()
-        try:
-            params: List[Any] = [internal_parent_id, normalized_query]
-            exact_sql = (
-                "SELECT e.id, e.season, e.episode, e.title, e.year, e.rating, e.votes, e.runtime_minutes "
-                "FROM episode_search s JOIN episode_core e ON e.id = s.episode_id "
-                "WHERE s.parent_id = ? AND s.search_title_lower = ?"
-            )
-            if season is not None:
-                exact_sql += " AND e.season = ?"
-                params.append(season)
-            exact_sql += " ORDER BY s.is_primary DESC, COALESCE(e.votes, 0) DESC, e.season, e.episode LIMIT 1"
-            exact_row = conn.execute(exact_sql, tuple(params)).fetchone()
-            if exact_row is not None:
-                return EpisodeInfo(
-                    title=exact_row["title"],
-                    season=exact_row["season"],
-                    episode=exact_row["episode"],
-                    parent_id=parent_id,
-                    id=f"tt{exact_row['id']:07d}",
-                    year=exact_row["year"],
-                    runtime_minutes=exact_row["runtime_minutes"],
-                    rating=float(exact_row["rating"] / 10.0) if exact_row["rating"] else None,
-                    votes=exact_row["votes"],
-                )
-
-            token_params: List[Any] = [internal_parent_id]
-            fuzzy_sql = (
-                "SELECT s.search_title, e.id, e.season, e.episode, e.title, e.year, e.rating, e.votes, e.runtime_minutes "
-                "FROM episode_search s JOIN episode_core e ON e.id = s.episode_id "
-                "WHERE s.parent_id = ?"
-            )
-            if season is not None:
-                fuzzy_sql += " AND e.season = ?"
-                token_params.append(season)
-            tokens = [token for token in normalized_query.split() if token]
-            for token in tokens[:4]:
-                fuzzy_sql += " AND s.search_title_lower LIKE ?"
-                token_params.append(f"%{token}%")
-            fuzzy_sql += " ORDER BY COALESCE(e.votes, 0) DESC LIMIT ?"
-            token_params.append(self.EPISODE_FUZZY_LIMIT)
-
-            candidate_rows = conn.execute(fuzzy_sql, tuple(token_params)).fetchall()
-            if not candidate_rows:
-                fallback_params: List[Any] = [internal_parent_id]
-                fallback_sql = (
-                    "SELECT s.search_title, e.id, e.season, e.episode, e.title, e.year, e.rating, e.votes, e.runtime_minutes "
-                    "FROM episode_search s JOIN episode_core e ON e.id = s.episode_id "
-                    "WHERE s.parent_id = ?"
-                )
-                if season is not None:
-                    fallback_sql += " AND e.season = ?"
-                    fallback_params.append(season)
-                fallback_sql += " ORDER BY COALESCE(e.votes, 0) DESC LIMIT ?"
-                fallback_params.append(self.EPISODE_FUZZY_LIMIT)
-                candidate_rows = conn.execute(fallback_sql, tuple(fallback_params)).fetchall()
-            if not candidate_rows:
-                return None
-
-            best_row = None
-            best_score = -1
-            for row in candidate_rows:
-                score = self._score_episode_title_match(normalized_query, row["search_title"])
-                if score is None:
-                    continue
-                if row["votes"]:
-                    score += int(min(20, math.log10(max(1, row["votes"])) * 3))
-                if score > best_score:
-                    best_score = score
-                    best_row = row
-
-            if best_row is None or best_score < 70:
-                return None
+        def votes(search_row: Tuple[str, str, bool, EpisodeInfo]) -> int:
+            return search_row[3].votes or 0
+
+        exact_rows = [search_row for search_row in search_rows if search_row[0] == normalized_query]
+        if exact_rows:
+            # Primary titles first, then most votes, then earliest episode (unnumbered first, like SQL NULLs)
+            return min(
+                exact_rows,
+                key=lambda search_row: (
+                    not search_row[2],
+                    -votes(search_row),
+                    search_row[3].season is not None, search_row[3].season or 0,
+                    search_row[3].episode is not None, search_row[3].episode or 0,
+                ),
+            )[3]
+
+        tokens = [token for token in normalized_query.split() if token][:4]
+        candidate_rows = [
+            search_row for search_row in search_rows
+            if all(token in search_row[0] for token in tokens)
+        ]
+        if not candidate_rows:
+            candidate_rows = search_rows
+        candidate_rows = sorted(candidate_rows, key=lambda search_row: -votes(search_row))[: self.EPISODE_FUZZY_LIMIT]
+
+        best_episode = None
+        best_score = -1
+        for _search_lower, normalized_title, _is_primary, episode_info in candidate_rows:
+            score = self._score_normalized_episode_title(normalized_query, normalized_title)
+            if score is None:
+                continue
+            if episode_info.votes:
+                score += int(min(20, math.log10(max(1, episode_info.votes)) * 3))
+            if score > best_score:
+                best_score = score
+                best_episode = episode_info
 
-            return EpisodeInfo(
-                title=best_row["title"],
-                season=best_row["season"],
-                episode=best_row["episode"],
-                parent_id=parent_id,
-                id=f"tt{best_row['id']:07d}",
-                year=best_row["year"],
-                runtime_minutes=best_row["runtime_minutes"],
-                rating=float(best_row["rating"] / 10.0) if best_row["rating"] else None,
-                votes=best_row["votes"],
-            )
-        finally:
-            self._return_connection(conn)
+        if best_episode is None or best_score < 70:
+            return None
+        return best_episode
 
     def _build_fts_queries(self, title: str) -> List[str]:
         normalized = re.sub(r"[^\w\s]", " ", title.lower())
@@ -1568,7 +2265,7 @@ class IMDbDataProvider(BaseMetadataProvider):
             print(f"[sql-many {elapsed_ms:9.2f} ms] {location} :: {sql_preview}")
 
     def _optimize_database_for_reads(self) -> None:
-        with sqlite3.connect(self._db_path, timeout=60.0) as conn:
+        with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
             self._timed_execute(conn, "CREATE INDEX IF NOT EXISTS idx_title_core_type_year ON title_core(type, year)")
             self._timed_execute(conn, "CREATE INDEX IF NOT EXISTS idx_title_core_votes ON title_core(votes DESC)")
             self._timed_execute(conn, "CREATE INDEX IF NOT EXISTS idx_title_search_lower_id ON title_search(search_title_lower, title_id)")
@@ -1587,10 +2284,25 @@ class IMDbDataProvider(BaseMetadataProvider):
             self._timed_execute(conn, "INSERT INTO title_fts (title, title_id) SELECT search_title, title_id FROM title_search")
             self._timed_execute(conn, "INSERT INTO title_fts(title_fts) VALUES('optimize')")
             conn.commit()
+            self._build_trigram_index(conn)
 
-    def refresh_data(self) -> None:
+    def _build_trigram_index(self, conn: sqlite3.Connection) -> None:
+        entries = self._trigram_index.rebuild(
+            conn, self._timed_execute(conn, "SELECT title_id, search_title FROM title_search").fetchall()
+        )
+        conn.commit()
+        logging.info("Indexed %s IMDb titles for trigram search", entries)
+
+    def _ensure_trigram_index(self) -> None:
+        """Build the trigram index for databases loaded before it existed."""
+        with sql_profiler.connect(self._db_path, timeout=60.0) as conn:
+            if not self._trigram_index.is_built(conn) and self._has_title_search_data():
+                self._build_trigram_index(conn)
+
+    def refresh_data(self, incremental: bool = False) -> None:
         self.set_cache_expiry(0)
         self._search_cache.clear()
         self._title_cache.clear()
+        self._episode_table_cache.clear()
         self._clear_loaded_state()
-        self._ensure_data_loaded()
+        self._ensure_data_loaded(allow_incremental=incremental)
@@ -0,0 +1,221 @@
+"""Persistent cross-run cache for provider find_title results.
+
+Entries live in ``~/.video_metadata_cache/lookup_cache.db`` and are keyed by
+provider, dataset version, normalized title, year and preferred type. Negative
+results (no match) are cached too. A provider's dataset version changes when
+its data is reloaded, so entries from older versions stop matching and are
+purged the first time the new version is seen.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+from metadata_provider import MatchResult, TitleInfo
+
+QueryKey = Tuple[str, Optional[int], Optional[str]]
+
+
+class LookupCache:
+    """SQLite-backed find_title result cache with hit/miss accounting; safe to share between threads."""
+
+    # Pending writes are committed in batches; flush() also runs at exit
+    FLUSH_EVERY = 200
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or self.default_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending_writes = 0
+        # provider -> [hits, misses] not yet added to lookup_stats
+        self._pending_stats: Dict[str, list] = {}
+        self._purged_versions: Dict[str, str] = {}
+        # One connection shared by all threads, so every use is serialized
+        self._lock = threading.RLock()
+        atexit.register(self.close)
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(os.path.expanduser("~"), ".video_metadata_cache", "lookup_cache.db")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS lookup_cache (
+                    provider TEXT NOT NULL,
+                    dataset_version TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    preferred_type TEXT NOT NULL,
+                    title_id TEXT,
+                    score REAL,
+                    provider_weight REAL,
+                    info TEXT,
+                    created INTEGER NOT NULL,
+                    PRIMARY KEY (provider, dataset_version, title, year, preferred_type)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS lookup_stats (
+                    provider TEXT PRIMARY KEY,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    misses INTEGER NOT NULL DEFAULT 0,
+                    updated INTEGER
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key_params(query_key: QueryKey) -> Tuple[str, int, str]:
+        # NULLs are never equal in a primary key, so store sentinels instead
+        title, year, preferred_type = query_key
+        return title, year if year is not None else 0, preferred_type or ""
+
+    def _count(self, provider: str, hit: bool) -> None:
+        counters = self._pending_stats.setdefault(provider, [0, 0])
+        counters[0 if hit else 1] += 1
+
+    def _purge_old_versions(self, provider: str, dataset_version: str) -> None:
+        if self._purged_versions.get(provider) == dataset_version:
+            return
+        conn = self._get_connection()
+        deleted = conn.execute(
+            "DELETE FROM lookup_cache WHERE provider = ? AND dataset_version != ?",
+            (provider, dataset_version),
+        ).rowcount
+        if deleted:
+            logging.info("Dropped %s lookup cache entries for %s from older dataset versions", deleted, provider)
+        self._purged_versions[provider] = dataset_version
+
+    def get(self, provider: str, dataset_version: str, query_key: QueryKey) -> Tuple[bool, Optional[MatchResult]]:
+        """Return (found, result); result is None for a cached negative lookup."""
+        with self._lock:
+            try:
+                self._purge_old_versions(provider, dataset_version)
+                row = self._get_connection().execute(
+                    """
+                    SELECT title_id, score, provider_weight, info FROM lookup_cache
+                    WHERE provider = ? AND dataset_version = ? AND title = ? AND year = ? AND preferred_type = ?
+                    """,
+                    (provider, dataset_version) + self._key_params(query_key),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logging.debug("Lookup cache read failed: %s", exc)
+                return False, None
+
+            if row is None:
+                self._count(provider, hit=False)
+                return False, None
+            self._count(provider, hit=True)
+            title_id, score, provider_weight, info = row
+            if title_id is None or info is None:
+                return True, None
+            try:
+                title_info = TitleInfo(**json.loads(info))
+            except (TypeError, ValueError):
+                return False, None
+            return True, MatchResult(title_info, score, provider_weight if provider_weight is not None else 1.0)
+
+    def put(self, provider: str, dataset_version: str, query_key: QueryKey, result: Optional[MatchResult]) -> None:
+        with self._lock:
+            info = getattr(result, "info", None)
+            try:
+                self._get_connection().execute(
+                    """
+                    INSERT OR REPLACE INTO lookup_cache
+                        (provider, dataset_version, title, year, preferred_type, title_id, score, provider_weight, info, created)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (provider, dataset_version)
+                    + self._key_params(query_key)
+                    + (
+                        str(info.id) if info is not None else None,
+                        result.score if info is not None else None,
+                        result.provider_weight if info is not None else None,
+                        json.dumps(asdict(info)) if info is not None else None,
+                        int(time.time()),
+                    ),
+                )
+            except sqlite3.Error as exc:
+                logging.debug("Lookup cache write failed: %s", exc)
+                return
+            self._pending_writes += 1
+            if self._pending_writes >= self.FLUSH_EVERY:
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit pending entries and add hit/miss counters to lookup_stats."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                now_ts = int(time.time())
+                for provider, (hits, misses) in self._pending_stats.items():
+                    self._conn.execute(
+                        """
+                        INSERT INTO lookup_stats (provider, hits, misses, updated) VALUES (?, ?, ?, ?)
+                        ON CONFLICT(provider) DO UPDATE SET
+                            hits = hits + excluded.hits,
+                            misses = misses + excluded.misses,
+                            updated = excluded.updated
+                        """,
+                        (provider, hits, misses, now_ts),
+                    )
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                logging.debug("Lookup cache flush failed: %s", exc)
+                return
+            self._pending_stats.clear()
+            self._pending_writes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-provider entries, negative entries, hits, misses and hit rate (includes unflushed counters)."""
+        with self._lock:
+            self.flush()
+            conn = self._get_connection()
+            result: Dict[str, dict] = {}
+            for provider, entries, negative in conn.execute(
+                "SELECT provider, COUNT(*), SUM(title_id IS NULL) FROM lookup_cache GROUP BY provider"
+            ):
+                result[provider] = {"entries": entries, "negative_entries": negative or 0, "hits": 0, "misses": 0}
+            for provider, hits, misses in conn.execute("SELECT provider, hits, misses FROM lookup_stats"):
+                entry = result.setdefault(provider, {"entries": 0, "negative_entries": 0})
+                entry["hits"] = hits
+                entry["misses"] = misses
+            for entry in result.values():
+                total = entry["hits"] + entry["misses"]
+                entry["hit_rate"] = entry["hits"] / total if total else None
+            return result
+
+    def clear(self, provider: Optional[str] = None) -> None:
+        with self._lock:
+            conn = self._get_connection()
+            if provider:
+                conn.execute("DELETE FROM lookup_cache WHERE provider = ?", (provider,))
+                conn.execute("DELETE FROM lookup_stats WHERE provider = ?", (provider,))
+            else:
+                conn.execute("DELETE FROM lookup_cache")
+                conn.execute("DELETE FROM lookup_stats")
+            conn.commit()
+            self._purged_versions.clear()
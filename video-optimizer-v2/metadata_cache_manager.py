@@ -1,23 +1,32 @@
 """Command-line tool to manage metadata provider caches.
 
 Supported operations:
-- refresh: invalidate cache and reload data
+- refresh: invalidate cache and reload data (--incremental applies row diffs for IMDb)
 - invalidate: mark cache stale without reloading
 - set-expiry: adjust cache TTL via absolute date or relative days/weeks/months
-- status: print cache configuration for providers
+- status: print cache configuration for providers and the lookup cache hit rate
+- bench: measure cold/warm find_title and get_episode_info latency per provider
+- stress: call find_title from many threads, check results match a serial run and report throughput
+
+--profile-sql prints the provider SQL statements with the most total time at exit.
 
 Windows-friendly; no special dependencies beyond existing providers.
 """
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import os
+import random
 import re
 import sys
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Callable, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     from colorama import Fore, Style, init as colorama_init
@@ -37,6 +46,9 @@ except ImportError:
 
 from anime_metadata import AnimeDataProvider
 from imdb_metadata import IMDbDataProvider
+from bounded_cache import LRUCache
+from lookup_cache import LookupCache
+import sql_profiler
 
 ProviderMap = Dict[str, object]
 ProviderBuilderMap = Dict[str, Callable[[], object]]
@@ -46,6 +58,12 @@ PROVIDER_BUILDERS: ProviderBuilderMap = {
     "anime": AnimeDataProvider,
 }
 
+# Table with the titles `bench` samples when no corpus file is given
+BENCH_SAMPLE_TABLES = {
+    "imdb": "title_core",
+    "anime": "anime_title",
+}
+
 # Global color flag
 _use_color = True
 
@@ -245,12 +263,46 @@ def cmd_status(providers: Iterable[object]) -> None:
         # Always print data_file on its own line for clarity
         print(f"  data_file={_colorize_value(db_path or 'n/a')}")
 
+    _print_lookup_cache_status()
+
 
-def cmd_refresh(providers: Iterable[object]) -> None:
+def _print_lookup_cache_status() -> None:
+    """Print entries and hit rate of the persistent find_title lookup cache."""
+    path = LookupCache.default_path()
+    print(f"[{_colorize_provider('LookupCache')}] data_file={_colorize_value(path if os.path.exists(path) else 'n/a')}")
+    if not os.path.exists(path):
+        return
+    cache = LookupCache(path)
+    try:
+        stats = cache.stats()
+    except Exception as exc:
+        logging.error("Failed to read lookup cache stats: %s", exc)
+        return
+    finally:
+        cache.close()
+    if not stats:
+        print("  no lookups recorded")
+        return
+    for provider_name, entry in sorted(stats.items()):
+        hit_rate = "n/a" if entry["hit_rate"] is None else f"{entry['hit_rate']:.1%}"
+        print(
+            f"  {provider_name}: entries={_colorize_value(str(entry['entries']))}"
+            f" negative={_colorize_value(str(entry['negative_entries']))}"
+            f" hits={_colorize_value(str(entry['hits']))} misses={_colorize_value(str(entry['misses']))}"
+            f" hit_rate={_colorize_value(hit_rate)}"
+        )
+
+
+def cmd_refresh(providers: Iterable[object], workers: int | None = None, incremental: bool = False) -> None:
     for provider in providers:
         name = provider.__class__.__name__
+        if workers is not None and hasattr(provider, "REBUILD_WORKERS"):
+            provider.REBUILD_WORKERS = workers
         logging.info("Refreshing %s", name)
-        provider.refresh_data()
+        if incremental and hasattr(provider, "INCREMENTAL_REFRESH"):
+            provider.refresh_data(incremental=True)
+        else:
+            provider.refresh_data()
         logging.info("Refreshed %s", name)
 
 
@@ -332,17 +384,222 @@ def cmd_set_default_ttl(providers: Iterable[object], seconds: int) -> None:
             logging.error("[%s] Failed to set default_ttl: %s", name, exc)
 
 
+BenchQuery = Tuple[str, Optional[int]]
+# TitleInfo types whose first episode `bench` looks up
+BENCH_SERIES_TYPES = {"tv", "tvSeries", "tvMiniSeries", "anime_series"}
+
+
+def _load_bench_corpus(path: str) -> List[BenchQuery]:
+    """Read one title per line, optionally followed by a tab and a year; '#' starts a comment."""
+    queries: List[BenchQuery] = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            title, _, year_text = line.partition("\t")
+            year = int(year_text) if year_text.strip().isdigit() else None
+            queries.append((title.strip(), year))
+    return queries
+
+
+def _sample_bench_queries(provider: object, table: str, count: int, seed: int) -> List[BenchQuery]:
+    """Deterministically sample ``count`` (title, year) pairs from a provider table."""
+    loader = getattr(provider, "load_database", None) or getattr(provider, "_ensure_data_loaded", None)
+    if callable(loader):
+        loader()
+    conn = provider._get_connection()
+    try:
+        ids = [row[0] for row in conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+        sampled_ids = random.Random(seed).sample(ids, min(count, len(ids)))
+        titles: Dict[int, BenchQuery] = {}
+        for start in range(0, len(sampled_ids), 500):
+            chunk = sampled_ids[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            for row in conn.execute(f"SELECT id, title, year FROM {table} WHERE id IN ({placeholders})", chunk):
+                titles[row[0]] = (row[1], row[2])
+    finally:
+        provider._return_connection(conn)
+    return [titles[title_id] for title_id in sampled_ids if title_id in titles]
+
+
+def _clear_provider_caches(provider: object) -> None:
+    """Drop the provider's in-memory lookup caches so the next pass starts cold."""
+    for value in vars(provider).values():
+        if isinstance(value, LRUCache):
+            value.clear()
+
+
+@contextmanager
+def _count_sql_statements(provider: object) -> Iterator[Dict[str, int]]:
+    """Count SQL statements run on connections the provider hands out while active."""
+    counter = {"statements": 0}
+
+    def trace(_statement: str) -> None:
+        counter["statements"] += 1
+
+    original_get_connection = provider._get_connection
+    traced_connections = []
+
+    def get_connection():
+        conn = original_get_connection()
+        conn.set_trace_callback(trace)
+        traced_connections.append(conn)
+        return conn
+
+    provider._get_connection = get_connection
+    try:
+        yield counter
+    finally:
+        del provider._get_connection
+        for conn in traced_connections:
+            try:
+                conn.set_trace_callback(None)
+            except Exception:
+                pass
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _latency_summary(latencies: List[float], statements: int, matches: int) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000.0, 3) if value is not None else None
+
+    return {
+        "lookups": len(ordered),
+        "matches": matches,
+        "total_seconds": round(total, 4),
+        "lookups_per_second": round(len(ordered) / total, 1) if total > 0 else None,
+        "p50_ms": ms(_percentile(ordered, 0.50)),
+        "p95_ms": ms(_percentile(ordered, 0.95)),
+        "p99_ms": ms(_percentile(ordered, 0.99)),
+        "max_ms": ms(ordered[-1] if ordered else None),
+        "sql_statements": statements,
+    }
+
+
+def _bench_pass(provider: object, queries: List[BenchQuery], episodes: bool) -> Dict[str, Dict[str, Any]]:
+    """Run find_title over ``queries``, then get_episode_info (S01E01) for every series matched."""
+    title_latencies: List[float] = []
+    title_matches = 0
+    series_ids: List[Any] = []
+    with _count_sql_statements(provider) as title_sql:
+        for title, year in queries:
+            started_at = time.perf_counter()
+            result = provider.find_title(title, year)
+            title_latencies.append(time.perf_counter() - started_at)
+            info = getattr(result, "info", None)
+            if info is None:
+                continue
+            title_matches += 1
+            if getattr(info, "type", None) in BENCH_SERIES_TYPES:
+                series_ids.append(info.id)
+    report = {"find_title": _latency_summary(title_latencies, title_sql["statements"], title_matches)}
+    if episodes:
+        episode_latencies: List[float] = []
+        episode_matches = 0
+        with _count_sql_statements(provider) as episode_sql:
+            for parent_id in series_ids:
+                started_at = time.perf_counter()
+                episode_info = provider.get_episode_info(parent_id, 1, 1)
+                episode_latencies.append(time.perf_counter() - started_at)
+                episode_matches += episode_info is not None
+        report["get_episode_info"] = _latency_summary(episode_latencies, episode_sql["statements"], episode_matches)
+    return report
+
+
+def _result_signature(result: Any) -> Optional[Tuple[str, float]]:
+    info = getattr(result, "info", None)
+    if info is None:
+        return None
+    return str(info.id), round(float(result.score), 6)
+
+
+def _stress_thread_counts(max_threads: int) -> List[int]:
+    """1, 2, 4, ... up to and including ``max_threads``."""
+    counts = []
+    threads = 1
+    while threads < max_threads:
+        counts.append(threads)
+        threads *= 2
+    counts.append(max(1, max_threads))
+    return counts
+
+
+def _stress_round(
+    provider: object,
+    queries: List[BenchQuery],
+    expected: List[Optional[Tuple[str, float]]],
+    threads: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    """Run every query ``repeat`` times on ``threads`` threads, starting from cold provider caches."""
+    set_reader_count = getattr(provider, "set_reader_count", None)
+    if callable(set_reader_count):
+        set_reader_count(threads)
+    _clear_provider_caches(provider)
+    # Each thread walks the queries in its own order so threads collide on both hits and misses
+    jobs = [list(range(len(queries))) for _ in range(repeat)]
+    for seed, job in enumerate(jobs):
+        random.Random(seed).shuffle(job)
+    indexes = [index for job in jobs for index in job]
+
+    def lookup(index: int) -> Tuple[int, Any]:
+        title, year = queries[index]
+        try:
+            return index, _result_signature(provider.find_title(title, year))
+        except Exception as exc:
+            return index, exc
+
+    mismatches = 0
+    errors = 0
+    first_problem = None
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for index, outcome in executor.map(lookup, indexes, chunksize=8):
+            if isinstance(outcome, Exception):
+                errors += 1
+            elif outcome != expected[index]:
+                mismatches += 1
+            else:
+                continue
+            if first_problem is None:
+                first_problem = f"{queries[index][0]!r}: expected {expected[index]}, got {outcome!r}"
+    elapsed = time.perf_counter() - started_at
+    return {
+        "threads": threads,
+        "lookups": len(indexes),
+        "seconds": round(elapsed, 4),
+        "lookups_per_second": round(len(indexes) / elapsed, 1) if elapsed > 0 else None,
+        "mismatches": mismatches,
+        "errors": errors,
+        "first_problem": first_problem,
+    }
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Metadata cache manager")
     provider_choices = list(PROVIDER_BUILDERS.keys()) + ["all"]
     parser.add_argument("--provider", "-p", action="append", default=None, choices=provider_choices, help="Target provider(s). Repeat flag for multiple providers, e.g. -p imdb -p anime")
     parser.add_argument("--verbose", "-v", action="count", default=0, help="Increase verbosity")
     parser.add_argument("--no-color", action="store_true", help="Disable colored output")
+    parser.add_argument("--profile-sql", action="store_true", help=f"Profile provider SQL and print the top statements by total time at exit ({sql_profiler.PROFILE_ENV_VAR}=N env also works and sets how many)")
 
     sub = parser.add_subparsers(dest="command", required=True)
 
     sub.add_parser("status", help="Show cache configuration")
-    sub.add_parser("refresh", help="Invalidate then reload cache")
+    refresh = sub.add_parser("refresh", help="Invalidate then reload cache")
+    refresh.add_argument("--incremental", action="store_true", help="Only re-download changed datasets and apply row diffs instead of a full rebuild (IMDb)")
+    refresh.add_argument("--workers", type=int, default=None, help="Worker processes for parsing IMDb datasets during the rebuild (default: serial; IMDB_REBUILD_WORKERS env also works)")
     sub.add_parser("invalidate", help="Mark cache stale without reload")
 
     expiry = sub.add_parser("set-expiry", help="Adjust cache expiry")
@@ -355,9 +612,141 @@ def build_parser() -> argparse.ArgumentParser:
     default_ttl.add_argument("--provider", "-p", action="append", dest="provider_override", default=None, choices=provider_choices, help="Target provider(s) for this command. Repeat flag for multiple providers")
     default_ttl.add_argument("days", type=int, help="Number of calendar days to set as default_ttl for provider datasets")
 
+    bench = sub.add_parser("bench", help="Measure find_title/get_episode_info latency per provider")
+    bench.add_argument("--corpus", help="File with one title per line (optionally '<title><TAB><year>'); default: sample titles from each provider's database")
+    bench.add_argument("--sample", type=int, default=200, help="Titles to sample per provider when no corpus is given (default: 200)")
+    bench.add_argument("--seed", type=int, default=0, help="Random seed for sampling, so runs are comparable (default: 0)")
+    bench.add_argument("--warm-passes", type=int, default=1, help="Warm passes after the cold pass (default: 1)")
+    bench.add_argument("--no-episodes", action="store_true", help="Skip the get_episode_info passes")
+    bench.add_argument("--json", dest="json_output", metavar="PATH", help="Write the report as JSON to PATH ('-' for stdout)")
+
+    stress = sub.add_parser("stress", help="Run find_title concurrently and check the results against a serial run")
+    stress.add_argument("--corpus", help="File with one title per line (optionally '<title><TAB><year>'); default: sample titles from each provider's database")
+    stress.add_argument("--sample", type=int, default=200, help="Titles to sample per provider when no corpus is given (default: 200)")
+    stress.add_argument("--seed", type=int, default=0, help="Random seed for sampling (default: 0)")
+    stress.add_argument("--threads", type=int, default=16, help="Highest thread count; rounds run with 1, 2, 4, ... threads up to it (default: 16)")
+    stress.add_argument("--repeat", type=int, default=4, help="Times each title is looked up per round (default: 4)")
+    stress.add_argument("--json", dest="json_output", metavar="PATH", help="Write the report as JSON to PATH ('-' for stdout)")
+
     return parser
 
 
+def cmd_bench(providers: ProviderMap, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run a cold pass and ``--warm-passes`` warm passes per provider and return the report.
+
+    The cold pass starts with the provider's in-memory caches cleared; SQLite
+    and OS page caches stay as they are. The persistent lookup cache is not
+    involved because providers are queried directly.
+    """
+    corpus = _load_bench_corpus(args.corpus) if args.corpus else None
+    report: Dict[str, Any] = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "corpus": args.corpus or f"sample:{args.sample}:seed={args.seed}",
+        "providers": {},
+    }
+    for name, provider in providers.items():
+        if corpus is not None:
+            queries = corpus
+        else:
+            queries = _sample_bench_queries(provider, BENCH_SAMPLE_TABLES[name], args.sample, args.seed)
+        loader = getattr(provider, "load_database", None) or getattr(provider, "_ensure_data_loaded", None)
+        if callable(loader):
+            loader()
+        get_version = getattr(provider, "get_dataset_version", None)
+
+        _clear_provider_caches(provider)
+        passes = {"cold": _bench_pass(provider, queries, not args.no_episodes)}
+        for index in range(max(0, args.warm_passes)):
+            key = "warm" if args.warm_passes == 1 else f"warm_{index + 1}"
+            passes[key] = _bench_pass(provider, queries, not args.no_episodes)
+
+        report["providers"][provider.__class__.__name__] = {
+            "dataset_version": get_version() if callable(get_version) else None,
+            "queries": len(queries),
+            "passes": passes,
+        }
+    return report
+
+
+def _print_bench_report(report: Dict[str, Any]) -> None:
+    def fmt(value: Any, suffix: str = "") -> str:
+        return "n/a" if value is None else f"{value}{suffix}"
+
+    print(f"corpus={_colorize_value(report['corpus'])}")
+    for provider_name, provider_report in report["providers"].items():
+        print(
+            f"[{_colorize_provider(provider_name)}] queries={_colorize_value(str(provider_report['queries']))}"
+            f" dataset_version={_colorize_value(fmt(provider_report['dataset_version']))}"
+        )
+        for pass_name, operations in provider_report["passes"].items():
+            for operation, stats in operations.items():
+                print(
+                    f"  {pass_name:<7} {operation:<16}"
+                    f" n={_colorize_value(str(stats['lookups']))}"
+                    f" matches={_colorize_value(str(stats['matches']))}"
+                    f" p50={_colorize_value(fmt(stats['p50_ms'], 'ms'))}"
+                    f" p95={_colorize_value(fmt(stats['p95_ms'], 'ms'))}"
+                    f" p99={_colorize_value(fmt(stats['p99_ms'], 'ms'))}"
+                    f" rate={_colorize_value(fmt(stats['lookups_per_second'], '/s'))}"
+                    f" sql={_colorize_value(str(stats['sql_statements']))}"
+                )
+
+
+def cmd_stress(providers: ProviderMap, args: argparse.Namespace) -> Dict[str, Any]:
+    """Per provider, compare concurrent find_title results with a serial run and measure throughput."""
+    corpus = _load_bench_corpus(args.corpus) if args.corpus else None
+    report: Dict[str, Any] = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "corpus": args.corpus or f"sample:{args.sample}:seed={args.seed}",
+        "providers": {},
+    }
+    for name, provider in providers.items():
+        if corpus is not None:
+            queries = corpus
+        else:
+            queries = _sample_bench_queries(provider, BENCH_SAMPLE_TABLES[name], args.sample, args.seed)
+        _clear_provider_caches(provider)
+        expected = [_result_signature(provider.find_title(title, year)) for title, year in queries]
+        rounds = [
+            _stress_round(provider, queries, expected, threads, max(1, args.repeat))
+            for threads in _stress_thread_counts(args.threads)
+        ]
+        baseline = rounds[0]["lookups_per_second"]
+        for stress_round in rounds:
+            rate = stress_round["lookups_per_second"]
+            stress_round["speedup"] = round(rate / baseline, 2) if rate and baseline else None
+        report["providers"][provider.__class__.__name__] = {"queries": len(queries), "rounds": rounds}
+    return report
+
+
+def _print_stress_report(report: Dict[str, Any]) -> None:
+    def fmt(value: Any, suffix: str = "") -> str:
+        return "n/a" if value is None else f"{value}{suffix}"
+
+    print(f"corpus={_colorize_value(report['corpus'])}")
+    for provider_name, provider_report in report["providers"].items():
+        print(f"[{_colorize_provider(provider_name)}] queries={_colorize_value(str(provider_report['queries']))}")
+        for stress_round in provider_report["rounds"]:
+            print(
+                f"  threads={stress_round['threads']:<3}"
+                f" n={_colorize_value(str(stress_round['lookups']))}"
+                f" rate={_colorize_value(fmt(stress_round['lookups_per_second'], '/s'))}"
+                f" speedup={_colorize_value(fmt(stress_round['speedup'], 'x'))}"
+                f" mismatches={_colorize_value(str(stress_round['mismatches']))}"
+                f" errors={_colorize_value(str(stress_round['errors']))}"
+            )
+            if stress_round["first_problem"]:
+                print(f"    first problem: {stress_round['first_problem']}")
+
+
+def _stress_failed(report: Dict[str, Any]) -> bool:
+    return any(
+        stress_round["mismatches"] or stress_round["errors"]
+        for provider_report in report["providers"].values()
+        for stress_round in provider_report["rounds"]
+    )
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -373,6 +762,9 @@ def main(argv: List[str] | None = None) -> int:
     global _use_color
     _use_color = not args.no_color
 
+    if args.profile_sql:
+        sql_profiler.enable()
+
     selected_provider_names = _normalize_provider_selection(args.provider)
     if args.command == "set-default-ttl" and getattr(args, "provider_override", None):
         selected_provider_names = _normalize_provider_selection(args.provider_override)
@@ -386,7 +778,7 @@ def main(argv: List[str] | None = None) -> int:
     if args.command == "status":
         cmd_status(selected)
     elif args.command == "refresh":
-        cmd_refresh(selected)
+        cmd_refresh(selected, getattr(args, "workers", None), getattr(args, "incremental", False))
     elif args.command == "invalidate":
         cmd_invalidate(selected)
     elif args.command == "set-expiry":
@@ -394,6 +786,32 @@ def main(argv: List[str] | None = None) -> int:
         cmd_set_expiry(selected, days)
     elif args.command == "set-default-ttl":
         cmd_set_default_ttl(selected, int(args.days))
+    elif args.command == "bench":
+        selected_map = {name: provider for name, provider in providers_map.items() if provider in selected}
+        report = cmd_bench(selected_map, args)
+        if args.json_output == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            _print_bench_report(report)
+            if args.json_output:
+                with open(args.json_output, "w", encoding="utf-8") as handle:
+                    json.dump(report, handle, indent=2)
+                logging.info("Wrote bench report to %s", args.json_output)
+    elif args.command == "stress":
+        selected_map = {name: provider for name, provider in providers_map.items() if provider in selected}
+        report = cmd_stress(selected_map, args)
+        if args.json_output == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            _print_stress_report(report)
+            if args.json_output:
+                with open(args.json_output, "w", encoding="utf-8") as handle:
+                    json.dump(report, handle, indent=2)
+                logging.info("Wrote stress report to %s", args.json_output)
+        if _stress_failed(report):
+            return 1
     else:
         parser.error(f"Unknown command: {args.command}")
 
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Any, Tuple, Iterable, Callable
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Callable
 from datetime import datetime, timedelta
 from functools import lru_cache
 import os
@@ -8,8 +8,13 @@ import logging
 import requests
 import json
 import sqlite3
+import threading
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
+
+from bounded_cache import LRUCache
+import sql_profiler
 
 @dataclass
 class TitleInfo:
@@ -82,11 +87,20 @@ def _metadata_type_matches_preference(
 class BaseMetadataProvider(ABC):
     """Base class for metadata providers with common functionality"""
     DEFAULT_TTL_DAYS = 7
+    # Highest unweighted score find_title can return; None if unbounded. MetadataManager
+    # skips a provider once its weighted maximum cannot beat the best result so far.
+    MAX_MATCH_SCORE: Optional[float] = None
+    # Relative cost of a find_title call; MetadataManager queries cheaper providers first
+    LOOKUP_COST = 1.0
+    # Idle read connections kept per provider; size it to the number of reader threads
+    DEFAULT_READ_POOL_SIZE = min(32, (os.cpu_count() or 1) + 4)
     
     def __init__(self, cache_dir: str, cache_duration: timedelta = timedelta(days=7), provider_weight: float = 1.0):
         self.cache_dir = os.path.join(os.path.expanduser("~"), ".video_metadata_cache", cache_dir)
         self.cache_duration = cache_duration
         self.provider_weight = provider_weight
+        # Serializes database (re)loads so concurrent first lookups load once
+        self._load_lock = threading.RLock()
         self.ensure_cache_dir()
 
     def set_cache_duration(self, duration: timedelta) -> datetime:
@@ -120,7 +134,7 @@ class BaseMetadataProvider(ABC):
             datasets = getattr(self, "CACHE_EXPIRY_DATASETS", None)
             if db_path and datasets and os.path.exists(db_path):
                 placeholders = ','.join('?' for _ in datasets)
-                conn = sqlite3.connect(db_path, timeout=5.0)
+                conn = sql_profiler.connect(db_path, timeout=5.0)
                 # Try to read the new column first; if it doesn't exist the
                 # query will raise and we'll fall back to reading `updated`.
                 try:
@@ -165,6 +179,36 @@ class BaseMetadataProvider(ABC):
             "cache_expiry": expiry,
         }
     
+    # data_version schema migration shared by providers that keep a data_version table
+    @staticmethod
+    def _migrate_data_version_columns(conn) -> None:
+        # Ensure schema has required columns. Add `expires_at` (new), and
+        # keep `updated` for backward compatibility. If we added
+        # `expires_at`, migrate existing `updated` values into it.
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(data_version)").fetchall()]
+        if 'expires_at' not in cols:
+            try:
+                conn.execute("ALTER TABLE data_version ADD COLUMN expires_at INTEGER")
+                # Migrate existing `updated` values into `expires_at` when
+                # `expires_at` is NULL so old rows continue to represent
+                # expiry semantics.
+                try:
+                    conn.execute("UPDATE data_version SET expires_at = updated WHERE expires_at IS NULL")
+                except Exception:
+                    pass
+            except Exception:
+                pass
+        if 'default_ttl' not in cols:
+            try:
+                conn.execute("ALTER TABLE data_version ADD COLUMN default_ttl INTEGER")
+            except Exception:
+                pass
+        if 'last_modified' not in cols:
+            try:
+                conn.execute("ALTER TABLE data_version ADD COLUMN last_modified INTEGER")
+            except Exception:
+                pass
+
     # Hooks for subclasses to persist/load cache duration using their storage (e.g., SQLite)
     def _persist_cache_duration(self) -> None:  # pragma: no cover - override in subclasses
         # Persist cache expiry to provider DB `data_version` rows for the
@@ -184,33 +228,8 @@ class BaseMetadataProvider(ABC):
             return
 
         try:
-            conn = sqlite3.connect(db_path, timeout=5.0)
-            # Ensure schema has required columns. Add `expires_at` (new), and
-            # keep `updated` for backward compatibility. If we added
-            # `expires_at`, migrate existing `updated` values into it.
-            cols = [r[1] for r in conn.execute("PRAGMA table_info(data_version)").fetchall()]
-            if 'expires_at' not in cols:
-                try:
-                    conn.execute("ALTER TABLE data_version ADD COLUMN expires_at INTEGER")
-                    # Migrate existing `updated` values into `expires_at` when
-                    # `expires_at` is NULL so old rows continue to represent
-                    # expiry semantics.
-                    try:
-                        conn.execute("UPDATE data_version SET expires_at = updated WHERE expires_at IS NULL")
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-            if 'default_ttl' not in cols:
-                try:
-                    conn.execute("ALTER TABLE data_version ADD COLUMN default_ttl INTEGER")
-                except Exception:
-                    pass
-            if 'last_modified' not in cols:
-                try:
-                    conn.execute("ALTER TABLE data_version ADD COLUMN last_modified INTEGER")
-                except Exception:
-                    pass
+            conn = sql_profiler.connect(db_path, timeout=5.0)
+            self._migrate_data_version_columns(conn)
 
             now_ts = int(time.time())
             ttl_days = int(self.cache_duration.days)
@@ -270,7 +289,7 @@ class BaseMetadataProvider(ABC):
             return
 
         try:
-            conn = sqlite3.connect(db_path, timeout=5.0)
+            conn = sql_profiler.connect(db_path, timeout=5.0)
             expiries = []
             ttls = []
             last_mods = []
@@ -348,14 +367,33 @@ class BaseMetadataProvider(ABC):
         except Exception as e:
             logging.debug(f"Could not read cache expiry from provider DB: {e}")
     
+    def _loaded_in_process(self) -> bool:
+        """True while a database load validated earlier in this process has not expired."""
+        if not getattr(self, "_db_loaded_once", False):
+            return False
+        loaded_until_ts = getattr(self, "_db_loaded_until_ts", None)
+        return loaded_until_ts is None or time.time() < loaded_until_ts
+
     def ensure_cache_dir(self):
         """Create cache directory if it doesn't exist"""
         os.makedirs(self.cache_dir, exist_ok=True)
 
-    def _init_connection_pool(self, pool_size: int = 3) -> None:
-        """Initialize a simple SQLite connection pool."""
+    def _init_connection_pool(self, pool_size: Optional[int] = None) -> None:
+        """Initialize a thread-safe pool of read-only SQLite connections."""
         self._connection_pool = []
-        self._pool_size = max(0, int(pool_size))
+        self._pool_lock = threading.Lock()
+        self._pool_size = max(0, int(self.DEFAULT_READ_POOL_SIZE if pool_size is None else pool_size))
+
+    def set_reader_count(self, readers: int) -> None:
+        """Keep enough idle connections for ``readers`` concurrent threads."""
+        if not hasattr(self, "_pool_lock"):
+            return
+        with self._pool_lock:
+            self._pool_size = max(0, int(readers))
+            surplus = self._connection_pool[self._pool_size:]
+            del self._connection_pool[self._pool_size:]
+        for conn in surplus:
+            conn.close()
 
     def _configure_connection(self, conn: sqlite3.Connection) -> None:
         """Apply common read-optimized settings to a SQLite connection."""
@@ -366,32 +404,42 @@ class BaseMetadataProvider(ABC):
         conn.row_factory = sqlite3.Row
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a pooled SQLite connection or create a new one."""
-        pool = getattr(self, "_connection_pool", None)
-        if pool:
-            return pool.pop()
+        """Check out a read-only connection for the calling thread.
+
+        A connection is used by one thread at a time: it is pooled while idle
+        and may be handed to a different thread on its next checkout.
+        """
+        with self._pool_lock:
+            if self._connection_pool:
+                return self._connection_pool.pop()
 
         db_path = getattr(self, "_db_path", None)
         if not db_path:
             raise ValueError("_db_path is not set on provider")
 
-        conn = sqlite3.connect(db_path, timeout=30.0)
+        conn = sql_profiler.connect(
+            f"{Path(db_path).absolute().as_uri()}?mode=ro", uri=True, timeout=30.0, check_same_thread=False
+        )
         self._configure_connection(conn)
         return conn
 
     def _return_connection(self, conn: sqlite3.Connection) -> None:
         """Return a connection to the pool or close it."""
-        pool = getattr(self, "_connection_pool", None)
-        pool_size = getattr(self, "_pool_size", 0)
-
-        if pool is None or pool_size <= 0:
-            conn.close()
-            return
+        with self._pool_lock:
+            if len(self._connection_pool) < self._pool_size:
+                self._connection_pool.append(conn)
+                return
+        conn.close()
 
-        if len(pool) < pool_size:
-            pool.append(conn)
-        else:
-            conn.close()
+    def _close_connection_pool(self) -> None:
+        """Close idle pooled connections, e.g. before the database file is replaced."""
+        with self._pool_lock:
+            idle, self._connection_pool = self._connection_pool, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
 
     def _should_download_file(self, path: str, ttl: Optional[timedelta] = None) -> bool:
         """Return True when the file is missing or older than TTL."""
@@ -411,7 +459,7 @@ class BaseMetadataProvider(ABC):
             if not db_path:
                 return False
 
-            with sqlite3.connect(db_path) as conn:
+            with sql_profiler.connect(db_path) as conn:
                 ds_list = list(datasets) if datasets is not None else list(getattr(self, "CACHE_EXPIRY_DATASETS", []) or [])
                 now_ts = int(time.time())
                 count_current = 0
@@ -463,7 +511,7 @@ class BaseMetadataProvider(ABC):
         expired: List[str] = []
         now_ts = int(time.time())
         try:
-            with sqlite3.connect(db_path) as conn:
+            with sql_profiler.connect(db_path) as conn:
                 placeholders = ','.join('?' for _ in ds_list)
                 cur = conn.execute(
                     f"SELECT dataset, expires_at, updated FROM data_version WHERE dataset IN ({placeholders})",
@@ -501,6 +549,36 @@ class BaseMetadataProvider(ABC):
 
         return expired
 
+    def get_dataset_version(self) -> Optional[str]:
+        """Identify the loaded dataset contents for cross-run result caching.
+
+        Built from each dataset's ``last_modified`` (falling back to
+        ``updated``), so it changes whenever a dataset is reloaded from a new
+        source. Returns None when the provider has no versioned datasets, or
+        when they are missing or expired and a reload is due.
+        """
+        db_path = getattr(self, "_db_path", None)
+        ds_list = list(getattr(self, "CACHE_EXPIRY_DATASETS", []) or [])
+        if not db_path or not ds_list or not os.path.exists(db_path):
+            return None
+        if self._get_expired_datasets(ds_list):
+            return None
+        try:
+            conn = sql_profiler.connect(db_path, timeout=5.0)
+            try:
+                placeholders = ','.join('?' for _ in ds_list)
+                rows = dict(conn.execute(
+                    f"SELECT dataset, COALESCE(last_modified, updated) FROM data_version WHERE dataset IN ({placeholders})",
+                    tuple(ds_list),
+                ).fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+        if any(rows.get(ds) is None for ds in ds_list):
+            return None
+        return ";".join(f"{ds}:{rows[ds]}" for ds in sorted(ds_list))
+
     def _invalidate_cache_core(
         self,
         datasets: Optional[Iterable[str]] = None,
@@ -513,7 +591,7 @@ class BaseMetadataProvider(ABC):
 
         if db_path:
             try:
-                with sqlite3.connect(db_path) as conn:
+                with sql_profiler.connect(db_path) as conn:
                     if ds_list is None:
                         conn.execute("DELETE FROM data_version")
                     elif ds_list:
@@ -629,77 +707,414 @@ class BaseMetadataProvider(ABC):
         except (ValueError, TypeError):
             return None
 
+_NOT_CACHED = object()
+
+
 class MetadataManager:
     """Proxy class to handle multiple metadata providers with caching"""
+
+    TITLE_CACHE_MAX = 10000
+    PROVIDER_RESULT_CACHE_MAX = 20000
+    # Seconds; None keeps entries until evicted. Long-running services can set a TTL
+    # so results pick up provider data reloads without restarting.
+    CACHE_TTL = None
     
-    def __init__(self, providers: List[BaseMetadataProvider]):
+    def __init__(
+        self,
+        providers: List[BaseMetadataProvider],
+        persistent_cache: bool = True,
+        cascade: bool = True,
+        lookup_budget: Optional[float] = None,
+    ):
+        """
+        Args:
+            providers: Metadata providers to query
+            persistent_cache: Keep provider results in the on-disk lookup cache
+            cascade: Query providers in LOOKUP_COST order and skip those whose
+                MAX_MATCH_SCORE cannot beat the best result so far
+            lookup_budget: Seconds per find_title lookup; once spent and a match
+                exists, the remaining providers are skipped and the result is not cached
+        """
         self.providers = providers
-        # Cache for find_title results - key is (title, year)
-        self._title_cache = {}
+        self.cascade = cascade
+        self.lookup_budget = lookup_budget
+        # provider_name -> lookups, seconds, skipped_by_score, skipped_by_budget
+        self._provider_timings: Dict[str, Dict[str, float]] = {}
+        self._timings_lock = threading.Lock()
+        # Cache for find_title results - key is the normalized (title, year, preferred_type)
+        self._title_cache = LRUCache(self.TITLE_CACHE_MAX, ttl=self.CACHE_TTL, name="manager.title")
+        # Cache for raw per-provider results - key is (provider_name, normalized query key)
+        self._provider_result_cache = LRUCache(
+            self.PROVIDER_RESULT_CACHE_MAX, ttl=self.CACHE_TTL, name="manager.provider_result"
+        )
+        # On-disk per-provider result cache shared across runs (see lookup_cache.py)
+        self._lookup_cache = None
+        if persistent_cache:
+            try:
+                from lookup_cache import LookupCache
+                self._lookup_cache = LookupCache()
+            except Exception as e:
+                logging.warning(f"Persistent lookup cache unavailable: {e}")
+        # provider_name -> (data load token, dataset version) the persistent cache
+        # entries are keyed by; a None version is cached too, until the provider reloads
+        self._dataset_versions: Dict[str, Tuple[Any, Optional[str]]] = {}
 
     @staticmethod
     def _provider_name(provider: BaseMetadataProvider) -> str:
         return type(provider).__name__.casefold().strip()
 
-    def _find_title_with_provider(
+    @staticmethod
+    def _normalize_query_key(
+        title: str,
+        year: Optional[int] = None,
+        preferred_type: Optional[str] = None,
+    ) -> Tuple[str, Optional[int], Optional[str]]:
+        """Build the de-duplication key for a title lookup.
+
+        Providers match case-insensitively and collapse whitespace, so lookups
+        that only differ in case or spacing resolve to the same result.
+        """
+        normalized_title = " ".join(str(title or "").split()).casefold()
+        normalized_type = preferred_type.casefold().strip() if preferred_type else None
+        return normalized_title, year, normalized_type
+
+    def _cached_provider_result(
+        self,
+        provider: BaseMetadataProvider,
+        query_key: Tuple[str, Optional[int], Optional[str]],
+    ) -> Any:
+        """Memoized or persisted result for ``query_key``, or ``_NOT_CACHED``."""
+        provider_name = self._provider_name(provider)
+        cache_key = (provider_name, query_key)
+        cached = self._provider_result_cache.get(cache_key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
+
+        if self._lookup_cache is not None:
+            dataset_version = self._current_dataset_version(provider, provider_name)
+            if dataset_version is not None:
+                found, cached_result = self._lookup_cache.get(provider_name, dataset_version, query_key)
+                if found:
+                    self._provider_result_cache[cache_key] = cached_result
+                    return cached_result
+        return _NOT_CACHED
+
+    def _store_provider_result(
+        self,
+        provider: BaseMetadataProvider,
+        query_key: Tuple[str, Optional[int], Optional[str]],
+        result: Any,
+    ) -> Optional[MatchResult]:
+        """Memoize and persist a fresh provider result; anything but a MatchResult with info is stored as None."""
+        if not (isinstance(result, MatchResult) and getattr(result, "info", None)):
+            result = None
+        provider_name = self._provider_name(provider)
+        self._provider_result_cache[(provider_name, query_key)] = result
+
+        if self._lookup_cache is not None:
+            # The first lookup may have just loaded the provider's data, which changes its load token
+            dataset_version = self._current_dataset_version(provider, provider_name)
+            if dataset_version is not None:
+                self._lookup_cache.put(provider_name, dataset_version, query_key, result)
+        return result
+
+    def _query_provider(
         self,
         provider: BaseMetadataProvider,
         title: str,
         year: Optional[int] = None,
         preferred_type: Optional[str] = None,
-    ) -> Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]:
+    ) -> Optional[MatchResult]:
+        """Run a single provider lookup, memoized per provider and normalized query."""
+        query_key = self._normalize_query_key(title, year, preferred_type)
+        cached = self._cached_provider_result(provider, query_key)
+        if cached is not _NOT_CACHED:
+            return cached
+
         provider_find_with_type_hint = getattr(provider, "find_title_with_type_hint", None)
         if preferred_type and callable(provider_find_with_type_hint):
             result = provider_find_with_type_hint(title, preferred_type, year)
         else:
             result = provider.find_title(title, year)
-        result_info = getattr(result, "info", None)
-        if isinstance(result, MatchResult) and result_info:
-            return result_info, provider
-        return None, None
-    
-    def find_title(
+        return self._store_provider_result(provider, query_key, result)
+
+    def _query_provider_many(
+        self,
+        provider: BaseMetadataProvider,
+        queries: List[Tuple[str, Optional[int], Optional[str]]],
+    ) -> List[Optional[MatchResult]]:
+        """``_query_provider`` for many queries; uncached ones go to the provider's
+        ``find_titles`` in one call when it has one."""
+        provider_find_titles = getattr(provider, "find_titles", None)
+        if not callable(provider_find_titles):
+            return [self._query_provider(provider, *query) for query in queries]
+
+        results: List[Optional[MatchResult]] = []
+        uncached: List[Tuple[int, Tuple[str, Optional[int], Optional[str]]]] = []
+        for query in queries:
+            cached = self._cached_provider_result(provider, self._normalize_query_key(*query))
+            if cached is _NOT_CACHED:
+                uncached.append((len(results), query))
+                cached = None
+            results.append(cached)
+        if uncached:
+            fresh_results = provider_find_titles([query for _index, query in uncached])
+            for (index, query), result in zip(uncached, fresh_results):
+                results[index] = self._store_provider_result(provider, self._normalize_query_key(*query), result)
+        return results
+
+    def set_reader_count(self, readers: int) -> None:
+        """Size each provider's connection pool for ``readers`` threads calling find_title at once."""
+        for provider in self.providers:
+            set_provider_readers = getattr(provider, "set_reader_count", None)
+            if callable(set_provider_readers):
+                set_provider_readers(readers)
+
+    def cache_stats(self) -> List[dict]:
+        """Hit/miss/eviction counters of the manager's and its providers' in-memory caches."""
+        caches = [self._title_cache, self._provider_result_cache]
+        for provider in self.providers:
+            caches.extend(value for value in vars(provider).values() if isinstance(value, LRUCache))
+        return [cache.stats() for cache in caches]
+
+    def _provider_timing(self, provider: BaseMetadataProvider) -> Dict[str, float]:
+        # Callers hold _timings_lock
+        name = type(provider).__name__
+        timing = self._provider_timings.get(name)
+        if timing is None:
+            timing = self._provider_timings[name] = {
+                "lookups": 0,
+                "seconds": 0.0,
+                "skipped_by_score": 0,
+                "skipped_by_budget": 0,
+            }
+        return timing
+
+    def _count_provider_timing(self, provider: BaseMetadataProvider, **increments: float) -> None:
+        # find_title may run on several threads at once
+        with self._timings_lock:
+            timing = self._provider_timing(provider)
+            for field_name, amount in increments.items():
+                timing[field_name] += amount
+
+    def provider_timing_stats(self) -> List[dict]:
+        """Per-provider lookup counts and time, and how many lookups the cascade skipped."""
+        # Copy every provider's counters under one lock acquisition, then format them unlocked
+        with self._timings_lock:
+            timings = [(provider, dict(self._provider_timing(provider))) for provider in self.providers]
+        stats = []
+        for provider, timing in timings:
+            lookups = timing["lookups"]
+            stats.append({
+                "provider": type(provider).__name__,
+                "lookups": lookups,
+                "seconds": timing["seconds"],
+                "mean_ms": timing["seconds"] * 1000.0 / lookups if lookups else None,
+                "skipped_by_score": timing["skipped_by_score"],
+                "skipped_by_budget": timing["skipped_by_budget"],
+            })
+        return stats
+
+    def _cascade_order(self) -> List[BaseMetadataProvider]:
+        if not self.cascade:
+            return list(self.providers)
+        # sorted() is stable, so equal-cost providers keep their configured order
+        return sorted(self.providers, key=lambda provider: getattr(provider, "LOOKUP_COST", 1.0))
+
+    def _cannot_beat(
+        self,
+        provider: BaseMetadataProvider,
+        best: Optional[Tuple[float, int]],
+    ) -> bool:
+        """Whether ``provider`` cannot displace ``best`` = (weighted score, provider index).
+
+        _select_best_result keeps the earlier provider on ties, so a later
+        provider must strictly exceed the best score and an earlier one only match it.
+        """
+        if not self.cascade or best is None:
+            return False
+        max_score = getattr(provider, "MAX_MATCH_SCORE", None)
+        if max_score is None:
+            return False
+        best_score, best_index = best
+        ceiling = max_score * provider.provider_weight
+        if self.providers.index(provider) < best_index:
+            return ceiling < best_score
+        return ceiling <= best_score
+
+    @staticmethod
+    def _improves_best(
+        result: Optional[MatchResult],
+        index: int,
+        best: Optional[Tuple[float, int]],
+        preferred_type: Optional[str],
+    ) -> Optional[Tuple[float, int]]:
+        """The new (weighted score, provider index) to beat; only results of the preferred type count."""
+        if result is None or not _metadata_type_matches_preference(getattr(result.info, "type", None), preferred_type):
+            return best
+        candidate = (result.weighted_score, index)
+        if best is None or candidate[0] > best[0] or (candidate[0] == best[0] and index < best[1]):
+            return candidate
+        return best
+
+    @staticmethod
+    def _get_dataset_version(provider: BaseMetadataProvider) -> Optional[str]:
+        get_version = getattr(provider, "get_dataset_version", None)
+        return get_version() if callable(get_version) else None
+
+    @staticmethod
+    def _data_load_token(provider: BaseMetadataProvider) -> Tuple[bool, Optional[int]]:
+        """Changes whenever the provider loads, reloads or drops its data in this process."""
+        return getattr(provider, "_db_loaded_once", False), getattr(provider, "_db_loaded_until_ts", None)
+
+    def _current_dataset_version(self, provider: BaseMetadataProvider, provider_name: str) -> Optional[str]:
+        """Dataset version for persistent cache keys, read from the provider only after it (re)loads its data."""
+        load_token = self._data_load_token(provider)
+        cached = self._dataset_versions.get(provider_name)
+        if cached is not None and cached[0] == load_token:
+            return cached[1]
+        dataset_version = self._get_dataset_version(provider)
+        self._dataset_versions[provider_name] = (load_token, dataset_version)
+        return dataset_version
+
+    def _find_title_with_provider(
         self,
+        provider: BaseMetadataProvider,
         title: str,
         year: Optional[int] = None,
         preferred_type: Optional[str] = None,
     ) -> Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]:
-        """Try all providers and return the best match and the provider that found it (cached)."""
-        # Check cache first
-        cache_key = (title, year, preferred_type)
-        if cache_key in self._title_cache:
-            return self._title_cache[cache_key]
-        
+        result = self._query_provider(provider, title, year=year, preferred_type=preferred_type)
+        if result is not None:
+            return result.info, provider
+        return None, None
+
+    @staticmethod
+    def _select_best_result(
+        provider_results: Iterable[Tuple[BaseMetadataProvider, Optional[MatchResult]]],
+        preferred_type: Optional[str] = None,
+    ) -> Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]:
+        """Pick the highest weighted result, preferring ones that satisfy the type hint."""
         best_result: Optional[MatchResult] = None
         best_provider = None
         best_fallback_result: Optional[MatchResult] = None
         best_fallback_provider = None
-        
-        for provider in self.providers:
-            provider_find_with_type_hint = getattr(provider, "find_title_with_type_hint", None)
-            if preferred_type and callable(provider_find_with_type_hint):
-                result = provider_find_with_type_hint(title, preferred_type, year)
-            else:
-                result = provider.find_title(title, year)
-            result_info = getattr(result, "info", None)
-            if isinstance(result, MatchResult) and result_info:  # Make sure we have both a result and title info
-                if _metadata_type_matches_preference(getattr(result_info, "type", None), preferred_type):
-                    if not best_result or result.weighted_score > best_result.weighted_score:
-                        best_result = result
-                        best_provider = provider
-                elif not best_fallback_result or result.weighted_score > best_fallback_result.weighted_score:
-                    best_fallback_result = result
-                    best_fallback_provider = provider
+
+        for provider, result in provider_results:
+            if result is None:
+                continue
+            if _metadata_type_matches_preference(getattr(result.info, "type", None), preferred_type):
+                if not best_result or result.weighted_score > best_result.weighted_score:
+                    best_result = result
+                    best_provider = provider
+            elif not best_fallback_result or result.weighted_score > best_fallback_result.weighted_score:
+                best_fallback_result = result
+                best_fallback_provider = provider
 
         if best_result is None:
             best_result = best_fallback_result
             best_provider = best_fallback_provider
+
+        return (best_result.info if best_result else None, best_provider)
+    
+    def find_title(
+        self,
+        title: str,
+        year: Optional[int] = None,
+        preferred_type: Optional[str] = None,
+    ) -> Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]:
+        """Try all providers and return the best match and the provider that found it (cached)."""
+        # Check cache first
+        cache_key = self._normalize_query_key(title, year, preferred_type)
+        cached = self._title_cache.get(cache_key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
         
-        # Cache the result (even if None)
-        result_tuple = (best_result.info if best_result else None, best_provider)
-        self._title_cache[cache_key] = result_tuple
+        started_at = time.perf_counter()
+        results_by_index = {}
+        best = None
+        budget_exhausted = False
+        for provider in self._cascade_order():
+            if self._cannot_beat(provider, best):
+                self._count_provider_timing(provider, skipped_by_score=1)
+                continue
+            if (
+                self.lookup_budget is not None
+                and results_by_index
+                and any(result is not None for result in results_by_index.values())
+                and time.perf_counter() - started_at >= self.lookup_budget
+            ):
+                self._count_provider_timing(provider, skipped_by_budget=1)
+                budget_exhausted = True
+                continue
+            provider_started_at = time.perf_counter()
+            result = self._query_provider(provider, title, year, preferred_type)
+            self._count_provider_timing(provider, lookups=1, seconds=time.perf_counter() - provider_started_at)
+            index = self.providers.index(provider)
+            results_by_index[index] = result
+            best = self._improves_best(result, index, best, preferred_type)
+
+        provider_results = [(self.providers[index], results_by_index[index]) for index in sorted(results_by_index)]
+        result_tuple = self._select_best_result(provider_results, preferred_type)
+        # Cache the result (even if None), unless the budget cut the lookup short
+        if not budget_exhausted:
+            self._title_cache[cache_key] = result_tuple
         return result_tuple
 
+    def find_titles(
+        self,
+        queries: Iterable[Tuple[str, Optional[int], Optional[str]]],
+    ) -> List[Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]]:
+        """Resolve many (title, year, preferred_type) queries at once.
+
+        Queries are normalized and de-duplicated up front, each unique query is
+        resolved once per provider, and the results are fanned back out in the
+        order of ``queries``. Results share the cache used by ``find_title``.
+        The cascade skips providers per query as in ``find_title``; the
+        latency budget does not apply to batches.
+        """
+        query_list = list(queries)
+        query_keys = [self._normalize_query_key(*query) for query in query_list]
+
+        # First occurrence of each key supplies the title/year passed to providers.
+        # Results are collected locally so a bounded cache evicting mid-batch is harmless.
+        resolved = {}
+        pending = {}
+        for query, key in zip(query_list, query_keys):
+            if key in resolved or key in pending:
+                continue
+            cached = self._title_cache.get(key, _NOT_CACHED)
+            if cached is not _NOT_CACHED:
+                resolved[key] = cached
+            else:
+                pending[key] = query
+
+        if pending:
+            results_by_key = {key: {} for key in pending}
+            best_by_key = {key: None for key in pending}
+            # Provider-major order keeps each provider's connection and caches warm,
+            # and lets providers with a find_titles method resolve the batch in one call
+            for provider in self._cascade_order():
+                index = self.providers.index(provider)
+                keys = [key for key in pending if not self._cannot_beat(provider, best_by_key[key])]
+                self._count_provider_timing(provider, skipped_by_score=len(pending) - len(keys))
+                if not keys:
+                    continue
+                provider_started_at = time.perf_counter()
+                provider_results = self._query_provider_many(provider, [pending[key] for key in keys])
+                self._count_provider_timing(
+                    provider, lookups=len(keys), seconds=time.perf_counter() - provider_started_at
+                )
+                for key, result in zip(keys, provider_results):
+                    results_by_key[key][index] = result
+                    best_by_key[key] = self._improves_best(result, index, best_by_key[key], key[2])
+            for key, results_by_index in results_by_key.items():
+                provider_results = [(self.providers[index], results_by_index[index]) for index in sorted(results_by_index)]
+                resolved[key] = self._select_best_result(provider_results, key[2])
+                self._title_cache[key] = resolved[key]
+
+        return [resolved[key] for key in query_keys]
+
     def find_title_from_provider(
         self,
         title: str,
@@ -708,21 +1123,23 @@ class MetadataManager:
         preferred_type: Optional[str] = None,
     ) -> Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]:
         normalized_provider_name = provider_name.casefold().strip()
-        cache_key = (title, year, preferred_type, normalized_provider_name)
-        if cache_key in self._title_cache:
-            return self._title_cache[cache_key]
-
         for provider in self.providers:
             if self._provider_name(provider) != normalized_provider_name:
                 continue
-            result_tuple = self._find_title_with_provider(provider, title, year=year, preferred_type=preferred_type)
-            self._title_cache[cache_key] = result_tuple
-            return result_tuple
+            return self._find_title_with_provider(provider, title, year=year, preferred_type=preferred_type)
+        return None, None
 
-        result_tuple = (None, None)
-        self._title_cache[cache_key] = result_tuple
-        return result_tuple
+    def find_titles_from_provider(
+        self,
+        queries: Iterable[Tuple[str, Optional[int], Optional[str]]],
+        provider_name: str,
+    ) -> List[Tuple[Optional[TitleInfo], Optional[BaseMetadataProvider]]]:
+        """Batch variant of ``find_title_from_provider``; duplicate queries are resolved once."""
+        return [
+            self.find_title_from_provider(title, provider_name, year=year, preferred_type=preferred_type)
+            for title, year, preferred_type in queries
+        ]
     
     def get_episode_info(self, provider: BaseMetadataProvider, parent_id: str, season: int, episode: int) -> Optional[EpisodeInfo]:
         """Get episode info from a specific provider"""
-        return provider.get_episode_info(parent_id, season, episode)
\ No newline at end of file
+        return provider.get_episode_info(parent_id, season, episode)
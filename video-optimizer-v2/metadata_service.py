@@ -0,0 +1,689 @@
+"""Optional long-lived local metadata lookup service.
+
+Every CLI tool that builds a MetadataManager pays for importing the providers,
+validating their databases and warming cold SQLite and lookup caches on each
+run. ``python metadata_service.py serve`` keeps AnimeDataProvider and
+IMDbDataProvider instances loaded in one background process instead; tools
+that build their manager with ``create_metadata_manager`` get a
+``RemoteMetadataManager`` proxy when the service is running and their usual
+in-process manager when it is not. A proxy whose service goes away mid-run
+switches to in-process providers and keeps going.
+
+The service listens on a Unix socket in ``~/.video_metadata_cache`` (a named
+pipe on Windows) through ``multiprocessing.connection``. Connections are
+authenticated with a random key the service writes to
+``~/.video_metadata_cache/metadata_service.key`` (mode 0600), so only the
+same user's processes can talk to it.
+
+Usage:
+    python metadata_service.py serve
+    python metadata_service.py status
+    python metadata_service.py stop
+
+Set VIDEO_METADATA_SERVICE=0 to make tools ignore a running service.
+"""
+import argparse
+import logging
+import os
+import pickle
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from metadata_provider import MetadataManager
+
+SERVICE_ENV_VAR = "VIDEO_METADATA_SERVICE"
+PROTOCOL_VERSION = 1
+
+# Public provider attributes mirrored on the client-side provider stand-ins
+MIRRORED_PROVIDER_ATTRIBUTES = ("provider_weight", "cache_dir")
+# MetadataManager methods the service runs on behalf of clients
+REMOTE_MANAGER_METHODS = (
+    "find_title",
+    "find_titles",
+    "find_title_from_provider",
+    "find_titles_from_provider",
+)
+# Provider methods that only read, so they run alongside lookups; any other
+# provider method (refresh_data, set_cache_expiry, ...) runs on its own
+CONCURRENT_PROVIDER_METHODS = frozenset((
+    "find_title",
+    "find_titles",
+    "find_title_with_type_hint",
+    "find_episode_by_title",
+    "get_episode_info",
+    "list_episodes",
+    "cache_summary",
+    "get_cache_expiry",
+    "get_dataset_version",
+))
+
+
+def _cache_root() -> str:
+    return os.path.join(os.path.expanduser("~"), ".video_metadata_cache")
+
+
+def default_address() -> str:
+    if sys.platform == "win32":
+        user = re.sub(r"\W+", "_", os.environ.get("USERNAME", "user"))
+        return rf"\\.\pipe\video_metadata_service_{user}"
+    return os.path.join(_cache_root(), "metadata_service.sock")
+
+
+def authkey_path() -> str:
+    return os.path.join(_cache_root(), "metadata_service.key")
+
+
+def _read_authkey() -> Optional[bytes]:
+    try:
+        with open(authkey_path(), "rb") as handle:
+            return handle.read() or None
+    except OSError:
+        return None
+
+
+def _write_authkey() -> bytes:
+    key = secrets.token_bytes(32)
+    path = authkey_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(key)
+    return key
+
+
+def service_disabled() -> bool:
+    return os.environ.get(SERVICE_ENV_VAR, "").strip().lower() in ("0", "false", "no", "off")
+
+
+def _default_provider_factories() -> Dict[str, Callable[[], Any]]:
+    from anime_metadata import AnimeDataProvider
+    from imdb_metadata import IMDbDataProvider
+
+    return {"AnimeDataProvider": AnimeDataProvider, "IMDbDataProvider": IMDbDataProvider}
+
+
+def _weights_key(provider_weights: Optional[Dict[str, float]]) -> Tuple[Tuple[str, float], ...]:
+    return tuple(sorted((name, float(weight)) for name, weight in (provider_weights or {}).items()))
+
+
+def _picklable_error(exc: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exc)
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+class _SharedExclusiveLock:
+    """Many holders in shared mode or one in exclusive mode; waiting exclusive holders go first."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._shared_holders = 0
+        self._exclusive_held = False
+        self._exclusive_waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._condition:
+            while self._exclusive_held or self._exclusive_waiting:
+                self._condition.wait()
+            self._shared_holders += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._shared_holders -= 1
+                if not self._shared_holders:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._condition:
+            self._exclusive_waiting += 1
+            try:
+                while self._exclusive_held or self._shared_holders:
+                    self._condition.wait()
+            finally:
+                self._exclusive_waiting -= 1
+            self._exclusive_held = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._exclusive_held = False
+                self._condition.notify_all()
+
+
+class MetadataLookupService:
+    """Hosts warm providers and answers lookup requests from RemoteMetadataManager clients.
+
+    Each connection gets its own thread. Provider reads are safe from many
+    threads, so lookups from different connections run concurrently; other
+    provider calls, such as refresh_data, wait for running lookups and run
+    alone. Loading providers and the service's own bookkeeping happen under
+    a separate lock.
+    """
+
+    # Seconds between dataset version checks; a changed version (e.g. after
+    # ``metadata_cache_manager.py refresh``) drops the loaded providers
+    RELOAD_CHECK_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        provider_factories: Optional[Dict[str, Callable[[], Any]]] = None,
+    ):
+        self.address = address or default_address()
+        self.provider_factories = provider_factories or _default_provider_factories()
+        # weights key -> (manager, {provider name: dataset version when loaded})
+        self._managers: Dict[Tuple[Tuple[str, float], ...], Tuple[MetadataManager, Dict[str, Optional[str]]]] = {}
+        # Guards _managers and the request counters
+        self._lock = threading.Lock()
+        self._provider_access = _SharedExclusiveLock()
+        self._stop = threading.Event()
+        self._listener: Optional[Listener] = None
+        self._authkey: Optional[bytes] = None
+        self._last_reload_check = time.monotonic()
+        self.started_at = time.time()
+        self.request_counts: Dict[str, int] = {}
+        self.connections = 0
+
+    @staticmethod
+    def _warm_up(provider: Any) -> None:
+        for method_name in ("load_database", "_ensure_data_loaded"):
+            method = getattr(provider, method_name, None)
+            if callable(method):
+                method()
+                return
+
+    def _get_manager(self, provider_weights: Optional[Dict[str, float]]) -> MetadataManager:
+        key = _weights_key(provider_weights)
+        entry = self._managers.get(key)
+        if entry is None:
+            weights = dict(key)
+            providers = []
+            for name, factory in self.provider_factories.items():
+                provider = factory()
+                if name in weights:
+                    provider.provider_weight = weights[name]
+                self._warm_up(provider)
+                providers.append(provider)
+            manager = MetadataManager(providers)
+            versions = {type(p).__name__: MetadataManager._get_dataset_version(p) for p in providers}
+            entry = self._managers[key] = (manager, versions)
+            logging.info("Loaded providers for weights %s", weights or "default")
+        return entry[0]
+
+    def _check_dataset_versions(self) -> None:
+        now = time.monotonic()
+        if now - self._last_reload_check < self.RELOAD_CHECK_INTERVAL:
+            return
+        self._last_reload_check = now
+        for key, (manager, versions) in list(self._managers.items()):
+            for provider in manager.providers:
+                if MetadataManager._get_dataset_version(provider) != versions.get(type(provider).__name__):
+                    logging.info("%s data changed; reloading providers", type(provider).__name__)
+                    del self._managers[key]
+                    break
+
+    @staticmethod
+    def _describe_provider(provider: Any) -> Dict[str, Any]:
+        methods = sorted(
+            name for name in dir(type(provider))
+            if not name.startswith("_") and callable(getattr(type(provider), name, None))
+        )
+        attributes = {name: getattr(provider, name) for name in MIRRORED_PROVIDER_ATTRIBUTES if hasattr(provider, name)}
+        return {"name": type(provider).__name__, "methods": methods, "attributes": attributes}
+
+    @staticmethod
+    def _provider_by_name(manager: MetadataManager, name: str) -> Any:
+        for provider in manager.providers:
+            if type(provider).__name__ == name:
+                return provider
+        raise ValueError(f"Unknown provider: {name}")
+
+    @staticmethod
+    def _encode_match(match: Tuple[Any, Any]) -> Tuple[Any, Optional[str]]:
+        info, provider = match
+        return info, type(provider).__name__ if provider is not None else None
+
+    def _status(self) -> Dict[str, Any]:
+        caches = []
+        timings = []
+        for manager, _versions in self._managers.values():
+            caches.extend(manager.cache_stats())
+            timings.extend(manager.provider_timing_stats())
+        return {
+            "pid": os.getpid(),
+            "address": self.address,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "connections": self.connections,
+            "requests": dict(self.request_counts),
+            "loaded_weight_sets": len(self._managers),
+            "cache_stats": caches,
+            "provider_timings": timings,
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        with self._lock:
+            self.request_counts[op] = self.request_counts.get(op, 0) + 1
+            if op == "status":
+                return self._status()
+            if op == "shutdown":
+                self._stop.set()
+                return True
+
+            self._check_dataset_versions()
+            manager = self._get_manager(request.get("weights"))
+        if op == "hello":
+            return {
+                "protocol": PROTOCOL_VERSION,
+                "pid": os.getpid(),
+                "providers": [self._describe_provider(provider) for provider in manager.providers],
+            }
+        args = tuple(request.get("args") or ())
+        kwargs = dict(request.get("kwargs") or {})
+        if op == "manager":
+            method_name = request.get("method")
+            if method_name not in REMOTE_MANAGER_METHODS:
+                raise ValueError(f"Unsupported manager method: {method_name}")
+            with self._provider_access.shared():
+                result = getattr(manager, method_name)(*args, **kwargs)
+            if method_name in ("find_title", "find_title_from_provider"):
+                return self._encode_match(result)
+            return [self._encode_match(match) for match in result]
+        if op == "provider":
+            method_name = request.get("method") or ""
+            provider = self._provider_by_name(manager, request.get("provider"))
+            method = getattr(provider, method_name, None) if not method_name.startswith("_") else None
+            if not callable(method):
+                raise ValueError(f"Unsupported provider method: {method_name}")
+            if method_name in CONCURRENT_PROVIDER_METHODS:
+                access = self._provider_access.shared()
+            else:
+                access = self._provider_access.exclusive()
+            with access:
+                return method(*args, **kwargs)
+        raise ValueError(f"Unknown request: {op}")
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = ("ok", self.handle(request))
+                except Exception as exc:
+                    logging.debug("Request %r failed", request, exc_info=True)
+                    response = ("error", _picklable_error(exc))
+                try:
+                    try:
+                        conn.send(response)
+                    except (pickle.PicklingError, TypeError, AttributeError) as exc:
+                        # The result could not be pickled; nothing was written yet
+                        conn.send(("error", RuntimeError(f"Unserializable response: {exc}")))
+                except OSError as exc:
+                    logging.warning(f"Failed to send response: {exc}")
+                    return
+                if self._stop.is_set():
+                    self._wake_listener()
+
+    def _wake_listener(self) -> None:
+        """Unblock ``accept`` in serve_forever so it notices the stop request."""
+        try:
+            Client(self.address, authkey=self._authkey).close()
+        except Exception:
+            pass
+
+    def _remove_stale_socket(self) -> None:
+        if sys.platform == "win32" or not os.path.exists(self.address):
+            return
+        if ping(self.address) is not None:
+            raise RuntimeError(f"A metadata service is already running at {self.address}")
+        os.remove(self.address)
+
+    def serve_forever(self, preload: bool = True) -> None:
+        if preload:
+            with self._lock:
+                self._get_manager(None)
+        os.makedirs(_cache_root(), exist_ok=True)
+        self._remove_stale_socket()
+        self._authkey = _write_authkey()
+        self._listener = Listener(self.address, authkey=self._authkey)
+        if sys.platform != "win32":
+            os.chmod(self.address, 0o600)
+        logging.info("Metadata service listening on %s", self.address)
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn = self._listener.accept()
+                except Exception as exc:
+                    # Failed authentication or a client that hung up mid-handshake
+                    logging.debug("Rejected connection: %s", exc)
+                    continue
+                if self._stop.is_set():
+                    conn.close()
+                    break
+                self.connections += 1
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+            for manager, _versions in self._managers.values():
+                if manager._lookup_cache is not None:
+                    manager._lookup_cache.close()
+            try:
+                os.remove(authkey_path())
+            except OSError:
+                pass
+
+
+class ServiceUnavailable(Exception):
+    """The lookup service is not running or stopped answering."""
+
+
+class _ServiceConnection:
+    def __init__(self, address: str, authkey: bytes):
+        self._conn = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+
+    def request(self, request: Dict[str, Any]) -> Any:
+        try:
+            with self._lock:
+                self._conn.send(request)
+                status, value = self._conn.recv()
+        except (EOFError, OSError) as exc:
+            raise ServiceUnavailable(str(exc)) from exc
+        if status == "error":
+            raise value
+        return value
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except OSError:
+            pass
+
+
+def _connect(address: Optional[str] = None) -> Optional[_ServiceConnection]:
+    address = address or default_address()
+    authkey = _read_authkey()
+    if authkey is None or (sys.platform != "win32" and not os.path.exists(address)):
+        return None
+    try:
+        return _ServiceConnection(address, authkey)
+    except Exception as exc:
+        logging.debug("Metadata service unavailable at %s: %s", address, exc)
+        return None
+
+
+def ping(address: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Status of the service at ``address``, or None when it is not reachable."""
+    connection = _connect(address)
+    if connection is None:
+        return None
+    try:
+        return connection.request({"op": "status"})
+    except ServiceUnavailable:
+        return None
+    finally:
+        connection.close()
+
+
+class RemoteProvider:
+    """Client-side stand-in for a provider hosted by the service.
+
+    Stand-ins are created as subclasses named after the remote provider, so
+    ``provider.__class__.__name__`` checks keep working. Only the provider's
+    public methods and the attributes in MIRRORED_PROVIDER_ATTRIBUTES exist.
+    """
+
+    def __init__(self, manager: "RemoteMetadataManager", methods: Iterable[str], attributes: Dict[str, Any]):
+        self._manager = manager
+        self._methods = frozenset(methods)
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._methods:
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self._manager._call_provider(type(self).__name__, name, args, kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __repr__(self) -> str:
+        return f"<remote {type(self).__name__}>"
+
+
+_remote_provider_classes: Dict[str, type] = {}
+
+
+def _remote_provider_class(name: str) -> type:
+    if name not in _remote_provider_classes:
+        _remote_provider_classes[name] = type(name, (RemoteProvider,), {"__module__": __name__})
+    return _remote_provider_classes[name]
+
+
+class RemoteMetadataManager:
+    """MetadataManager proxy that runs lookups in the metadata service.
+
+    Exposes the same lookup methods and ``providers`` as MetadataManager. If
+    the service stops answering, ``local_factory`` builds an in-process
+    manager and every later call, including calls on provider stand-ins,
+    goes there instead.
+    """
+
+    def __init__(
+        self,
+        connection: _ServiceConnection,
+        local_factory: Callable[[], MetadataManager],
+        provider_weights: Optional[Dict[str, float]] = None,
+    ):
+        self._connection = connection
+        self._local_factory = local_factory
+        self._local_manager: Optional[MetadataManager] = None
+        self._fallback_lock = threading.Lock()
+        self._weights = dict(provider_weights) if provider_weights else None
+        hello = connection.request({"op": "hello", "weights": self._weights})
+        if hello.get("protocol") != PROTOCOL_VERSION:
+            raise ServiceUnavailable(f"Unsupported service protocol: {hello.get('protocol')}")
+        self.service_pid = hello.get("pid")
+        self._remote_providers = [
+            _remote_provider_class(description["name"])(self, description["methods"], description["attributes"])
+            for description in hello["providers"]
+        ]
+        self._providers_by_name = {type(provider).__name__: provider for provider in self._remote_providers}
+
+    @property
+    def is_remote(self) -> bool:
+        return self._local_manager is None
+
+    @property
+    def providers(self) -> List[Any]:
+        if self._local_manager is not None:
+            return self._local_manager.providers
+        return self._remote_providers
+
+    def _fall_back(self, exc: Exception) -> MetadataManager:
+        with self._fallback_lock:
+            if self._local_manager is None:
+                logging.warning(f"Metadata service unavailable ({exc}); using in-process providers")
+                self._connection.close()
+                self._local_manager = self._local_factory()
+        return self._local_manager
+
+    def _local_provider(self, name: str) -> Any:
+        for provider in self._local_manager.providers:
+            if type(provider).__name__ == name:
+                return provider
+        raise AttributeError(f"No in-process provider named {name}")
+
+    def _request(self, request: Dict[str, Any]) -> Any:
+        request["weights"] = self._weights
+        return self._connection.request(request)
+
+    def _decode_match(self, match: Tuple[Any, Optional[str]]) -> Tuple[Any, Any]:
+        info, provider_name = match
+        return info, self._providers_by_name.get(provider_name) if provider_name else None
+
+    def _call_manager(self, method_name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        if self._local_manager is None:
+            try:
+                result = self._request({"op": "manager", "method": method_name, "args": args, "kwargs": kwargs})
+            except ServiceUnavailable as exc:
+                self._fall_back(exc)
+            else:
+                if method_name in ("find_title", "find_title_from_provider"):
+                    return self._decode_match(result)
+                return [self._decode_match(match) for match in result]
+        return getattr(self._local_manager, method_name)(*args, **kwargs)
+
+    def _call_provider(self, provider_name: str, method_name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        if self._local_manager is None:
+            try:
+                return self._request(
+                    {"op": "provider", "provider": provider_name, "method": method_name, "args": args, "kwargs": kwargs}
+                )
+            except ServiceUnavailable as exc:
+                self._fall_back(exc)
+        return getattr(self._local_provider(provider_name), method_name)(*args, **kwargs)
+
+    def find_title(self, title: str, year: Optional[int] = None, preferred_type: Optional[str] = None):
+        return self._call_manager("find_title", (title,), {"year": year, "preferred_type": preferred_type})
+
+    def find_titles(self, queries: Iterable[Tuple[str, Optional[int], Optional[str]]]):
+        return self._call_manager("find_titles", (list(queries),), {})
+
+    def find_title_from_provider(
+        self,
+        title: str,
+        provider_name: str,
+        year: Optional[int] = None,
+        preferred_type: Optional[str] = None,
+    ):
+        return self._call_manager(
+            "find_title_from_provider", (title, provider_name), {"year": year, "preferred_type": preferred_type}
+        )
+
+    def find_titles_from_provider(self, queries: Iterable[Tuple[str, Optional[int], Optional[str]]], provider_name: str):
+        return self._call_manager("find_titles_from_provider", (list(queries), provider_name), {})
+
+    def get_episode_info(self, provider: Any, parent_id: str, season: int, episode: int):
+        """Get episode info from a specific provider"""
+        return provider.get_episode_info(parent_id, season, episode)
+
+    def cache_stats(self) -> List[dict]:
+        if self._local_manager is None:
+            try:
+                return self._connection.request({"op": "status"})["cache_stats"]
+            except ServiceUnavailable as exc:
+                self._fall_back(exc)
+        return self._local_manager.cache_stats()
+
+    def provider_timing_stats(self) -> List[dict]:
+        if self._local_manager is None:
+            try:
+                return self._connection.request({"op": "status"})["provider_timings"]
+            except ServiceUnavailable as exc:
+                self._fall_back(exc)
+        return self._local_manager.provider_timing_stats()
+
+
+def create_metadata_manager(
+    local_factory: Callable[[], MetadataManager],
+    provider_weights: Optional[Dict[str, float]] = None,
+    address: Optional[str] = None,
+):
+    """A RemoteMetadataManager when the lookup service is running, else ``local_factory()``.
+
+    ``provider_weights`` maps provider class names to the weights the local
+    factory would set, so the service scores matches the same way.
+    """
+    if not service_disabled():
+        connection = _connect(address)
+        if connection is not None:
+            try:
+                return RemoteMetadataManager(connection, local_factory, provider_weights)
+            except Exception as exc:
+                logging.debug("Metadata service handshake failed: %s", exc)
+                connection.close()
+    return local_factory()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local metadata lookup service shared by the CLI tools")
+    parser.add_argument("--address", help=f"Socket path or pipe name (default: {default_address()})")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the service in the foreground")
+    serve_parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Load providers on the first request instead of at startup",
+    )
+    subparsers.add_parser("status", help="Show whether the service is running and its counters")
+    subparsers.add_parser("stop", help="Stop a running service")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    if args.command == "serve":
+        service = MetadataLookupService(args.address)
+        try:
+            service.serve_forever(preload=not args.no_preload)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "status":
+        status = ping(args.address)
+        if status is None:
+            print("Metadata service is not running")
+            return 1
+        print(f"Metadata service running (pid {status['pid']}) at {status['address']}")
+        print(f"  uptime: {status['uptime_seconds']}s, connections: {status['connections']}")
+        for op, count in sorted(status["requests"].items()):
+            print(f"  {op}: {count} requests")
+        for cache in status["cache_stats"]:
+            hit_rate = f"{cache['hit_rate']:.1%}" if cache["hit_rate"] is not None else "n/a"
+            print(f"  cache {cache['name']}: {cache['size']}/{cache['capacity']} entries, hit rate {hit_rate}")
+        for timing in status["provider_timings"]:
+            print(
+                f"  provider {timing['provider']}: {timing['lookups']} lookups in {timing['seconds']:.2f}s, "
+                f"skipped {timing['skipped_by_score']} by score and {timing['skipped_by_budget']} by budget"
+            )
+        return 0
+
+    connection = _connect(args.address)
+    if connection is None:
+        print("Metadata service is not running")
+        return 1
+    try:
+        connection.request({"op": "shutdown"})
+    except ServiceUnavailable:
+        pass
+    finally:
+        connection.close()
+    print("Metadata service stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
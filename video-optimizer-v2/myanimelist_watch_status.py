@@ -1,12 +1,15 @@
 import glob
+import hashlib
+import io
 import logging
 import os
+import pickle
 import re
 import xml.etree.ElementTree as ET
 import gzip
 import requests
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import astuple, dataclass
+from typing import BinaryIO, Dict, Optional
 from datetime import datetime
 from functools import lru_cache
 
@@ -72,52 +75,122 @@ def resolve_myanimelist_xml_path(path_pattern: str) -> Optional[str]:
 
 class MyAnimeListWatchStatusProvider:
     """Provider for querying MyAnimeList XML for watch status"""
-    
-    def __init__(self, xml_path_or_url: str):
+
+    # Bump when MyAnimeListWatchStatus fields change so old parsed caches are ignored
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, xml_path_or_url: str, cache_dir: Optional[str] = None):
         """
         Initialize MyAnimeList watch status provider
         
         Args:
             xml_path_or_url: Path to local XML file (can be .gz), or URL to remote XML
+            cache_dir: Directory for parsed caches of local files
+                (default: ~/.video_metadata_cache/myanimelist)
         """
         self.xml_path_or_url = xml_path_or_url
-        self.anime_status_map = {}
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".video_metadata_cache", "myanimelist")
+        self.anime_status_map: Dict[str, MyAnimeListWatchStatus] = {}
         self._load_xml()
 
+    @staticmethod
+    def _is_url(path_or_url: str) -> bool:
+        return path_or_url.startswith('http://') or path_or_url.startswith('https://')
+
+    def _cache_path(self, source_path: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _load_cached(self, source_path: str, signature: tuple) -> Optional[Dict[str, MyAnimeListWatchStatus]]:
+        """Parsed map for ``source_path`` if the cache was written for the same size and mtime."""
+        try:
+            with open(self._cache_path(source_path), 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get('format_version') != self.CACHE_FORMAT_VERSION
+            or data.get('signature') != signature
+        ):
+            return None
+        try:
+            return {animedb_id: MyAnimeListWatchStatus(*fields) for animedb_id, fields in data['entries']}
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _save_cached(self, source_path: str, signature: tuple) -> None:
+        cache_path = self._cache_path(source_path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                # Plain tuples keep the cache compact and independent of the class definition
+                pickle.dump(
+                    {
+                        'format_version': self.CACHE_FORMAT_VERSION,
+                        'signature': signature,
+                        'entries': [(animedb_id, astuple(status)) for animedb_id, status in self.anime_status_map.items()],
+                    },
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write MyAnimeList cache {cache_path}: {e}")
+
+    @staticmethod
+    def _decompressed(stream: BinaryIO) -> BinaryIO:
+        """Wrap ``stream`` in a gzip reader if it starts with the gzip magic bytes."""
+        buffered = io.BufferedReader(stream) if not isinstance(stream, io.BufferedReader) else stream
+        if buffered.peek(2)[:2] == b'\x1f\x8b':
+            return gzip.GzipFile(fileobj=buffered)
+        return buffered
+
+    def _parse_stream(self, stream: BinaryIO) -> None:
+        """Parse anime entries incrementally, discarding each element once it is read"""
+        root = None
+        for event, element in ET.iterparse(stream, events=('start', 'end')):
+            if root is None and event == 'start':
+                root = element
+                continue
+            if event != 'end' or element.tag != 'anime':
+                continue
+            try:
+                animedb_id = element.findtext('series_animedb_id')
+                if animedb_id:
+                    self.anime_status_map[animedb_id] = self._parse_anime_entry(element)
+            except Exception as e:
+                logging.warning(f"Error parsing anime entry: {e}")
+            # Drop parsed entries so memory stays flat regardless of list size
+            root.clear()
+
     def _load_xml(self):
-        """Load and parse the MyAnimeList XML data"""
+        """Load and parse the MyAnimeList XML data
+
+        Local files are parsed once per size/mtime; later runs read the parsed
+        map from a cache in ``cache_dir``. URLs are streamed and always parsed.
+        """
         try:
-            if self.xml_path_or_url.startswith('http://') or self.xml_path_or_url.startswith('https://'):
-                response = requests.get(self.xml_path_or_url, timeout=30)
-                response.raise_for_status()
-                
-                # Check if response is gzipped
-                if response.headers.get('content-encoding') == 'gzip' or self.xml_path_or_url.endswith('.gz'):
-                    xml_content = gzip.decompress(response.content)
-                else:
-                    xml_content = response.content
-                    
-                root = ET.fromstring(xml_content)
-            else:
-                # Local file
-                if self.xml_path_or_url.endswith('.gz'):
-                    with gzip.open(self.xml_path_or_url, 'rt', encoding='utf-8') as f:
-                        tree = ET.parse(f)
-                        root = tree.getroot()
-                else:
-                    tree = ET.parse(self.xml_path_or_url)
-                    root = tree.getroot()
-            
-            # Parse each anime entry
-            for anime in root.findall('anime'):
-                try:
-                    animedb_id = anime.findtext('series_animedb_id')
-                    if animedb_id:
-                        status_data = self._parse_anime_entry(anime)
-                        self.anime_status_map[animedb_id] = status_data
-                except Exception as e:
-                    logging.warning(f"Error parsing anime entry: {e}")
-                    
+            if self._is_url(self.xml_path_or_url):
+                with requests.get(self.xml_path_or_url, timeout=30, stream=True) as response:
+                    response.raise_for_status()
+                    # Undo any transport encoding; a .gz payload is detected by its magic bytes
+                    response.raw.decode_content = True
+                    self._parse_stream(self._decompressed(response.raw))
+                return
+
+            stat = os.stat(self.xml_path_or_url)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            cached = self._load_cached(self.xml_path_or_url, signature)
+            if cached is not None:
+                self.anime_status_map = cached
+                return
+
+            with open(self.xml_path_or_url, 'rb') as f:
+                self._parse_stream(self._decompressed(f))
+            self._save_cached(self.xml_path_or_url, signature)
+
         except Exception as e:
             logging.error(f"Error loading MyAnimeList XML from {self.xml_path_or_url}: {e}")
             raise
@@ -1,9 +1,12 @@
 import sqlite3
 import os
 import logging
+import pickle
+import tempfile
+from bisect import bisect_right
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
 import threading
 import time
@@ -11,6 +14,8 @@ import weakref
 import requests
 import xml.etree.ElementTree as ET
 
+import sql_profiler
+
 @dataclass
 class PlexWatchStatus:
     """Watch status information from Plex database"""
@@ -118,7 +123,8 @@ class PlexConnectionPool:
     
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection"""
-        conn = sqlite3.connect(self.db_path)
+        # Pooled connections are reused by whichever thread checks them out next
+        conn = sql_profiler.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
         # Set pragmas for better performance and safety
         conn.execute("PRAGMA journal_mode=WAL")
@@ -197,10 +203,192 @@ class PlexConnectionPool:
             except:
                 pass
 
+class PlexPartPathIndex:
+    """Case-insensitive file name and substring search over media part paths.
+
+    Paths are kept in sorted order, as Plex's ``ORDER BY mp.file`` returns
+    them, and every search returns its matches in that order. Substring
+    searches run over one newline-joined, casefolded copy of all paths.
+    """
+
+    def __init__(self, part_paths: Iterable[str]):
+        self.paths = sorted(part_paths)
+        self.by_basename: Dict[str, List[str]] = {}
+        for part_path in self.paths:
+            self.by_basename.setdefault(PlexMetadataProvider._basename_key(part_path), []).append(part_path)
+        folded = [part_path.casefold() for part_path in self.paths]
+        # Offset of each path in _folded_text
+        self._starts: List[int] = []
+        offset = 0
+        for folded_path in folded:
+            self._starts.append(offset)
+            offset += len(folded_path) + 1
+        self._folded_text = "\n".join(folded)
+
+    def with_basename(self, file_path: str) -> List[str]:
+        """Paths with the same file name as ``file_path``."""
+        return self.by_basename.get(PlexMetadataProvider._basename_key(file_path), [])
+
+    def containing(self, filename: str) -> List[str]:
+        """Paths that contain ``filename`` anywhere."""
+        needle = filename.casefold()
+        if not needle or "\n" in needle:
+            return []
+        matches = []
+        position = self._folded_text.find(needle)
+        while position != -1:
+            path_index = bisect_right(self._starts, position) - 1
+            matches.append(self.paths[path_index])
+            if path_index + 1 >= len(self._starts):
+                break
+            position = self._folded_text.find(needle, self._starts[path_index + 1])
+        return matches
+
+
+class PlexMediaSnapshot:
+    """In-memory copy of the Plex media parts with their view totals.
+
+    Built with one query from the Plex database and keyed by media part path,
+    so watch-status lookups need neither a connection nor a lock on Plex's
+    database. The snapshot records the modification time and size of the
+    database and its WAL file; ``is_current`` compares them to the files on
+    disk to tell when Plex has written since the snapshot was taken.
+    """
+
+    # Bump when the stored entry layout changes so old sidecar files are ignored
+    FORMAT_VERSION = 1
+
+    SNAPSHOT_QUERY = """
+    SELECT
+        mp.file as file_path,
+        md.id as metadata_item_id,
+        md.guid,
+        md.title,
+        md.year,
+        mp.duration,
+        ls.name as library_section,
+        COALESCE(v.view_count, 0) as view_count,
+        v.last_viewed_at
+    FROM media_parts mp
+    JOIN media_items mi ON mi.id = mp.media_item_id
+    JOIN metadata_items md ON md.id = mi.metadata_item_id
+    LEFT JOIN library_sections ls ON md.library_section_id = ls.id
+    LEFT JOIN (
+        SELECT guid, COUNT(*) as view_count, MAX(viewed_at) as last_viewed_at
+        FROM metadata_item_views
+        GROUP BY guid
+    ) v ON v.guid = md.guid
+    WHERE mp.file IS NOT NULL
+    ORDER BY mp.file
+    """
+
+    def __init__(self, db_path: str, signature: Tuple, entries: Dict[str, Dict[str, Any]]):
+        self.db_path = db_path
+        self.signature = signature
+        self.entries = entries
+        self.created = time.time()
+        self._path_index: Optional[PlexPartPathIndex] = None
+
+    @staticmethod
+    def database_signature(db_path: str) -> Tuple:
+        """(mtime_ns, size) of the database and its WAL file; None for a missing file."""
+        signature = []
+        for path in (db_path, db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    @classmethod
+    def build(cls, db_path: str, conn: sqlite3.Connection) -> "PlexMediaSnapshot":
+        # Taken before reading so writes during the query invalidate the snapshot
+        signature = cls.database_signature(db_path)
+        entries: Dict[str, Dict[str, Any]] = {}
+        for row in conn.execute(cls.SNAPSHOT_QUERY):
+            entries.setdefault(row["file_path"], dict(row))
+        return cls(db_path, signature, entries)
+
+    def is_current(self) -> bool:
+        return self.signature == self.database_signature(self.db_path)
+
+    @property
+    def path_index(self) -> PlexPartPathIndex:
+        """File name and substring index of the entry paths, built on first use."""
+        # Threads racing here each build an identical index; the last one is kept
+        if self._path_index is None:
+            self._path_index = PlexPartPathIndex(self.entries)
+        return self._path_index
+
+    def lookup(self, file_path: str, normalized_path: str) -> Optional[Dict[str, Any]]:
+        """Entry for a file: exact path match first, then the first part with the same file name."""
+        entry = self.entries.get(normalized_path) or self.entries.get(file_path)
+        if entry is None:
+            candidates = self.path_index.with_basename(normalized_path)
+            if candidates:
+                entry = self.entries[candidates[0]]
+        return entry
+
+    def lookup_many(self, paths: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Entries for (file_path, normalized_path) pairs, like ``lookup``; files that
+        match neither way get the first part whose path contains their file name,
+        searched in one batch over the precomputed index."""
+        entries = [self.lookup(file_path, normalized_path) for file_path, normalized_path in paths]
+        for index, (_file_path, normalized_path) in enumerate(paths):
+            if entries[index] is None:
+                candidates = self.path_index.containing(os.path.basename(normalized_path))
+                if candidates:
+                    entries[index] = self.entries[candidates[0]]
+        return entries
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # A temp file of its own, so concurrent saves never write the same file
+        handle, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                pickle.dump(
+                    {
+                        "format_version": self.FORMAT_VERSION,
+                        "db_path": self.db_path,
+                        "signature": self.signature,
+                        "created": self.created,
+                        "entries": self.entries,
+                    },
+                    temp_file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str, db_path: str) -> Optional["PlexMediaSnapshot"]:
+        """The snapshot stored at ``path`` if it was taken from ``db_path``, else None."""
+        try:
+            with open(path, "rb") as handle:
+                data = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format_version") != cls.FORMAT_VERSION:
+            return None
+        if data.get("db_path") != db_path:
+            return None
+        snapshot = cls(db_path, data["signature"], data["entries"])
+        snapshot.created = data.get("created", snapshot.created)
+        return snapshot
+
+
 class PlexMetadataProvider:
     """Provider for querying Plex database for watch status"""
 
-    def __init__(self, plex_data_dir: Optional[str] = None, pool_size: int = 3, connection_timeout: float = 30.0, plex_host: str = "127.0.0.1", plex_port: int = 32400):
+    def __init__(self, plex_data_dir: Optional[str] = None, pool_size: int = 3, connection_timeout: float = 30.0, plex_host: str = "127.0.0.1", plex_port: int = 32400, use_snapshot: bool = False, snapshot_path: Optional[str] = None):
         """
         Initialize Plex metadata provider
 
@@ -210,6 +398,10 @@ class PlexMetadataProvider:
             connection_timeout: Seconds to keep idle connections open
             plex_host: Hostname or IP of Plex server for API calls
             plex_port: Port of Plex server for API calls
+            use_snapshot: Answer watch-status lookups from a PlexMediaSnapshot that is
+                rebuilt only when the Plex database or its WAL file changes
+            snapshot_path: Sidecar file the snapshot is kept in between runs
+                (default: ~/.video_metadata_cache/plex_snapshot.pickle)
         """
         self.plex_data_dir = plex_data_dir or self._find_plex_data_dir()
         self.db_path = None
@@ -217,6 +409,14 @@ class PlexMetadataProvider:
         self.plex_host = plex_host
         self.plex_port = plex_port
         self._server_hash = None
+        self._server_hash_checked = False
+        self.use_snapshot = use_snapshot
+        self.snapshot_path = snapshot_path or os.path.join(
+            os.path.expanduser("~"), ".video_metadata_cache", "plex_snapshot.pickle"
+        )
+        self._snapshot: Optional[PlexMediaSnapshot] = None
+        # Held while the snapshot is loaded, built or saved
+        self._snapshot_lock = threading.Lock()
 
         if self.plex_data_dir:
             self.db_path = os.path.join(self.plex_data_dir, "Plug-in Support", "Databases", "com.plexapp.plugins.library.db")
@@ -250,10 +450,12 @@ class PlexMetadataProvider:
     def get_server_hash(self, conn=None) -> Optional[str]:
         """
         Get the server hash (machineIdentifier) from Plex API /identity endpoint.
-        Caches the result for future calls.
+        Caches the result for future calls, including a failed lookup, so an
+        unreachable server costs one request timeout rather than one per file.
         """
-        if self._server_hash:
+        if self._server_hash or self._server_hash_checked:
             return self._server_hash
+        self._server_hash_checked = True
         try:
             url = f"http://{self.plex_host}:{self.plex_port}/identity"
             response = requests.get(url, timeout=2)
@@ -267,123 +469,239 @@ class PlexMetadataProvider:
             logging.warning(f"Could not retrieve server hash from Plex API: {e}")
         return None
 
-    def get_watch_status(self, file_path: str) -> Optional[PlexWatchStatus]:
+    # Columns of a media part and its metadata item plus its view totals
+    _PART_STATUS_QUERY = """
+    SELECT
+        rp.request_index,
+        rp.priority,
+        md.id as metadata_item_id,
+        md.guid,
+        md.title,
+        md.year,
+        mp.duration,
+        mp.file as file_path,
+        ls.name as library_section,
+        COALESCE((
+            SELECT COUNT(*)
+            FROM metadata_item_views miv
+            WHERE miv.guid = md.guid
+        ), 0) as view_count,
+        (
+            SELECT MAX(miv.viewed_at)
+            FROM metadata_item_views miv
+            WHERE miv.guid = md.guid
+        ) as last_viewed_at
+    FROM temp.requested_media_paths rp
+    JOIN media_parts mp ON mp.file = rp.path
+    JOIN media_items mi ON mi.id = mp.media_item_id
+    JOIN metadata_items md ON md.id = mi.metadata_item_id
+    LEFT JOIN library_sections ls ON md.library_section_id = ls.id
+    ORDER BY rp.request_index, rp.priority, mp.file
+    """
+
+    @staticmethod
+    def _basename_key(path: str) -> str:
+        """Case-insensitive file name of a Plex path, which may use either separator."""
+        return path.replace("\\", "/").rsplit("/", 1)[-1].casefold()
+
+    @staticmethod
+    def _normalize_path(file_path: str) -> str:
+        try:
+            return Path(file_path).resolve().as_posix()
+        except (OSError, RuntimeError):
+            return file_path
+
+    def _build_part_path_index(self, cursor) -> PlexPartPathIndex:
+        """Index of every media part path, read in one pass over media_parts."""
+        cursor.execute("SELECT file FROM media_parts WHERE file IS NOT NULL")
+        return PlexPartPathIndex(part_path for (part_path,) in cursor)
+
+    def _query_requested_paths(self, cursor, rows: List[tuple]) -> Dict[int, sqlite3.Row]:
+        """Best media part per request index for (request_index, priority, path) rows."""
+        cursor.execute("DELETE FROM temp.requested_media_paths")
+        cursor.executemany(
+            "INSERT INTO temp.requested_media_paths (request_index, priority, path) VALUES (?, ?, ?)",
+            rows,
+        )
+        matches: Dict[int, sqlite3.Row] = {}
+        for row in cursor.execute(self._PART_STATUS_QUERY):
+            matches.setdefault(row["request_index"], row)
+        return matches
+
+    def _row_to_watch_status(self, file_path: str, row, server_hash: Optional[str]) -> PlexWatchStatus:
+        view_count = row['view_count'] or 0
+        last_viewed_at = row['last_viewed_at']
+        last_watched = datetime.fromtimestamp(last_viewed_at) if last_viewed_at else None
+
+        # Note: view_offset (resume position) is not available in this schema
+        # It might be stored elsewhere or not tracked in this version
+        return PlexWatchStatus(
+            file_path=file_path,
+            watched=bool(view_count > 0),
+            watch_count=view_count,
+            last_watched=last_watched,
+            view_offset=0,  # Not available in this schema
+            duration=row['duration'],
+            progress_percent=0.0,  # Cannot calculate without view_offset
+            plex_title=row['title'],
+            plex_year=row['year'],
+            library_section=row['library_section'],
+            server_hash=server_hash,
+            metadata_item_id=row['metadata_item_id']
+        )
+
+    def get_snapshot(self) -> Optional[PlexMediaSnapshot]:
         """
-        Get watch status for a specific file path
-        
-        Args:
-            file_path: Full path to the media file
-            
+        Current snapshot of the Plex media parts
+
+        Reuses the in-memory or sidecar snapshot while the database and its
+        WAL file are unchanged and rebuilds it otherwise.
+
         Returns:
-            PlexWatchStatus object or None if not found
+            PlexMediaSnapshot or None if the database is unavailable or cannot be read
         """
         if not self.is_available() or not self.connection_pool:
             return None
-        
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.is_current():
+            return snapshot
+
+        with self._snapshot_lock:
+            # Another thread may have loaded or rebuilt it while this one waited
+            if self._snapshot is not None and self._snapshot.is_current():
+                return self._snapshot
+
+            if self._snapshot is None and self.snapshot_path:
+                stored = PlexMediaSnapshot.load(self.snapshot_path, self.db_path)
+                if stored is not None and stored.is_current():
+                    self._snapshot = stored
+                    return stored
+
+            conn = None
+            try:
+                conn = self.connection_pool.get_connection()
+                start = time.time()
+                snapshot = PlexMediaSnapshot.build(self.db_path, conn)
+                logging.info(f"Built Plex snapshot of {len(snapshot.entries)} media parts in {time.time() - start:.2f}s")
+            except Exception as e:
+                logging.error(f"Error building Plex snapshot: {str(e)}")
+                return None
+            finally:
+                if conn and self.connection_pool:
+                    self.connection_pool.return_connection(conn)
+
+            if self.snapshot_path:
+                try:
+                    snapshot.save(self.snapshot_path)
+                except OSError as e:
+                    logging.warning(f"Could not save Plex snapshot to {self.snapshot_path}: {e}")
+            self._snapshot = snapshot
+            return snapshot
+
+    def get_watch_statuses(self, file_paths: Iterable[str]) -> Dict[str, Optional[PlexWatchStatus]]:
+        """
+        Get watch status for many file paths with one database round trip
+
+        The requested paths are loaded into a temporary table and joined once
+        against media_parts. Paths without an exact match fall back to media
+        parts with the same file name (case-insensitive) and, failing that, to
+        media parts whose path contains the file name anywhere (the LIKE
+        '%name%' match this method used before it was batched). Both fallbacks
+        search an index built from one read of the media part paths, so the
+        number of unmatched files does not add database scans.
+
+        With use_snapshot the lookups are answered from get_snapshot() instead.
+
+        Args:
+            file_paths: Full paths to the media files
+
+        Returns:
+            Dict mapping every requested path to its PlexWatchStatus, or None if not found
+        """
+        file_paths = list(dict.fromkeys(file_paths))
+        statuses: Dict[str, Optional[PlexWatchStatus]] = {path: None for path in file_paths}
+        if not file_paths or not self.is_available() or not self.connection_pool:
+            return statuses
+
+        snapshot = self.get_snapshot() if self.use_snapshot else None
+        if snapshot is not None:
+            server_hash = self.get_server_hash()
+            entries = snapshot.lookup_many([(file_path, self._normalize_path(file_path)) for file_path in file_paths])
+            for file_path, entry in zip(file_paths, entries):
+                if entry is not None:
+                    statuses[file_path] = self._row_to_watch_status(file_path, entry, server_hash)
+            return statuses
+
         conn = None
         try:
-            # Normalize path for comparison
-            normalized_path = Path(file_path).resolve().as_posix()
-            filename = os.path.basename(normalized_path)
-
             conn = self.connection_pool.get_connection()
             cursor = conn.cursor()
-
-            # Get server hash
             server_hash = self.get_server_hash(conn)
 
-            # Fast path: exact file match first, fallback to filename match only if needed.
-            query_template = """
-            WITH candidate AS (
-                SELECT
-                    md.id as metadata_item_id,
-                    md.guid,
-                    md.title,
-                    md.year,
-                    mp.duration,
-                    mp.file as file_path,
-                    ls.name as library_section
-                FROM metadata_items md
-                JOIN media_items mi ON md.id = mi.metadata_item_id
-                JOIN media_parts mp ON mi.id = mp.media_item_id
-                LEFT JOIN library_sections ls ON md.library_section_id = ls.id
-                WHERE {where_clause}
-                ORDER BY {order_clause}
-                LIMIT 1
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS requested_media_paths "
+                "(request_index INTEGER NOT NULL, priority INTEGER NOT NULL, path TEXT NOT NULL)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS temp.requested_media_paths_path ON requested_media_paths (path)"
             )
-            SELECT
-                c.metadata_item_id,
-                c.guid,
-                c.title,
-                c.year,
-                c.duration,
-                c.file_path,
-                c.library_section,
-                COALESCE((
-                    SELECT COUNT(*)
-                    FROM metadata_item_views miv
-                    WHERE miv.guid = c.guid
-                ), 0) as view_count,
-                (
-                    SELECT MAX(miv.viewed_at)
-                    FROM metadata_item_views miv
-                    WHERE miv.guid = c.guid
-                ) as last_viewed_at
-            FROM candidate c
-            """
 
-            def fetch_candidate(where_clause: str, order_clause: str, params: tuple):
-                query = query_template.format(where_clause=where_clause, order_clause=order_clause)
-                cursor.execute(query, params)
-                return cursor.fetchone()
+            # Exact matches: the resolved path first, then the path as given
+            normalized_paths = []
+            rows = []
+            for index, file_path in enumerate(file_paths):
+                normalized_path = self._normalize_path(file_path)
+                normalized_paths.append(normalized_path)
+                rows.append((index, 0, normalized_path))
+                if file_path != normalized_path:
+                    rows.append((index, 1, file_path))
+            matches = self._query_requested_paths(cursor, rows)
 
-            media_result = fetch_candidate(
-                "mp.file = ? OR mp.file = ?",
-                "CASE WHEN mp.file = ? THEN 1 ELSE 2 END, mp.file",
-                (normalized_path, file_path, normalized_path),
-            )
+            # Leftovers: media parts with the same file name, then media parts
+            # whose path contains the file name (e.g. "Movie.mkv" in
+            # ".../Movie.mkv.part"), both from one pass over media_parts
+            leftovers = [index for index in range(len(file_paths)) if index not in matches]
+            if leftovers:
+                part_index = self._build_part_path_index(cursor)
+                for find_parts in (
+                    lambda index: part_index.with_basename(normalized_paths[index]),
+                    lambda index: part_index.containing(os.path.basename(normalized_paths[index])),
+                ):
+                    rows = [
+                        (index, priority, part_path)
+                        for index in leftovers
+                        for priority, part_path in enumerate(find_parts(index))
+                    ]
+                    if rows:
+                        matches.update(self._query_requested_paths(cursor, rows))
+                    leftovers = [index for index in leftovers if index not in matches]
+                    if not leftovers:
+                        break
+
+            cursor.execute("DELETE FROM temp.requested_media_paths")
+            for index, row in matches.items():
+                file_path = file_paths[index]
+                statuses[file_path] = self._row_to_watch_status(file_path, row, server_hash)
 
-            if not media_result:
-                media_result = fetch_candidate(
-                    "mp.file LIKE ?",
-                    "mp.file",
-                    (f"%{filename}%",),
-                )
-            
-            if media_result:
-                view_count = media_result['view_count'] or 0
-                last_viewed_at = media_result['last_viewed_at']
-                
-                # Convert timestamps
-                last_watched = None
-                if last_viewed_at:
-                    last_watched = datetime.fromtimestamp(last_viewed_at)
-                
-                # Note: view_offset (resume position) is not available in this schema
-                # It might be stored elsewhere or not tracked in this version
-                
-                return PlexWatchStatus(
-                    file_path=file_path,
-                    watched=bool(view_count > 0),
-                    watch_count=view_count,
-                    last_watched=last_watched,
-                    view_offset=0,  # Not available in this schema
-                    duration=media_result['duration'],
-                    progress_percent=0.0,  # Cannot calculate without view_offset
-                    plex_title=media_result['title'],
-                    plex_year=media_result['year'],
-                    library_section=media_result['library_section'],
-                    server_hash=server_hash,
-                    metadata_item_id=media_result['metadata_item_id']
-                )
-                
         except Exception as e:
-            logging.error(f"Error querying Plex database for {file_path}: {str(e)}")
+            logging.error(f"Error querying Plex database for {len(file_paths)} files: {str(e)}")
         finally:
             if conn and self.connection_pool:
                 self.connection_pool.return_connection(conn)
+
+        return statuses
+
+    def get_watch_status(self, file_path: str) -> Optional[PlexWatchStatus]:
+        """
+        Get watch status for a specific file path
         
-        return None
+        Args:
+            file_path: Full path to the media file
+            
+        Returns:
+            PlexWatchStatus object or None if not found
+        """
+        return self.get_watch_statuses([file_path]).get(file_path)
     
     def get_watch_status_by_title(self, title: str, year: Optional[int] = None) -> List[PlexWatchStatus]:
         """
@@ -0,0 +1,242 @@
+"""Opt-in SQL profiler shared by the metadata providers and plex_db_tool.
+
+Connections opened through ``connect`` while profiling is enabled time every
+statement they run, including the time spent fetching its rows, and the
+profiler aggregates count, total and max time and rows returned per
+statement. A top-N report by total time is printed to stderr at exit.
+
+Enable it with VIDEO_METADATA_SQL_PROFILE=1 (or =N to report the top N
+statements), or call ``enable()`` before the providers open connections, as
+metadata_cache_manager.py --profile-sql does. When disabled, ``connect`` returns plain
+sqlite3 connections.
+"""
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+PROFILE_ENV_VAR = "VIDEO_METADATA_SQL_PROFILE"
+DEFAULT_TOP_N = 20
+# Report column width for statements
+STATEMENT_PREVIEW_CHARS = 120
+
+
+def _statement_key(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class SqlProfiler:
+    """Per-statement count, total/max seconds and rows returned."""
+
+    def __init__(self):
+        self.enabled = False
+        self.top_n = DEFAULT_TOP_N
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._report_registered = False
+
+    def enable(self, top_n: Optional[int] = None, report_at_exit: bool = True) -> None:
+        self.enabled = True
+        if top_n:
+            self.top_n = top_n
+        if report_at_exit and not self._report_registered:
+            self._report_registered = True
+            atexit.register(self.print_report)
+
+    def record(self, key: str, seconds: float, rows: int = 0, executions: int = 1) -> None:
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                # count, total seconds, max seconds, rows
+                entry = self._stats[key] = [0, 0.0, 0.0, 0]
+            entry[0] += executions
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            entry[3] += rows
+
+    def add_fetch(self, key: str, seconds: float, rows: int, execution_seconds: float = 0.0) -> None:
+        """Attribute row fetching to a statement recorded earlier.
+
+        ``execution_seconds`` is the execution's running time so far, fetches
+        included, so max reflects the slowest complete execution.
+        """
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is not None:
+                entry[1] += seconds
+                if execution_seconds > entry[2]:
+                    entry[2] = execution_seconds
+                entry[3] += rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """All statements, by total time descending."""
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._stats.items()]
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                "statement": key,
+                "count": int(count),
+                "total_seconds": total,
+                "max_seconds": maximum,
+                "mean_ms": total * 1000.0 / count if count else None,
+                "rows": int(rows),
+            }
+            for key, (count, total, maximum, rows) in items
+        ]
+
+    def format_report(self, top_n: Optional[int] = None) -> str:
+        stats = self.stats()
+        limit = top_n or self.top_n
+        total_seconds = sum(entry["total_seconds"] for entry in stats)
+        total_count = sum(entry["count"] for entry in stats)
+        lines = [
+            f"SQL profile: {total_count} statements, {len(stats)} distinct, {total_seconds:.3f}s total"
+            f" (top {min(limit, len(stats))} by total time)",
+            f"{'count':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>9}  statement",
+        ]
+        for entry in stats[:limit]:
+            statement = entry["statement"]
+            if len(statement) > STATEMENT_PREVIEW_CHARS:
+                statement = f"{statement[:STATEMENT_PREVIEW_CHARS - 3]}..."
+            lines.append(
+                f"{entry['count']:>8} {entry['total_seconds'] * 1000:>10.1f} {entry['mean_ms']:>9.2f}"
+                f" {entry['max_seconds'] * 1000:>9.2f} {entry['rows']:>9}  {statement}"
+            )
+        return "\n".join(lines)
+
+    def print_report(self) -> None:
+        if self._stats:
+            print(self.format_report(), file=sys.stderr)
+
+
+PROFILER = SqlProfiler()
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and the rows fetched from it to PROFILER."""
+
+    _profile_key: Optional[str] = None
+    _profile_seconds = 0.0
+
+    def _record_execution(self, sql: str, seconds: float, executions: int = 1) -> None:
+        self._profile_key = _statement_key(sql)
+        self._profile_seconds = seconds
+        PROFILER.record(self._profile_key, seconds, executions=executions)
+
+    def _record_fetch(self, seconds: float, rows: int) -> None:
+        if self._profile_key is not None:
+            self._profile_seconds += seconds
+            PROFILER.add_fetch(self._profile_key, seconds, rows, self._profile_seconds)
+
+    def execute(self, sql, parameters=()):
+        started_at = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record_execution(sql, time.perf_counter() - started_at)
+
+    def executemany(self, sql, seq_of_parameters):
+        executions = 0
+
+        def counted():
+            nonlocal executions
+            # Count as we go; bulk imports pass generators too large to list
+            for parameters in seq_of_parameters:
+                executions += 1
+                yield parameters
+
+        started_at = time.perf_counter()
+        try:
+            return super().executemany(sql, counted())
+        finally:
+            self._record_execution(sql, time.perf_counter() - started_at, executions or 1)
+
+    def executescript(self, sql_script):
+        started_at = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._record_execution(sql_script, time.perf_counter() - started_at)
+
+    def _timed_fetch(self, fetch, *args):
+        started_at = time.perf_counter()
+        result = fetch(*args)
+        if isinstance(result, list):
+            rows = len(result)
+        else:
+            rows = 0 if result is None else 1
+        self._record_fetch(time.perf_counter() - started_at, rows)
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            return self._timed_fetch(super().fetchmany)
+        return self._timed_fetch(super().fetchmany, size)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started_at = time.perf_counter()
+        row = super().fetchone()
+        self._record_fetch(time.perf_counter() - started_at, 0 if row is None else 1)
+        if row is None:
+            raise StopIteration
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors, including those behind ``execute``, are ProfiledCursors."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def _configure_from_environment() -> None:
+    value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if not value or value in ("0", "false", "no", "off"):
+        return
+    PROFILER.enable(top_n=int(value) if value.isdigit() and int(value) > 1 else None)
+
+
+def enable(top_n: Optional[int] = None) -> None:
+    """Profile connections opened from now on and print a report at exit."""
+    PROFILER.enable(top_n=top_n)
+
+
+def is_enabled() -> bool:
+    return PROFILER.enabled
+
+
+def connect(database, *args, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect, returning a ProfiledConnection while profiling is enabled."""
+    if PROFILER.enabled and "factory" not in kwargs:
+        kwargs["factory"] = ProfiledConnection
+    return sqlite3.connect(database, *args, **kwargs)
+
+
+_configure_from_environment()
@@ -0,0 +1,238 @@
+"""Character trigram index for typo-tolerant title search.
+
+FTS5 prefix tokens miss titles with typos, romanization differences
+("Shingeki" vs "Singeki") or merged/split words ("Kyojin" vs "Kyo Jin").
+Titles are indexed by the trigrams of their casefolded, punctuation- and
+space-free form, so those variants still share most of their trigrams.
+``candidates`` returns the top-K referenced ids by shared trigram count, for
+the providers to fine-score like any other candidate set.
+
+Each index is two tables named after it:
+
+* ``<name>_entry``: one row per indexed title (entry_id, ref_id, title)
+* ``<name>``: one row per gram with its entry count and the entry ids as a
+  packed ``array('I')`` blob, so building writes one row per distinct gram
+  and a query reads a handful of blobs instead of aggregating posting rows
+"""
+import heapq
+import math
+import re
+import sqlite3
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def _compact_title(title: Optional[str]) -> str:
+    return _NON_WORD.sub("", (title or "").casefold())
+
+
+def _compact_trigrams(compact: str) -> Set[str]:
+    if not compact:
+        return set()
+    padded = f"  {compact} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def title_trigrams(title: Optional[str]) -> Set[str]:
+    """Trigrams of the casefolded title with punctuation and spaces removed, padded at both ends."""
+    return _compact_trigrams(_compact_title(title))
+
+
+class TrigramIndex:
+    """Trigram postings for (ref_id, title) pairs stored in a provider's SQLite database."""
+
+    # Grams in more entries than this carry little signal and are skipped in queries...
+    MAX_GRAM_POSTINGS = 20000
+    # ...unless fewer than this many grams would be left, then the rarest ones are used
+    MIN_QUERY_GRAMS = 4
+    # Long queries only use their rarest grams; the common ones add postings, not precision
+    MAX_QUERY_GRAMS = 24
+    # Entries must share at least this fraction of the query grams used
+    MIN_SHARED_RATIO = 0.3
+    # Entries fetched per requested candidate before collapsing them by ref_id
+    ENTRY_OVERFETCH = 4
+    # Max ids per IN (...) clause
+    SQL_BATCH_SIZE = 500
+
+    def __init__(self, name: str):
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name):
+            raise ValueError(f"Invalid trigram index name: {name!r}")
+        self.name = name
+        self.entry_table = f"{name}_entry"
+
+    def create_tables(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.entry_table} (
+                entry_id INTEGER PRIMARY KEY,
+                ref_id INTEGER NOT NULL,
+                title TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_{self.entry_table}_ref_id ON {self.entry_table}(ref_id);
+
+            CREATE TABLE IF NOT EXISTS {self.name} (
+                gram TEXT PRIMARY KEY,
+                df INTEGER NOT NULL,
+                entry_ids BLOB NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def drop_tables(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            f"""
+            DROP TABLE IF EXISTS {self.name};
+            DROP TABLE IF EXISTS {self.entry_table};
+            """
+        )
+
+    def is_built(self, conn: sqlite3.Connection) -> bool:
+        try:
+            return conn.execute(f"SELECT 1 FROM {self.entry_table} LIMIT 1").fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def rebuild(self, conn: sqlite3.Connection, rows: Iterable[Tuple[int, str]]) -> int:
+        """Replace the index contents with ``rows`` of (ref_id, title); returns the number of entries."""
+        self.create_tables(conn)
+        conn.execute(f"DELETE FROM {self.name}")
+        conn.execute(f"DELETE FROM {self.entry_table}")
+        return self.add(conn, rows)
+
+    def _load_postings(self, conn: sqlite3.Connection, grams: List[str]) -> Dict[str, array]:
+        postings: Dict[str, array] = {}
+        for start in range(0, len(grams), self.SQL_BATCH_SIZE):
+            batch = grams[start:start + self.SQL_BATCH_SIZE]
+            placeholders = ",".join("?" for _ in batch)
+            for gram, blob in conn.execute(
+                f"SELECT gram, entry_ids FROM {self.name} WHERE gram IN ({placeholders})", tuple(batch)
+            ):
+                entry_ids = array("I")
+                entry_ids.frombytes(blob)
+                postings[gram] = entry_ids
+        return postings
+
+    def _store_postings(self, conn: sqlite3.Connection, postings: Dict[str, array]) -> None:
+        conn.executemany(
+            f"DELETE FROM {self.name} WHERE gram = ?",
+            [(gram,) for gram, entry_ids in postings.items() if not entry_ids],
+        )
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self.name} (gram, df, entry_ids) VALUES (?, ?, ?)",
+            [(gram, len(entry_ids), entry_ids.tobytes()) for gram, entry_ids in sorted(postings.items()) if entry_ids],
+        )
+
+    def add(self, conn: sqlite3.Connection, rows: Iterable[Tuple[int, str]]) -> int:
+        """Index (ref_id, title) rows; titles that reduce to the same text for a ref_id are indexed once."""
+        next_entry_id = conn.execute(f"SELECT COALESCE(MAX(entry_id), 0) + 1 FROM {self.entry_table}").fetchone()[0]
+        new_postings: Dict[str, array] = defaultdict(lambda: array("I"))
+        seen: Set[Tuple[int, str]] = set()
+        entries: List[Tuple[int, int, str]] = []
+        for ref_id, title in rows:
+            compact = _compact_title(title)
+            dedupe_key = (int(ref_id), compact)
+            if not compact or dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+            entries.append((next_entry_id, int(ref_id), title))
+            for gram in _compact_trigrams(compact):
+                new_postings[gram].append(next_entry_id)
+            next_entry_id += 1
+
+        conn.executemany(f"INSERT INTO {self.entry_table} (entry_id, ref_id, title) VALUES (?, ?, ?)", entries)
+        postings = self._load_postings(conn, list(new_postings))
+        for gram, entry_ids in new_postings.items():
+            if gram in postings:
+                postings[gram].extend(entry_ids)
+            else:
+                postings[gram] = entry_ids
+        self._store_postings(conn, postings)
+        return len(entries)
+
+    def remove(self, conn: sqlite3.Connection, ref_ids: Iterable[int]) -> int:
+        """Drop every entry of ``ref_ids``; returns the number of entries removed."""
+        unique_ids = list(dict.fromkeys(int(ref_id) for ref_id in ref_ids))
+        removed_by_gram: Dict[str, Set[int]] = defaultdict(set)
+        removed = 0
+        for start in range(0, len(unique_ids), self.SQL_BATCH_SIZE):
+            batch = unique_ids[start:start + self.SQL_BATCH_SIZE]
+            placeholders = ",".join("?" for _ in batch)
+            entries = conn.execute(
+                f"SELECT entry_id, title FROM {self.entry_table} WHERE ref_id IN ({placeholders})",
+                tuple(batch),
+            ).fetchall()
+            for entry_id, title in entries:
+                for gram in title_trigrams(title):
+                    removed_by_gram[gram].add(entry_id)
+            conn.execute(f"DELETE FROM {self.entry_table} WHERE ref_id IN ({placeholders})", tuple(batch))
+            removed += len(entries)
+
+        postings = self._load_postings(conn, list(removed_by_gram))
+        for gram, entry_ids in postings.items():
+            dropped = removed_by_gram[gram]
+            postings[gram] = array("I", (entry_id for entry_id in entry_ids if entry_id not in dropped))
+        self._store_postings(conn, postings)
+        return removed
+
+    def candidates(self, conn: sqlite3.Connection, title: str, limit: int) -> List[Tuple[int, str, int]]:
+        """Top ``limit`` (ref_id, best matching title, shared gram count), most shared grams first.
+
+        Returns an empty list when the index has not been built.
+        """
+        grams = sorted(title_trigrams(title))
+        if not grams or limit <= 0:
+            return []
+        try:
+            placeholders = ",".join("?" for _ in grams)
+            known = sorted(
+                conn.execute(f"SELECT gram, df FROM {self.name} WHERE gram IN ({placeholders})", tuple(grams)).fetchall(),
+                key=lambda row: (row[1], row[0]),
+            )
+            selected = [gram for gram, df in known if df <= self.MAX_GRAM_POSTINGS][: self.MAX_QUERY_GRAMS]
+            if len(selected) < self.MIN_QUERY_GRAMS:
+                selected = [gram for gram, _df in known[: self.MIN_QUERY_GRAMS]]
+            if not selected:
+                return []
+
+            shared_counts: Counter = Counter()
+            for entry_ids in self._load_postings(conn, selected).values():
+                shared_counts.update(entry_ids)
+            min_shared = max(1, math.ceil(len(selected) * self.MIN_SHARED_RATIO))
+            top_entries = heapq.nlargest(
+                limit * self.ENTRY_OVERFETCH,
+                ((count, -entry_id) for entry_id, count in shared_counts.items() if count >= min_shared),
+            )
+            if not top_entries:
+                return []
+
+            shared_by_entry = {-negative_id: count for count, negative_id in top_entries}
+            entry_ids = list(shared_by_entry)
+            best_by_ref: Dict[int, Tuple[int, str]] = {}
+            for start in range(0, len(entry_ids), self.SQL_BATCH_SIZE):
+                batch = entry_ids[start:start + self.SQL_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                for entry_id, ref_id, entry_title in conn.execute(
+                    f"SELECT entry_id, ref_id, title FROM {self.entry_table} WHERE entry_id IN ({placeholders})",
+                    tuple(batch),
+                ):
+                    shared = shared_by_entry[entry_id]
+                    best = best_by_ref.get(ref_id)
+                    if best is None or (shared, -len(entry_title)) > (best[0], -len(best[1])):
+                        best_by_ref[ref_id] = (shared, entry_title)
+        except sqlite3.OperationalError:
+            return []
+
+        ranked = sorted(best_by_ref.items(), key=lambda item: (-item[1][0], len(item[1][1]), item[0]))
+        return [(ref_id, entry_title, shared) for ref_id, (shared, entry_title) in ranked[:limit]]
+
+    def stats(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        try:
+            return {
+                "entries": conn.execute(f"SELECT COUNT(*) FROM {self.entry_table}").fetchone()[0],
+                "grams": conn.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0],
+            }
+        except sqlite3.Error:
+            return {"entries": 0, "grams": 0}
@@ -10,6 +10,7 @@ import threading
 from mutagen.mp4 import MP4, MP4Cover
 from typing import Dict, Any, List
 from metadata_provider import MetadataManager
+from metadata_service import create_metadata_manager
 from anime_metadata import AnimeDataProvider
 from imdb_metadata import IMDbDataProvider
 
@@ -20,10 +21,10 @@ def get_metadata_manager():
     """Get or initialize the metadata manager"""
     global METADATA_MANAGER
     if (METADATA_MANAGER is None):
-        # Initialize providers
-        anime_provider = AnimeDataProvider()
-        imdb_provider = IMDbDataProvider()
-        METADATA_MANAGER = MetadataManager([anime_provider, imdb_provider])
+        # Use a running metadata service when available, else in-process providers
+        METADATA_MANAGER = create_metadata_manager(
+            lambda: MetadataManager([AnimeDataProvider(), IMDbDataProvider()])
+        )
     return METADATA_MANAGER
 
 # Set up logging
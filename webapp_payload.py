@@ -0,0 +1,121 @@
+"""Chunked data payloads for the generated HTML webapps.
+
+The webapps normally embed their whole results JSON in the page, so a large
+collection gives an HTML file of tens of MB that the browser has to parse
+before anything renders. ``split_payload`` keeps the first screen of one
+list or mapping in the payload inline and writes the rest as gzip-compressed
+chunks in a ``<page>_data`` directory next to the HTML. The page loads them
+with ``WebappPayloadLoader`` from webapp_payload_loader.js as its list
+scrolls, when a filter needs the full data, or while the browser is idle.
+
+Chunks are small scripts rather than JSON files because browsers block
+fetch() for pages opened from file:// URLs, but still load script tags.
+"""
+import base64
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Type
+from urllib.parse import quote
+
+DEFAULT_FIRST_SCREEN_ITEMS = 100
+MANIFEST_KEY = 'payload_chunks'
+CHUNK_ENCODING = 'gzip+base64'
+CHUNK_REGISTER_FUNCTION = 'registerWebappPayloadChunk'
+CHUNK_FILE_PATTERN = 'chunk_*.js'
+LOADER_SCRIPT = 'webapp_payload_loader.js'
+
+
+def chunk_directory(output_path) -> Path:
+    """Directory holding the chunks of the webapp written to ``output_path``."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_data")
+
+
+def load_loader_script() -> str:
+    """Source of the browser-side chunk loader, for bundling into a webapp."""
+    return Path(__file__).with_name(LOADER_SCRIPT).read_text(encoding='utf-8')
+
+
+def remove_chunks(output_path) -> None:
+    """Delete chunks left by a previous export of ``output_path``."""
+    directory = chunk_directory(output_path)
+    if not directory.is_dir():
+        return
+    for chunk_path in directory.glob(CHUNK_FILE_PATTERN):
+        chunk_path.unlink()
+    try:
+        directory.rmdir()
+    except OSError:
+        # Keep directories that hold anything besides our chunks
+        pass
+
+
+def _chunk_bounds(values: List[Any], first_screen_items: int, chunk_items: int,
+                  is_continuation: Optional[Callable[[Any], bool]]) -> List[int]:
+    """Start indexes of the inline part and every chunk, moved past continuation items."""
+    bounds = [0]
+    target = first_screen_items
+    while target < len(values):
+        while target < len(values) and is_continuation and is_continuation(values[target]):
+            target += 1
+        if target >= len(values):
+            break
+        bounds.append(target)
+        target += chunk_items
+    return bounds
+
+
+def _encode_chunk(key: str, index: int, items: Any, cls: Optional[Type[json.JSONEncoder]]) -> str:
+    raw = json.dumps(items, cls=cls, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # mtime=0 keeps unchanged chunks byte-identical between exports
+    encoded = base64.b64encode(gzip.compress(raw, mtime=0)).decode('ascii')
+    return f"{CHUNK_REGISTER_FUNCTION}({json.dumps(key)}, {index}, \"{encoded}\");\n"
+
+
+def split_payload(payload: Dict[str, Any], key: str, output_path, chunk_items: int,
+                  first_screen_items: int = DEFAULT_FIRST_SCREEN_ITEMS,
+                  cls: Optional[Type[json.JSONEncoder]] = None,
+                  is_continuation: Optional[Callable[[Any], bool]] = None) -> Dict[str, Any]:
+    """Move all but the first screen of ``payload[key]`` into chunks beside ``output_path``.
+
+    ``payload[key]`` may be a list or a dict; dict chunks keep its order.
+    Items for which ``is_continuation`` returns True stay in the same chunk as
+    the item before them, so a parent row and its children arrive together.
+    Returns a shallow copy of ``payload`` with the inline items and a
+    ``payload_chunks`` manifest, or ``payload`` itself when ``chunk_items`` is
+    not positive or everything fits on the first screen. Chunks from a
+    previous export are removed either way.
+    """
+    remove_chunks(output_path)
+    items = payload.get(key)
+    is_mapping = isinstance(items, dict)
+    if chunk_items <= 0 or not isinstance(items, (dict, list)) or len(items) <= first_screen_items:
+        return payload
+
+    entries = list(items.items()) if is_mapping else items
+    values = [value for _, value in entries] if is_mapping else entries
+    bounds = _chunk_bounds(values, first_screen_items, chunk_items, is_continuation)
+    if len(bounds) == 1:
+        return payload
+
+    directory = chunk_directory(output_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    chunks = []
+    for index, (start, end) in enumerate(zip(bounds[1:], bounds[2:] + [len(entries)])):
+        chunk = dict(entries[start:end]) if is_mapping else entries[start:end]
+        file_name = CHUNK_FILE_PATTERN.replace('*', f"{index + 1:04d}")
+        (directory / file_name).write_text(_encode_chunk(key, index, chunk, cls), encoding='utf-8')
+        chunks.append({'file': file_name, 'items': end - start})
+
+    inline_entries = entries[:bounds[1]]
+    result = dict(payload)
+    result[key] = dict(inline_entries) if is_mapping else inline_entries
+    result[MANIFEST_KEY] = {
+        'key': key,
+        'encoding': CHUNK_ENCODING,
+        'directory': quote(directory.name),
+        'total_items': len(entries),
+        'chunks': chunks,
+    }
+    return result
@@ -0,0 +1,136 @@
+(function (globalScope) {
+    // Chunk scripts call registerWebappPayloadChunk(key, index, data) when they run
+    const pendingChunks = new Map();
+
+    function decodeBase64(encoded) {
+        const binary = atob(encoded);
+        const bytes = new Uint8Array(binary.length);
+        for (let index = 0; index < binary.length; index++) {
+            bytes[index] = binary.charCodeAt(index);
+        }
+        return bytes;
+    }
+
+    async function decodeChunk(encoded, encoding) {
+        if (encoding !== 'gzip+base64') {
+            throw new Error(`Unsupported payload chunk encoding: ${encoding}`);
+        }
+        if (typeof DecompressionStream === 'undefined') {
+            throw new Error('This browser cannot decompress payload chunks (DecompressionStream is missing).');
+        }
+        const stream = new Blob([decodeBase64(encoded)]).stream().pipeThrough(new DecompressionStream('gzip'));
+        return JSON.parse(await new Response(stream).text());
+    }
+
+    class WebappPayloadLoader {
+        constructor(manifest, options = {}) {
+            this.manifest = manifest && Array.isArray(manifest.chunks) ? manifest : null;
+            this.chunks = this.manifest ? this.manifest.chunks : [];
+            this.onChunk = typeof options.onChunk === 'function' ? options.onChunk : (() => {});
+            this.idleDelay = Number.isFinite(options.idleDelay) ? Math.max(0, options.idleDelay) : 250;
+            this.nextIndex = 0;
+            this.pending = null;
+            this.allPending = null;
+            this.failed = false;
+            this.backgroundScheduled = false;
+        }
+
+        get isComplete() {
+            return this.failed || this.nextIndex >= this.chunks.length;
+        }
+
+        loadNext() {
+            if (this.pending) {
+                return this.pending;
+            }
+            if (this.isComplete) {
+                return Promise.resolve(false);
+            }
+
+            const index = this.nextIndex;
+            this.pending = this.loadChunk(index).then((items) => {
+                this.pending = null;
+                this.nextIndex = index + 1;
+                this.onChunk(items, index);
+                return true;
+            }, (error) => {
+                this.pending = null;
+                this.failed = true;
+                console.error(`Failed to load data chunk ${index + 1} of ${this.chunks.length}:`, error);
+                return false;
+            });
+            return this.pending;
+        }
+
+        loadAll() {
+            if (!this.allPending) {
+                this.allPending = (async () => {
+                    while (await this.loadNext()) {
+                        // Keep going until every chunk is merged
+                    }
+                })();
+            }
+            return this.allPending;
+        }
+
+        loadInBackground() {
+            if (this.backgroundScheduled || this.isComplete) {
+                return;
+            }
+
+            this.backgroundScheduled = true;
+            const step = () => {
+                this.backgroundScheduled = false;
+                this.loadNext().then((loaded) => {
+                    if (loaded) {
+                        this.loadInBackground();
+                    }
+                });
+            };
+
+            if (typeof globalScope.requestIdleCallback === 'function') {
+                globalScope.requestIdleCallback(step, { timeout: this.idleDelay * 4 });
+            } else {
+                setTimeout(step, this.idleDelay);
+            }
+        }
+
+        loadChunk(index) {
+            const chunk = this.chunks[index];
+            const chunkId = `${this.manifest.key}:${index}`;
+
+            return new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = `${this.manifest.directory}/${chunk.file}`;
+                script.async = true;
+
+                pendingChunks.set(chunkId, (encoded) => {
+                    decodeChunk(encoded, this.manifest.encoding).then(resolve, reject);
+                });
+                script.onload = () => {
+                    script.remove();
+                    if (pendingChunks.delete(chunkId)) {
+                        reject(new Error(`${script.src} did not register chunk ${chunkId}`));
+                    }
+                };
+                script.onerror = () => {
+                    script.remove();
+                    pendingChunks.delete(chunkId);
+                    reject(new Error(`Could not load ${script.src}`));
+                };
+
+                document.head.appendChild(script);
+            });
+        }
+    }
+
+    globalScope.registerWebappPayloadChunk = function (key, index, encoded) {
+        const chunkId = `${key}:${index}`;
+        const handleChunk = pendingChunks.get(chunkId);
+        if (handleChunk) {
+            pendingChunks.delete(chunkId);
+            handleChunk(encoded);
+        }
+    };
+    globalScope.WebappPayloadLoader = WebappPayloadLoader;
+})(typeof window !== 'undefined' ? window : globalThis);